@@ -4,8 +4,8 @@ from db.supabase_client import get_supabase
 from services.raw_storage.brew_items_read import get_brew_items_stats
 from services.raw_storage.brew_items_erase import brew_items_erase
 from services.nl_brewery.nl_brewery_service import run_full_nl_brewery
-from services.enrichment.enrichment_service import enrich_single_item, get_enrichment_stats
-from services.scoring.scoring_service import fetch_items_to_score, score_single_item
+from services.enrichment.enrichment_service import enrich_items_concurrent, get_enrichment_stats
+from services.scoring.scoring_service import fetch_items_to_score, score_items_batch
 from services.scoring.update_score import update_item_score
 from services.scoring.scoring_service import get_scoring_stats
 from services.news_brewery.mega_job import MegaJobConfig, get_mega_job
@@ -404,6 +404,8 @@ else:
             else:
                 st.error("❌ Erreur process")
                 st.caption(result.get("message", "Erreur inconnue"))
+            if result.get("already_processed"):
+                st.caption(f"↩️ {result['already_processed']} newsletter(s) déjà traitée(s)")
 
             errors = result.get("errors") or []
             if errors:
@@ -466,6 +468,14 @@ else:
                     step=1,
                     key="mega_llm_concurrency",
                 )
+                mega_json_workers = st.number_input(
+                    "JSON concurrency",
+                    min_value=1,
+                    max_value=4,
+                    value=1,
+                    step=1,
+                    key="mega_json_concurrency",
+                )
 
         if launch_20h or launch_6h:
             if mega_status.get("state") == "running":
@@ -485,6 +495,7 @@ else:
                         batch_size=int(st.session_state.get("mega_batch_size", 5)),
                         firecrawl_concurrency=int(st.session_state.get("mega_firecrawl_concurrency", 3)),
                         llm_concurrency=int(st.session_state.get("mega_llm_concurrency", 3)),
+                        json_concurrency=int(st.session_state.get("mega_json_concurrency", 1)),
                     )
                     mega_job.set_config(config)
                     mega_job.start_auto_scraping(urls)
@@ -531,18 +542,13 @@ else:
                 enrich_status.info("✓ Aucun à enrichir")
                 enrich_progress.progress(1.0)
             else:
-                for idx, item in enumerate(enrich_items, start=1):
-                    enrich_status.text(f"Enrich {idx}/{enrich_total}")
-                    result = enrich_single_item(
-                        item.get("id"),
-                        item.get("title", ""),
-                        item.get("content", "")
-                    )
-                    if result.get("status") == "success":
-                        enrich_success += 1
-                    else:
-                        enrich_errors += 1
-                    enrich_progress.progress(idx / enrich_total)
+                def _update_enrich(payload: dict) -> None:
+                    enrich_status.text(payload.get("message", ""))
+                    enrich_progress.progress(min(max(payload.get("progress", 0), 0), 1))
+
+                enrich_result = enrich_items_concurrent(enrich_items, progress_cb=_update_enrich)
+                enrich_success = enrich_result.get("success", 0)
+                enrich_errors = enrich_result.get("errors", 0)
 
             # Score
             score_progress = st.progress(0)
@@ -556,22 +562,13 @@ else:
                 score_status.info("✓ Aucun à scorer")
                 score_progress.progress(1.0)
             else:
-                for idx, item in enumerate(score_items, start=1):
-                    score_status.text(f"Score {idx}/{score_total}")
-                    result = score_single_item(
-                        item.get("id"),
-                        item.get("title", ""),
-                        item.get("content", ""),
-                        item.get("tags"),
-                        item.get("labels"),
-                        item.get("entities"),
-                        item.get("source_type"),
-                    )
-                    if result.get("status") == "success":
-                        score_success += 1
-                    else:
-                        score_errors += 1
-                    score_progress.progress(idx / score_total)
+                def _update_score(payload: dict) -> None:
+                    score_status.text(payload.get("message", ""))
+                    score_progress.progress(min(max(payload.get("progress", 0), 0), 1))
+
+                score_result = score_items_batch(score_items, progress_cb=_update_score)
+                score_success = score_result.get("success", 0)
+                score_errors = score_result.get("errors", 0)
 
             st.success(f"✅ Terminé · Enrich {enrich_success}/{enrich_total} · Score {score_success}/{score_total}")
             if enrich_errors or score_errors:
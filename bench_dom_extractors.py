@@ -0,0 +1,423 @@
+"""
+Micro-benchmark des extracteurs DOM (services/news_brewery/rss_utils.py)
+Compare items/s avant (extracteurs historiques à regex inline, copiés ci-dessous)
+/ après (motifs précompilés, une passe finditer arrêtée à max_items) sur des pages
+liste sauvegardées, sans réseau, et vérifie que les items sont identiques.
+
+Le gain vient de l'arrêt à max_items : page plus longue que max_items → gain net
+(ex. --items 200 --max-items 15) ; page lue en entier (--max-items 400, défaut UI)
+→ même travail regex des deux côtés, écart dans le bruit.
+
+Usage :
+    python bench_dom_extractors.py                      # pages synthétiques
+    python bench_dom_extractors.py --pages ./listings   # pages sauvegardées
+    python bench_dom_extractors.py --items 200 --max-items 15 --rounds 30
+
+Pages sauvegardées : un fichier par source dans --pages, nommé
+bfm.html, beincrypto.html, boursedirect.html, boursier_economie.html,
+boursier_macroeconomie.html, boursier_france.html (les absents sont ignorés).
+"""
+
+import argparse
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from html import unescape
+from pathlib import Path
+
+REPEATS = 5
+
+# source -> (fonction, url de page)
+EXTRACTORS = {
+    "bfm": ("fetch_dom_items", "https://www.tradingsat.com/actualites/"),
+    "beincrypto": ("fetch_beincrypto_dom_items", "https://fr.beincrypto.com/"),
+    "boursedirect": ("fetch_boursedirect_dom_items", "https://www.boursedirect.fr/fr/actualites/"),
+    "boursier_economie": ("fetch_boursier_dom_items", "https://www.boursier.com/actualites/economie/"),
+    "boursier_macroeconomie": (
+        "fetch_boursier_macroeconomie_dom_items",
+        "https://www.boursier.com/actualites/macroeconomie/",
+    ),
+    "boursier_france": ("fetch_boursier_france_dom_items", "https://www.boursier.com/actualites/france/"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Référence : extracteurs historiques (regex inline, findall sur toute la page),
+# sans le GET ni les fallbacks Firecrawl (le bench est hors réseau)
+# ---------------------------------------------------------------------------
+
+_MONTHS = {
+    "janvier": 1, "février": 2, "fevrier": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6,
+    "juillet": 7, "août": 8, "aout": 8, "septembre": 9, "octobre": 10, "novembre": 11,
+    "décembre": 12, "decembre": 12,
+}
+
+
+def _baseline_parse_time_label(text: str):
+    time_match = re.search(r"\b(\d{1,2})h(\d{2})\b", text)
+    if time_match:
+        now = datetime.now()
+        return now.replace(hour=int(time_match.group(1)), minute=int(time_match.group(2)), second=0, microsecond=0)
+    date_match = re.search(r"\b(\d{1,2})/(\d{1,2})/(\d{2,4})\b", text)
+    if date_match:
+        year = int(date_match.group(3))
+        if year < 100:
+            year += 2000
+        return datetime(year, int(date_match.group(2)), int(date_match.group(1)))
+    month_match = re.search(
+        r"\b(\d{1,2})\s+(janvier|février|fevrier|mars|avril|mai|juin|juillet|août|aout|septembre|octobre|novembre|décembre|decembre)\s*(\d{4})?\b",
+        text,
+        re.IGNORECASE,
+    )
+    if month_match:
+        year = int(month_match.group(3)) if month_match.group(3) else datetime.now().year
+        month = _MONTHS.get(month_match.group(2).lower())
+        if month:
+            return datetime(year, month, int(month_match.group(1)))
+    return None
+
+
+def _baseline_within_window(label_dt, mode: str, hours_window: int) -> bool:
+    if label_dt is None:
+        return True
+    now = datetime.now()
+    if label_dt - now > timedelta(hours=1):
+        label_dt = label_dt - timedelta(days=1)
+    if mode == "today":
+        return label_dt.date() == now.date()
+    if mode == "last_hours":
+        return now - label_dt <= timedelta(hours=hours_window)
+    return True
+
+
+def _baseline_parse_relative_time(text: str):
+    match = re.search(r"il y a\s+(\d+)\s+(minute|minutes|heure|heures|jour|jours)", text, re.I)
+    if not match:
+        return None
+    value = int(match.group(1))
+    unit = match.group(2).lower()
+    if "minute" in unit:
+        return datetime.now() - timedelta(minutes=value)
+    if "heure" in unit:
+        return datetime.now() - timedelta(hours=value)
+    if "jour" in unit:
+        return datetime.now() - timedelta(days=value)
+    return None
+
+
+def _baseline_parse_boursedirect_datetime(day_text: str, month_year_text: str, time_text: str):
+    month_year = month_year_text.strip().split()
+    if len(month_year) < 1:
+        return None
+    year = int(month_year[1]) if len(month_year) > 1 and month_year[1].isdigit() else datetime.now().year
+    month = _MONTHS.get(month_year[0].lower())
+    if not month:
+        return None
+    try:
+        day = int(day_text)
+    except Exception:
+        return None
+    hour, minute = 0, 0
+    if time_text:
+        time_match = re.search(r"(\d{1,2}):(\d{2})", time_text)
+        if time_match:
+            hour, minute = int(time_match.group(1)), int(time_match.group(2))
+    return datetime(year, month, day, hour, minute)
+
+
+def _baseline_item(url: str, title_html: str, label_dt) -> dict:
+    title = unescape(re.sub(r"<.*?>", "", title_html)).strip()
+    return {"url": url, "title": title, "label_dt": label_dt.isoformat() if label_dt else ""}
+
+
+def _baseline_url(href: str, base_url: str) -> str:
+    url = href.strip()
+    if url.startswith("/"):
+        url = f"{base_url}{url}"
+    return url
+
+
+def baseline_bfm(html_text: str, max_items: int, mode: str, hours_window: int) -> list:
+    wrapper_match = re.search(r'<div class="wrapper-news-list">(.*?)<div class="pagination">', html_text, re.S)
+    content = wrapper_match.group(1) if wrapper_match else html_text
+    pattern = re.compile(
+        r'<div class="item">.*?<div class="meta-date">\s*([^<]+)\s*</div>.*?<a\s+[^>]*href="([^"]+)"[^>]*>(.*?)</a>',
+        re.S,
+    )
+    items, seen = [], set()
+    for time_text, href, title_html in pattern.findall(content):
+        url = _baseline_url(href, "https://www.tradingsat.com")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        label_dt = _baseline_parse_time_label(time_text.strip())
+        if not _baseline_within_window(label_dt, mode, hours_window):
+            continue
+        items.append(_baseline_item(url, title_html, label_dt))
+        if len(items) >= max_items:
+            break
+    return items
+
+
+def baseline_beincrypto(html_text: str, max_items: int, mode: str, hours_window: int) -> list:
+    block_match = re.search(r"Les dernières nouvelles.*?<div class=\"ant-card-body\">(.*?)</div>\s*</div>", html_text, re.S)
+    content = block_match.group(1) if block_match else html_text
+    pattern = re.compile(
+        r'<a[^>]+class="ArticleCardSmall[^"]*"[^>]+href="([^"]+)"[^>]*>.*?'
+        r'<time[^>]+datetime="([^"]+)"[^>]*>(.*?)</time>.*?'
+        r'<div[^>]+data-testid="main-element"[^>]*>(.*?)</div>',
+        re.S,
+    )
+    items, seen = [], set()
+    for href, datetime_attr, time_text, title_html in pattern.findall(content):
+        url = _baseline_url(href, "https://fr.beincrypto.com")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        label_dt = None
+        if datetime_attr:
+            try:
+                label_dt = datetime.fromisoformat(datetime_attr.replace("Z", "+00:00")).replace(tzinfo=None)
+            except Exception:
+                label_dt = None
+        if label_dt is None and time_text:
+            label_dt = _baseline_parse_relative_time(time_text.strip())
+        if not _baseline_within_window(label_dt, mode, hours_window):
+            continue
+        items.append(_baseline_item(url, title_html, label_dt))
+        if len(items) >= max_items:
+            break
+    if items:
+        return items
+    for href, title_html in re.findall(r'<a[^>]+href="([^"]+)"[^>]*>(.*?)</a>', content, re.S):
+        url = _baseline_url(href, "https://fr.beincrypto.com")
+        if not url or "/news/" not in url or url in seen:
+            continue
+        seen.add(url)
+        item = _baseline_item(url, title_html, None)
+        if not item["title"]:
+            continue
+        items.append(item)
+        if len(items) >= max_items:
+            break
+    return items
+
+
+def baseline_boursedirect(html_text: str, max_items: int, mode: str, hours_window: int) -> list:
+    pattern = re.compile(
+        r'<div class="timeline-item[^"]*">.*?'
+        r'<div class="timeline-date-left[^"]*">([^<]+)</div>.*?'
+        r'<span class="publishDay">(\d{1,2})</span>.*?'
+        r'<span class="text-muted">([^<]+)</span>.*?'
+        r'<a href="([^"]+)">.*?'
+        r'<h2 class="timeline-title[^"]*">(.*?)</h2>',
+        re.S,
+    )
+    items, seen = [], set()
+    for time_text, day_text, month_year_text, href, title_html in pattern.findall(html_text):
+        url = _baseline_url(href, "https://www.boursedirect.fr")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        label_dt = _baseline_parse_boursedirect_datetime(day_text, month_year_text, time_text)
+        if not _baseline_within_window(label_dt, mode, hours_window):
+            continue
+        items.append(_baseline_item(url, title_html, label_dt))
+        if len(items) >= max_items:
+            break
+    return items
+
+
+def _baseline_slice_boursier(html_text: str, required_path: str) -> str:
+    if required_path not in html_text and re.search(
+        rf'<link[^>]+rel="canonical"[^>]+href="[^"]*{re.escape(required_path)}[^"]*"', html_text, re.I
+    ) is None:
+        return ""
+    match = re.search(
+        r'<div[^>]*id="listing"[^>]*>.*?<div[^>]*class="items"[^>]*>(.*?)</div>\s*<nav class="pagination"',
+        html_text,
+        re.S,
+    )
+    return match.group(1) if match else html_text
+
+
+def _baseline_boursier(html_text: str, required_path: str, pattern: str, fields: tuple, max_items: int,
+                       mode: str, hours_window: int) -> list:
+    content = _baseline_slice_boursier(html_text, required_path)
+    items, seen = [], set()
+    for groups in re.findall(pattern, content, re.S):
+        row = dict(zip(fields, groups))
+        url = _baseline_url(row["href"], "https://www.boursier.com")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        label_dt = None
+        if row["dt"]:
+            try:
+                label_dt = datetime.fromisoformat(row["dt"].strip())
+            except Exception:
+                label_dt = None
+        if label_dt is None and row["label"]:
+            label_dt = _baseline_parse_time_label(row["label"].strip())
+        if label_dt is None or not _baseline_within_window(label_dt, mode, hours_window):
+            continue
+        items.append(_baseline_item(url, row["title"], label_dt))
+        if len(items) >= max_items:
+            break
+    return items
+
+
+_BASELINE_BOURSIER_ECONOMIE = (
+    r'<article[^>]*class="[^"]*item[^"]*"[^>]*>.*?'
+    r'<h2[^>]*>\s*<a[^>]+href="([^"]+)"[^>]*>(.*?)</a>\s*</h2>.*?'
+    r'<time[^>]+class="date"[^>]+datetime="([^"]+)"[^>]*>([^<]*)</time>'
+)
+_BASELINE_BOURSIER_ITEM = (
+    r'<div class="item[^"]*">.*?'
+    r'<time[^>]+class="date"[^>]+datetime="([^"]+)".*?>([^<]*)</time>.*?'
+    r'<a href="([^"]+)".*?>(.*?)</a>'
+)
+
+BASELINE_EXTRACTORS = {
+    "bfm": baseline_bfm,
+    "beincrypto": baseline_beincrypto,
+    "boursedirect": baseline_boursedirect,
+    "boursier_economie": lambda html, *args: _baseline_boursier(
+        html, "/actualites/economie/", _BASELINE_BOURSIER_ECONOMIE, ("href", "title", "dt", "label"), *args
+    ),
+    "boursier_macroeconomie": lambda html, *args: _baseline_boursier(
+        html, "/actualites/macroeconomie/", _BASELINE_BOURSIER_ITEM, ("dt", "label", "href", "title"), *args
+    ),
+    "boursier_france": lambda html, *args: _baseline_boursier(
+        html, "/actualites/france/", _BASELINE_BOURSIER_ITEM, ("dt", "label", "href", "title"), *args
+    ),
+}
+
+
+def synthetic_pages(count: int) -> dict:
+    """
+    Pages liste minimales reproduisant la structure DOM de chaque source
+    """
+    now = datetime.now().replace(microsecond=0)
+    months = ["janvier", "février", "mars", "avril", "mai", "juin", "juillet",
+              "août", "septembre", "octobre", "novembre", "décembre"]
+    noise = '<div class="pub"><span>Publicité</span><p>' + "lorem ipsum " * 20 + "</p></div>"
+
+    def stamp(i: int) -> datetime:
+        return now - timedelta(minutes=7 * i)
+
+    bfm = "".join(
+        f'<div class="item"><div class="meta-date"> {stamp(i):%H}h{stamp(i):%M} </div>{noise}'
+        f'<div class="title"><a class="link" href="/actualites/marche-{i}.html">Titre &amp; <b>marché</b> {i}</a></div></div>'
+        for i in range(count)
+    )
+    bein = "".join(
+        f'<a class="ArticleCardSmall_card" data-x="1" href="/news/article-{i}/">{noise}'
+        f'<time class="t" datetime="{stamp(i):%Y-%m-%dT%H:%M:%S}Z">il y a {i} minutes</time>'
+        f'<div class="c" data-testid="main-element">Bitcoin {i}</div></a>'
+        for i in range(count)
+    )
+    boursedirect = "".join(
+        f'<div class="timeline-item x"><div class="timeline-date-left y">{stamp(i):%H:%M}</div>{noise}'
+        f'<span class="publishDay">{stamp(i).day}</span>'
+        f'<span class="text-muted">{months[stamp(i).month - 1]} {stamp(i).year}</span>'
+        f'<a href="/fr/actualites/article-{i}"><h2 class="timeline-title z">Bourse {i}</h2></a></div>'
+        for i in range(count)
+    )
+
+    def boursier_items(section: str) -> str:
+        return "".join(
+            f'<div class="item x">{noise}<time class="date" datetime="{stamp(i):%Y-%m-%dT%H:%M:%S}">'
+            f'{stamp(i):%H}h{stamp(i):%M}</time><a href="/actualites/{section}/article-{i}.html">Titre {i}</a></div>'
+            for i in range(count)
+        )
+
+    def boursier_page(section: str, body: str) -> str:
+        return (
+            f'<html><head><link rel="canonical" href="https://www.boursier.com/actualites/{section}/"></head>'
+            f'<body><div id="listing"><div class="items">{body}</div>\n<nav class="pagination"></nav></div></body></html>'
+        )
+
+    economie = "".join(
+        f'<article class="item x">{noise}<h2 class="t"> <a href="/actualites/economie/article-{i}.html">Éco {i}</a> </h2>'
+        f'<time class="date" datetime="{stamp(i):%Y-%m-%dT%H:%M:%S}">{stamp(i):%H}h{stamp(i):%M}</time></article>'
+        for i in range(count)
+    )
+
+    return {
+        "bfm": f'<html><body><div class="wrapper-news-list">{bfm}<div class="pagination"></div></body></html>',
+        "beincrypto": (
+            f'<html><body><h2>Les dernières nouvelles</h2><div class="ant-card-body">{bein}</div>\n</div></body></html>'
+        ),
+        "boursedirect": f"<html><body>{boursedirect}</body></html>",
+        "boursier_economie": boursier_page("economie", economie),
+        "boursier_macroeconomie": boursier_page("macroeconomie", boursier_items("macroeconomie")),
+        "boursier_france": boursier_page("france", boursier_items("france")),
+    }
+
+
+def saved_pages(directory: str) -> dict:
+    pages = {}
+    for source in EXTRACTORS:
+        path = Path(directory) / f"{source}.html"
+        if path.exists():
+            pages[source] = path.read_text(encoding="utf-8", errors="ignore")
+    return pages
+
+
+def current_extractor(module, source: str, html: str):
+    func_name, page_url = EXTRACTORS[source]
+    # Pas de réseau : la page sauvegardée remplace le GET (toujours "modifiée" :
+    # extraction complète à chaque appel, comme la référence)
+    module._fetch_html_page = lambda url: (html, False)
+    func = getattr(module, func_name)
+    return lambda max_items, mode, hours_window: func(page_url, max_items, mode, hours_window)
+
+
+def run(extract, rounds: int, max_items: int) -> tuple:
+    args = (max_items, "last_hours", 24 * 365 * 10)
+    items = extract(*args)
+    # Meilleur de REPEATS séries (limite le bruit du scheduler)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            extract(*args)
+        best = min(best, time.perf_counter() - start)
+    return items, (len(items) * rounds / best) if best else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark extracteurs DOM (items/s)")
+    parser.add_argument("--pages", help="dossier de pages liste sauvegardées (<source>.html)")
+    parser.add_argument("--items", type=int, default=60, help="items par page synthétique")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--max-items", type=int, default=400, help="plafond par page (défaut UI: 400)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from services.news_brewery import rss_utils as current
+
+    pages = saved_pages(args.pages) if args.pages else synthetic_pages(args.items)
+    if not pages:
+        print("❌ Aucune page à analyser")
+        return 1
+
+    print(f"🔧 Pages: {'sauvegardées (' + args.pages + ')' if args.pages else 'synthétiques'} "
+          f"| rounds={args.rounds} | max_items={args.max_items}")
+    print(f"{'source':<24}{'items':>7}{'avant it/s':>14}{'après it/s':>14}{'gain':>8}")
+    for source, html in pages.items():
+        items_after, rate_after = run(current_extractor(current, source, html), args.rounds, args.max_items)
+        baseline = BASELINE_EXTRACTORS[source]
+        items_before, rate_before = run(
+            lambda *extract_args: baseline(html, *extract_args), args.rounds, args.max_items
+        )
+        same = "" if items_before == items_after else "  ⚠️ résultats différents"
+        gain = f"x{rate_after / rate_before:.2f}" if rate_before else "-"
+        print(f"{source:<24}{len(items_after):>7}{rate_before:>14,.0f}{rate_after:>14,.0f}{gain:>8}{same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
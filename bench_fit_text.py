@@ -0,0 +1,193 @@
+"""
+Micro-benchmark de l'ajustement de texte des slides (services/carousel/text_fit.py)
+Compare fits/s avant (_fit_text linéaire historique, copié ci-dessous) / après
+(dichotomie + largeurs de mots mémoïsées), et vérifie que police et lignes sont identiques.
+
+Usage :
+    python bench_fit_text.py                          # textes d'exemple intégrés
+    python bench_fit_text.py --texts ./carousel.json  # export de la table carousel
+    python bench_fit_text.py --rounds 50
+
+--texts : liste JSON d'objets {"title_carou", "content_carou"} (ou {"title", "content"}).
+Chaque texte est ajusté sur les zones titre / contenu des slides Bourse, plus
+une série de hauteurs réduites pour forcer la descente en taille.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+REPEATS = 5
+
+ASSETS_DIR = os.path.join("front", "layout", "assets", "carousel", "bourse")
+FONT_TITLE_PATH = os.path.join(ASSETS_DIR, "Inter_18pt-Bold.ttf")
+FONT_CONTENT_PATH = os.path.join(ASSETS_DIR, "Inter_18pt-Medium.ttf")
+TEXT_WIDTH = 1080 - 60 - 60
+CONTENT_HEIGHTS = (1118, 700, 450, 300, 180)
+
+SAMPLE_TEXTS = [
+    {
+        "title": "Le CAC 40 termine en hausse portée par le luxe et les bancaires",
+        "content": (
+            "Les marchés européens ont clôturé la séance en nette progression. Les investisseurs saluent "
+            "les résultats trimestriels meilleurs que prévu du secteur du luxe, tandis que les banques "
+            "profitent de la remontée des taux longs. Le pétrole recule légèrement après les annonces de "
+            "l'OPEP et l'euro se stabilise face au dollar avant la réunion de la BCE."
+        ),
+    },
+    {
+        "title": "Bitcoin repasse au-dessus des 70 000 dollars",
+        "content": (
+            "La première cryptomonnaie mondiale a bondi de 6 % en 24 heures, portée par des entrées record "
+            "dans les ETF spot américains. Ethereum suit le mouvement et gagne 4 %, tandis que les volumes "
+            "sur les plateformes centralisées atteignent leur plus haut niveau depuis mars. Les analystes "
+            "restent prudents à l'approche de la publication de l'inflation américaine."
+        ),
+    },
+    {
+        "title": "Inflation : la zone euro ralentit plus vite que prévu",
+        "content": (
+            "Selon Eurostat, la hausse des prix à la consommation est revenue à 2,1 % sur un an en "
+            "septembre, contre 2,4 % le mois précédent. L'énergie tire l'indice vers le bas alors que "
+            "les services restent dynamiques. Ce chiffre conforte les anticipations d'une nouvelle baisse "
+            "des taux directeurs lors de la prochaine réunion de politique monétaire à Francfort."
+        ),
+    },
+    {
+        "title": "PEA : les frais de courtage divisés par deux chez plusieurs courtiers en ligne",
+        "content": (
+            "La concurrence s'intensifie sur le marché du plan d'épargne en actions. Plusieurs acteurs "
+            "annoncent la gratuité des ordres sous 500 euros et la suppression des droits de garde. Une "
+            "bonne nouvelle pour les épargnants qui investissent de petits montants chaque mois via des "
+            "ETF éligibles, à condition de comparer les conditions sur les marchés étrangers."
+        ),
+    },
+]
+
+
+def load_texts(path: str) -> list:
+    rows = json.loads(Path(path).read_text(encoding="utf-8"))
+    texts = []
+    for row in rows:
+        title = row.get("title_carou") or row.get("title") or ""
+        content = row.get("content_carou") or row.get("content") or ""
+        if title or content:
+            texts.append({"title": title, "content": content})
+    return texts
+
+
+def _baseline_wrap_text(text: str, draw, font, max_width: int) -> list:
+    """
+    Césure historique des services de slides : mesure de chaque ligne candidate.
+    """
+    words = text.split()
+    lines = []
+    current = []
+    for word in words:
+        candidate = " ".join(current + [word])
+        if draw.textlength(candidate, font=font) <= max_width:
+            current.append(word)
+        else:
+            if current:
+                lines.append(" ".join(current))
+            current = [word]
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def baseline_fit_text(draw, text: str, max_width: int, max_height: int, start_size: int,
+                      font_path: str, weight=None) -> tuple:
+    """
+    _fit_text historique : taille décrémentée de 2 en 2 jusqu'à ce que le texte tienne.
+    """
+    from services.carousel.render_assets import load_font
+
+    size = start_size
+    while size > 12:
+        font = load_font(font_path, size, weight=weight)
+        lines = _baseline_wrap_text(text, draw, font, max_width)
+        line_height = int(size * 1.2)
+        total_height = line_height * len(lines)
+        if total_height <= max_height:
+            return font, lines
+        size -= 2
+    font = load_font(font_path, 12, weight=weight)
+    return font, _baseline_wrap_text(text, draw, font, max_width)
+
+
+def cases(texts: list) -> list:
+    """
+    (texte, max_height, start_size, font_path, weight) comme dans generate_carousel_slide
+    """
+    out = []
+    for text in texts:
+        if text["title"]:
+            out.append((text["title"], 80, 46, FONT_TITLE_PATH, 700))
+        if text["content"]:
+            for height in CONTENT_HEIGHTS:
+                out.append((text["content"], height, 39, FONT_CONTENT_PATH, 500))
+    return out
+
+
+def run(fit, draw, all_cases: list, rounds: int, reset=None) -> tuple:
+    results = [fit(draw, text, TEXT_WIDTH, height, start_size=size, font_path=path, weight=weight)
+               for text, height, size, path, weight in all_cases]
+    # Meilleur de REPEATS séries (limite le bruit du scheduler)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if reset:
+                reset()
+            for text, height, size, path, weight in all_cases:
+                fit(draw, text, TEXT_WIDTH, height, start_size=size, font_path=path, weight=weight)
+        best = min(best, time.perf_counter() - start)
+    return results, (len(all_cases) * rounds / best) if best else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ajustement de texte des slides (fits/s)")
+    parser.add_argument("--texts", help="export JSON des textes carousel (title_carou / content_carou)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent
+    sys.path.insert(0, str(root))
+    os.chdir(root)
+    from PIL import Image, ImageDraw
+    from services.carousel import text_fit
+
+    texts = load_texts(args.texts) if args.texts else SAMPLE_TEXTS
+    all_cases = cases(texts)
+    if not all_cases:
+        print("❌ Aucun texte à analyser")
+        return 1
+    draw = ImageDraw.Draw(Image.new("RGBA", (1080, 1350)))
+
+    print(f"🔧 Textes: {'export (' + args.texts + ')' if args.texts else 'exemples'} "
+          f"| cas={len(all_cases)} | rounds={args.rounds}")
+    print(f"{'variante':<28}{'fits/s':>12}{'gain':>8}")
+    results_before, rate_before = run(baseline_fit_text, draw, all_cases, args.rounds)
+    print(f"{'avant (linéaire)':<28}{rate_before:>12,.0f}{'-':>8}")
+    for label, reset in (("après (cache froid)", text_fit.clear_text_fit_cache), ("après (cache chaud)", None)):
+        results_after, rate_after = run(text_fit.fit_text, draw, all_cases, args.rounds, reset=reset)
+        gain = f"x{rate_after / rate_before:.2f}" if rate_before else "-"
+        print(f"{label:<28}{rate_after:>12,.0f}{gain:>8}")
+
+    diffs = [
+        idx for idx, (before, after) in enumerate(zip(results_before, results_after))
+        if before[0] is not after[0] or before[1] != after[1]
+    ]
+    if diffs:
+        print(f"⚠️ {len(diffs)} mises en page différentes (cas {diffs[:10]})")
+    else:
+        print("✅ Mises en page identiques (police + lignes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,49 @@
+import threading
+
 from supabase import create_client
 import streamlit as st
 
+# Un seul client par process (et par couple url/key) : les sessions HTTP
+# internes (postgrest, storage) gardent leurs connexions keep-alive et sont
+# partagées par tous les services et threads de travail.
+_lock = threading.Lock()
+_client = None
+_client_key = None
+_stats = {"created": 0, "reused": 0}
+
+
 def get_supabase():
+    global _client, _client_key
     url = st.secrets["SUPABASE_URL"]
     key = st.secrets["SUPABASE_SERVICE_KEY"]
-    return create_client(url, key)
+    with _lock:
+        if _client is not None and _client_key == (url, key):
+            _stats["reused"] += 1
+            return _client
+        _client = create_client(url, key)
+        _client_key = (url, key)
+        _stats["created"] += 1
+        return _client
+
+
+def get_supabase_stats() -> dict:
+    """
+    Compteurs du client partagé : créations vs réutilisations
+    """
+    with _lock:
+        total = _stats["created"] + _stats["reused"]
+        return {
+            "created": _stats["created"],
+            "reused": _stats["reused"],
+            "reuse_ratio": (_stats["reused"] / total) if total else 0.0,
+        }
+
+
+def reset_supabase() -> None:
+    """
+    Force la recréation du client au prochain appel (rotation de clé, tests)
+    """
+    global _client, _client_key
+    with _lock:
+        _client = None
+        _client_key = None
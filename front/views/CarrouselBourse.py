@@ -5,6 +5,7 @@ import os
 import hashlib
 import io
 import zipfile
+from functools import partial
 from datetime import datetime, timedelta
 import streamlit.components.v1 as components
 from urllib.parse import urlparse, parse_qs
@@ -29,6 +30,7 @@ from services.carousel.bourse.carousel_image_service import (
     save_image_to_bourse
 )
 from services.carousel.bourse.carousel_slide_service import (
+    SLIDES_BUCKET,
     generate_carousel_slide,
     generate_cover_slide,
     upload_slide_bytes,
@@ -36,6 +38,16 @@ from services.carousel.bourse.carousel_slide_service import (
     list_slide_files,
     clear_slide_files
 )
+from services.carousel.render_cache import (
+    get_slide_manifest,
+    publish_rendered_slide,
+    publish_slide_async,
+    published_slide_bytes,
+    render_slide_cached,
+    render_slide_once,
+    upload_if_changed
+)
+from services.carousel.slide_encoder import PREVIEW_PROFILE
 from services.utils.email_service import send_email_with_attachments
 from PIL import Image
 
@@ -331,6 +343,7 @@ def generate_all_slide_previews():
         st.session_state.slide_previews = {}
     
     errors = 0
+    manifest = get_slide_manifest(SLIDES_BUCKET, max_age_sec=0)
     items_sorted = sorted(
         carousel_data["items"],
         key=lambda i: (0 if i.get("position") == 0 else 1, i.get("position", 999))
@@ -358,13 +371,18 @@ def generate_all_slide_previews():
         cache_key = hashlib.md5(hash_input.encode("utf-8")).hexdigest()
         
         try:
+            # Cache de rendu : slide inchangée → ni rendu ni upload
             if position == 0:
-                slide_bytes = generate_cover_slide(
+                slide = render_slide_cached(
+                    generate_cover_slide,
+                    manifest=manifest,
                     image_url=image_url,
                     image_bytes=image_bytes
                 )
             else:
-                slide_bytes = generate_carousel_slide(
+                slide = render_slide_cached(
+                    generate_carousel_slide,
+                    manifest=manifest,
                     title=title_carou,
                     content=content_carou,
                     image_url=image_url,
@@ -372,12 +390,13 @@ def generate_all_slide_previews():
                 )
             st.session_state.slide_previews[item_id] = {
                 "key": cache_key,
-                "bytes": slide_bytes
+                "bytes": slide.data
             }
             # Upload storage (upsert)
-            upload_slide_bytes(f"slide_{position}.png", slide_bytes)
+            upload_if_changed(manifest, f"slide_{position}.png", slide.key, slide.data, upload_slide_bytes)
         except Exception:
             errors += 1
+    manifest.save()
     
     # Upload outro
     outro_path = os.path.join(
@@ -410,18 +429,22 @@ def build_carousel_exports(items_sorted):
             continue
         
         cached = st.session_state.slide_previews.get(item_id) if "slide_previews" in st.session_state else None
-        if cached and cached.get("bytes"):
-            slide_bytes = cached["bytes"]
-        else:
+        slide_bytes = published_slide_bytes(cached)
+        if not slide_bytes:
             if position == 0:
-                slide_bytes = generate_cover_slide(image_url=image_url, image_bytes=image_bytes)
+                slide_bytes = render_slide_cached(
+                    generate_cover_slide,
+                    image_url=image_url,
+                    image_bytes=image_bytes
+                ).data
             else:
-                slide_bytes = generate_carousel_slide(
+                slide_bytes = render_slide_cached(
+                    generate_carousel_slide,
                     title=title_carou,
                     content=content_carou,
                     image_url=image_url,
                     image_bytes=image_bytes
-                )
+                ).data
         
         filename = f"slide_{position}.png"
         slides.append((position, filename, slide_bytes))
@@ -1326,6 +1349,7 @@ with st.expander("🖼️ Preview Slides", expanded=False):
         
         cols = None
         stored_files = list_slide_files()
+        manifest = get_slide_manifest(SLIDES_BUCKET)
         # Ajouter un item "outro" en fin de preview
         items_with_outro = items_sorted + [{"id": "outro", "position": 999}]
         
@@ -1422,23 +1446,32 @@ with st.expander("🖼️ Preview Slides", expanded=False):
                 
                 if not cached or cached.get("key") != cache_key:
                     try:
+                        # Canvas rendu une fois (image téléchargée une fois), encodé en preview puis en PNG publié
                         if position == 0:
-                            slide_bytes = generate_cover_slide(
+                            render_slide = render_slide_once(
+                                generate_cover_slide,
+                                manifest=manifest,
                                 image_url=image_url,
                                 image_bytes=image_bytes
                             )
                         else:
-                            slide_bytes = generate_carousel_slide(
+                            render_slide = render_slide_once(
+                                generate_carousel_slide,
+                                manifest=manifest,
                                 title=title_carou,
                                 content=content_carou,
                                 image_url=image_url,
                                 image_bytes=image_bytes
                             )
+                        # Preview JPEG affichée tout de suite, PNG publié + upload en arrière-plan
                         st.session_state.slide_previews[item_id] = {
                             "key": cache_key,
-                            "bytes": slide_bytes
+                            "bytes": render_slide(PREVIEW_PROFILE).data,
+                            "publish": publish_slide_async(
+                                render_slide,
+                                partial(publish_rendered_slide, manifest, f"slide_{position}.png", upload_slide_bytes)
+                            )
                         }
-                        upload_slide_bytes(f"slide_{position}.png", slide_bytes)
                     except Exception as e:
                         st.error(f"Erreur génération slide : {str(e)[:120]}")
                         continue
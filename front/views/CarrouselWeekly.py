@@ -8,6 +8,7 @@ from datetime import datetime
 import streamlit as st
 from PIL import Image, ImageDraw, ImageFont
 
+from services.carousel.slide_encoder import PREVIEW_PROFILE, PUBLISH_PROFILE, encode_slide
 from services.utils.email_service import send_email_with_attachments
 from services.marketbrewery.market_brewery_service import (
     get_top_flop_weekly,
@@ -417,7 +418,7 @@ def _render_close_table(
         row_y += row_height
 
 
-def _render_slide_bytes(filename: str, path: str) -> bytes:
+def _render_slide_image(filename: str, path: str) -> Image.Image:
     img = Image.open(path).convert("RGBA")
     match = re.search(r"slide[_\s-]?(\d+)", filename, re.IGNORECASE)
     slide_number = int(match.group(1)) if match else None
@@ -606,9 +607,11 @@ def _render_slide_bytes(filename: str, path: str) -> bytes:
         except Exception:
             pass  # Si erreur, on continue sans le swipe
     
-    output = io.BytesIO()
-    img.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return img.convert("RGB")
+
+
+def _render_slide_bytes(filename: str, path: str, profile: str = PUBLISH_PROFILE) -> bytes:
+    return encode_slide(_render_slide_image(filename, path), profile)
 
 
 def build_weekly_exports(slide_paths: list[tuple[str, str]]) -> dict[str, object]:
@@ -622,8 +625,8 @@ def build_weekly_exports(slide_paths: list[tuple[str, str]]) -> dict[str, object
     slides = []
     for filename, path in sorted_paths:
         try:
-            slide_bytes = _render_slide_bytes(filename, path)
-            slides.append((_slide_number_from_name(filename), filename, slide_bytes))
+            slide_img = _render_slide_image(filename, path)
+            slides.append((_slide_number_from_name(filename), filename, slide_img))
         except Exception:
             continue
 
@@ -632,19 +635,16 @@ def build_weekly_exports(slide_paths: list[tuple[str, str]]) -> dict[str, object
     # ZIP
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for slide_num, filename, data in slides:
+        for slide_num, filename, slide_img in slides:
             if slide_num != 999:
                 zip_name = f"slide_{slide_num:0{num_width}d}.png"
             else:
                 zip_name = filename
-            zf.writestr(zip_name, data)
+            zf.writestr(zip_name, encode_slide(slide_img, PUBLISH_PROFILE))
     zip_buffer.seek(0)
 
-    # PDF
-    images = []
-    for _, _, data in slides:
-        img = Image.open(io.BytesIO(data)).convert("RGB")
-        images.append(img)
+    # PDF (images déjà rendues, pas de re-décodage des PNG)
+    images = [slide_img for _, _, slide_img in slides]
     pdf_buffer = io.BytesIO()
     if images:
         images[0].save(
@@ -694,7 +694,7 @@ if slide_files:
         with col:
             st.caption(filename)
             try:
-                slide_bytes = _render_slide_bytes(filename, path)
+                slide_bytes = _render_slide_bytes(filename, path, PREVIEW_PROFILE)
                 st.image(slide_bytes, use_container_width=True)
             except Exception as e:
                 st.error(f"Erreur rendu {filename}: {str(e)}")
@@ -165,29 +165,19 @@ with st.container():
                 # Récupérer les items selon le mode sélectionné
                 items = fetch_items_to_enrich(limit=limit_value, force_all=force_all)
                 total = len(items)
-                success_count = 0
-                error_count = 0
                 
-                from services.enrichment.enrichment_service import enrich_single_item
+                def _update_progress(payload: dict) -> None:
+                    progress = payload.get("progress", 0)
+                    progress_bar.progress(min(max(progress, 0), 1))
+                    progress_text.markdown(f"**Traitement : {payload.get('current', 0)}/{total} items** ({int(progress*100)}%)")
+                    status_text.text(f"✅ {payload.get('success', 0)} · ❌ {payload.get('errors', 0)}")
                 
-                for idx, item in enumerate(items, start=1):
-                    item_id = item.get("id")
-                    title = item.get("title", "")
-                    content = item.get("content", "")
-                    
-                    # Afficher la progression
-                    progress = idx / total
-                    progress_bar.progress(progress)
-                    progress_text.markdown(f"**Traitement : {idx}/{total} items** ({int(progress*100)}%)")
-                    status_text.text(f"Item en cours : {title[:50]}...")
-                    
-                    # Enrichir l'item
-                    result = enrich_single_item(item_id, title, content)
-                    
-                    if result["status"] == "success":
-                        success_count += 1
-                    else:
-                        error_count += 1
+                # Enrichir les items (workers parallèles, débit OpenAI limité)
+                from services.enrichment.enrichment_service import enrich_items_concurrent
+                
+                result = enrich_items_concurrent(items, progress_cb=_update_progress)
+                success_count = result["success"]
+                error_count = result["errors"]
                 
                 duration = time.time() - start_time
                 
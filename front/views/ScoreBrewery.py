@@ -1,6 +1,6 @@
 import streamlit as st
 from services.scoring.scoring_service import (
-    score_single_item,
+    score_items_batch,
     get_scoring_stats,
     fetch_items_to_score
 )
@@ -163,43 +163,19 @@ with st.container():
                 
                 items = fetch_items_to_score(limit=limit_value, force_all=force_all)
                 total = len(items)
-                success_count = 0
-                error_count = 0
-                last_error_msg = ""
                 
-                for idx, item in enumerate(items, start=1):
-                    try:
-                        item_id = item.get("id")
-                        title = item.get("title", "")
-                        content = item.get("content", "")
-                        tags = item.get("tags")
-                        labels = item.get("labels")
-                        entities = item.get("entities")
-                        source_type = item.get("source_type")
-                        
-                        # Afficher la progression
-                        progress = idx / total
-                        progress_bar.progress(progress)
-                        progress_text.markdown(f"**Traitement : {idx}/{total} items** ({int(progress*100)}%)")
-                        status_text.text(f"Item: {title[:40]}... | Tag: {tags} | Label: {labels}")
-                        
-                        # Scorer l'item
-                        result = score_single_item(item_id, title, content, tags, labels, entities, source_type)
-                        
-                        # DEBUG visible
-                        if result["status"] == "success":
-                            success_count += 1
-                            status_text.text(f"✅ Score: {result.get('score')} | {title[:40]}...")
-                        else:
-                            error_count += 1
-                            error_msg = result.get('message', 'Inconnue')
-                            last_error_msg = error_msg
-                            status_text.text(f"❌ Erreur: {error_msg[:80]}")
-                    
-                    except Exception as e:
-                        error_count += 1
-                        last_error_msg = str(e)
-                        status_text.text(f"❌ Exception: {str(e)[:80]}")
+                def _update_progress(payload: dict) -> None:
+                    progress = payload.get("progress", 0)
+                    progress_bar.progress(min(max(progress, 0), 1))
+                    progress_text.markdown(f"**Traitement : {payload.get('current', 0)}/{total} items** ({int(progress*100)}%)")
+                    status_text.text(f"✅ {payload.get('success', 0)} · ❌ {payload.get('errors', 0)}")
+                
+                # Scorer par lots de même label (repli unitaire si réponse invalide)
+                result = score_items_batch(items, progress_cb=_update_progress)
+                success_count = result["success"]
+                error_count = result["errors"]
+                errors = [d for d in result["details"] if d.get("status") != "success"]
+                last_error_msg = errors[-1].get("message", "Inconnue") if errors else ""
                 
                 duration = time.time() - start_time
                 
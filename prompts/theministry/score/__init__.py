@@ -4,6 +4,7 @@ from prompts.theministry.score.score_pea import PROMPT_SCORE_PEA
 from prompts.theministry.score.score_action import PROMPT_SCORE_ACTION
 from prompts.theministry.score.score_commodites import PROMPT_SCORE_COMMODITES
 from prompts.theministry.score.score_crypto import PROMPT_SCORE_CRYPTO
+from prompts.theministry.score.score_batch import PROMPT_SCORE_BATCH_MODE
 
 __all__ = [
     "PROMPT_SCORE_ECO_GEOPOL",
@@ -11,5 +12,6 @@ __all__ = [
     "PROMPT_SCORE_PEA",
     "PROMPT_SCORE_ACTION",
     "PROMPT_SCORE_COMMODITES",
-    "PROMPT_SCORE_CRYPTO"
+    "PROMPT_SCORE_CRYPTO",
+    "PROMPT_SCORE_BATCH_MODE"
 ]
@@ -0,0 +1,14 @@
+PROMPT_SCORE_BATCH_MODE = """
+───────────────────────────────────────────────────────
+MODE BATCH (PRIORITAIRE SUR LE FORMAT CI-DESSUS)
+───────────────────────────────────────────────────────
+
+Tu reçois PLUSIEURS actualités, chacune précédée de "### ITEM <id>".
+Applique le barème ci-dessus à CHAQUE actualité, indépendamment des autres.
+
+- Un score par item, entier de 0 à 100
+- Reprends l'<id> EXACT de chaque item
+- N'oublie aucun item, n'en invente aucun
+- Retourne UNIQUEMENT un objet JSON :
+  {"scores": [{"id": "<id>", "score": X}, ...]}
+"""
@@ -8,10 +8,14 @@ from __future__ import annotations
 from io import BytesIO
 from typing import Optional, Tuple, Set
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import requests
 import os
 from db.supabase_client import get_supabase
+from services.carousel.render_assets import asset_size, load_font, load_overlay
+from services.carousel.render_cache import forget_slide_manifest
+from services.carousel.slide_encoder import PUBLISH_PROFILE, encode_slide
+from services.carousel.text_fit import fit_text
 
 
 ASSETS_DIR = os.path.join(
@@ -50,17 +54,6 @@ TITLE_FONT_SIZE = 46
 CONTENT_FONT_SIZE = 39
 
 
-def _load_font(path: str, size: int, weight: int | None = None) -> ImageFont.ImageFont:
-    if os.path.exists(path):
-        try:
-            # Variable font support if available
-            axis = {"wght": weight} if weight else None
-            return ImageFont.truetype(path, size=size, layout_engine=ImageFont.Layout.RAQM, axis=axis)
-        except Exception:
-            return ImageFont.truetype(path, size=size)
-    return ImageFont.load_default()
-
-
 def _load_image_from_url(image_url: str) -> Image.Image:
     response = requests.get(image_url, timeout=20)
     response.raise_for_status()
@@ -82,45 +75,6 @@ def _cover_resize(img: Image.Image, target: Tuple[int, int]) -> Image.Image:
     return img.crop((left, top, left + target_w, top + target_h))
 
 
-def _wrap_text(text: str, draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, max_width: int) -> list[str]:
-    words = text.split()
-    lines = []
-    current = []
-    for word in words:
-        candidate = " ".join(current + [word])
-        if draw.textlength(candidate, font=font) <= max_width:
-            current.append(word)
-        else:
-            if current:
-                lines.append(" ".join(current))
-            current = [word]
-    if current:
-        lines.append(" ".join(current))
-    return lines
-
-
-def _fit_text(
-    draw: ImageDraw.ImageDraw,
-    text: str,
-    max_width: int,
-    max_height: int,
-    start_size: int,
-    font_path: str,
-    weight: int | None = None
-) -> Tuple[ImageFont.ImageFont, list[str]]:
-    size = start_size
-    while size > 12:
-        font = _load_font(font_path, size, weight=weight)
-        lines = _wrap_text(text, draw, font, max_width)
-        line_height = int(size * 1.2)
-        total_height = line_height * len(lines)
-        if total_height <= max_height:
-            return font, lines
-        size -= 2
-    font = _load_font(font_path, 12, weight=weight)
-    return font, _wrap_text(text, draw, font, max_width)
-
-
 def _sentence_case(text: str) -> str:
     """Met une majuscule au début de chaque phrase."""
     parts = []
@@ -137,10 +91,11 @@ def generate_carousel_slide(
     title: str,
     content: str,
     image_url: Optional[str] = None,
-    image_bytes: Optional[bytes] = None
+    image_bytes: Optional[bytes] = None,
+    profile: str = PUBLISH_PROFILE
 ) -> bytes:
     """
-    Retourne un PNG (bytes) de la slide finale.
+    Retourne la slide finale encodée (PNG "publish" par défaut, cf. slide_encoder).
     Canvas 1080×1350 avec fond #F4F4EB, image 5:4 (1080×864) collée en bas.
     """
     if not image_url and not image_bytes:
@@ -170,30 +125,27 @@ def generate_carousel_slide(
     overlay_width = 1100
     overlay_height = 600
     overlay_x = -10  # Centré avec clipping
-    if os.path.exists(overlay_slide0_path):
-        overlay_slide0 = Image.open(overlay_slide0_path).convert("RGBA")
-        # Forcer à 1100x600 (pas de ratio, taille fixe)
-        overlay_slide0 = overlay_slide0.resize((overlay_width, overlay_height), Image.LANCZOS)
+    # Forcer à 1100x600 (pas de ratio, taille fixe)
+    overlay_slide0 = load_overlay(overlay_slide0_path, (overlay_width, overlay_height))
+    if overlay_slide0 is not None:
         canvas.alpha_composite(overlay_slide0, (overlay_x, 0))
 
     draw = ImageDraw.Draw(canvas)
 
     # Logo
-    logo_path = os.path.join(ASSETS_DIR, "Logo.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo = logo.resize(LOGO_SIZE, Image.LANCZOS)
+    logo = load_overlay(os.path.join(ASSETS_DIR, "Logo.png"), LOGO_SIZE)
+    if logo is not None:
         logo_x = (CANVAS_SIZE[0] - LOGO_SIZE[0]) // 2
         canvas.alpha_composite(logo, (logo_x, LOGO_TOP))
 
     # swipe_bourse.png - En bas à droite de l'overlay : 50px du bas, 50px margin right
     swipe_bourse_path = os.path.join(ASSETS_DIR, "swipe_bourse.png")
-    if os.path.exists(swipe_bourse_path):
-        swipe_bourse = Image.open(swipe_bourse_path).convert("RGBA")
+    swipe_bourse_size = asset_size(swipe_bourse_path)
+    if swipe_bourse_size:
         # Augmenter la taille x1.2
-        new_width = int(swipe_bourse.size[0] * 1.2)
-        new_height = int(swipe_bourse.size[1] * 1.2)
-        swipe_bourse = swipe_bourse.resize((new_width, new_height), Image.LANCZOS)
+        new_width = int(swipe_bourse_size[0] * 1.2)
+        new_height = int(swipe_bourse_size[1] * 1.2)
+        swipe_bourse = load_overlay(swipe_bourse_path, (new_width, new_height))
         # Position: 50px du bas de l'overlay (overlay fait 600px de haut)
         swipe_bourse_y = overlay_height - 50 - swipe_bourse.size[1]
         # Position X: 50px du bord droit de l'overlay (overlay_x = -10, largeur = 1100)
@@ -204,10 +156,10 @@ def generate_carousel_slide(
     # Title background - positionné à 92px du top (87 + 5px)
     title_bg_path = os.path.join(ASSETS_DIR, "Title_bg_bourse.png")
     title_bg_top = 92
-    if os.path.exists(title_bg_path):
-        title_bg = Image.open(title_bg_path).convert("RGBA")
+    title_bg_size = asset_size(title_bg_path)
+    if title_bg_size:
         title_bg_width = CANVAS_SIZE[0] - (TITLE_BG_SIDE_MARGIN * 2)
-        title_bg = title_bg.resize((title_bg_width, title_bg.size[1]), Image.LANCZOS)
+        title_bg = load_overlay(title_bg_path, (title_bg_width, title_bg_size[1]))
         canvas.alpha_composite(title_bg, (TITLE_BG_SIDE_MARGIN, title_bg_top))
         title_bg_height = title_bg.size[1]
     else:
@@ -215,7 +167,7 @@ def generate_carousel_slide(
 
     # Title text - Inter Bold 48, blanc, letter spacing -1%
     title_max_width = CANVAS_SIZE[0] - LEFT_MARGIN - RIGHT_MARGIN
-    title_font, title_lines = _fit_text(
+    title_font, title_lines = fit_text(
         draw, title, title_max_width, 80, start_size=TITLE_FONT_SIZE, font_path=FONT_TITLE_PATH, weight=TITLE_FONT_WEIGHT
     )
     title_block_height = int(title_font.size * 1.2) * len(title_lines[:2])
@@ -229,7 +181,7 @@ def generate_carousel_slide(
     content_top = title_bg_top + title_bg_height + CONTENT_TOP_GAP
     content_max_height = CANVAS_SIZE[1] - content_top - CONTENT_BOTTOM_MARGIN
     content = _sentence_case(content)
-    content_font, content_lines = _fit_text(
+    content_font, content_lines = fit_text(
         draw, content, title_max_width, content_max_height, start_size=CONTENT_FONT_SIZE, font_path=FONT_CONTENT_PATH, weight=CONTENT_FONT_WEIGHT
     )
     line_height = int(content_font.size * 1.25)
@@ -242,18 +194,14 @@ def generate_carousel_slide(
         y += line_height
 
     # Swipe
-    swipe_path = os.path.join(ASSETS_DIR, "Swipe.png")
-    if os.path.exists(swipe_path):
-        swipe = Image.open(swipe_path).convert("RGBA")
-        swipe = swipe.resize(SWIPE_SIZE, Image.LANCZOS)
+    swipe = load_overlay(os.path.join(ASSETS_DIR, "Swipe.png"), SWIPE_SIZE)
+    if swipe is not None:
         x = CANVAS_SIZE[0] - swipe.size[0] - SWIPE_MARGIN
         y = CANVAS_SIZE[1] - swipe.size[1] - SWIPE_MARGIN
         canvas.alpha_composite(swipe, (x, y))
 
     # Export
-    output = BytesIO()
-    canvas.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return encode_slide(canvas, profile)
 
 
 def _format_french_date(dt: Optional[datetime] = None) -> str:
@@ -274,7 +222,8 @@ def _format_french_date(dt: Optional[datetime] = None) -> str:
 
 def generate_cover_slide(
     image_url: Optional[str] = None,
-    image_bytes: Optional[bytes] = None
+    image_bytes: Optional[bytes] = None,
+    profile: str = PUBLISH_PROFILE
 ) -> bytes:
     """
     Génère la slide de couverture (position 0).
@@ -305,47 +254,40 @@ def generate_cover_slide(
     # 2. Overlay Slide0 - Force 1100px de large pour couvrir les strokes/patterns
     # Les 10px de chaque côté seront clippés automatiquement par le canvas
     overlay_slide0_path = os.path.join(ASSETS_DIR, "Overlay_Slide0.png")
-    if os.path.exists(overlay_slide0_path):
-        overlay_slide0 = Image.open(overlay_slide0_path).convert("RGBA")
+    overlay_slide0_size = asset_size(overlay_slide0_path)
+    if overlay_slide0_size:
         # Forcer le redimensionnement à 1100px de large (20px de plus que le canvas)
-        original_width, original_height = overlay_slide0.size
+        original_width, original_height = overlay_slide0_size
         target_width = 1100  # 20px de plus pour gérer les strokes/patterns
         scale = target_width / original_width
         target_height = int(original_height * scale)
-        overlay_slide0 = overlay_slide0.resize((target_width, target_height), Image.LANCZOS)
+        overlay_slide0 = load_overlay(overlay_slide0_path, (target_width, target_height))
         # Centrer : (1080 - 1100) / 2 = -10px (déborde de 10px de chaque côté)
         x_offset = (CANVAS_SIZE[0] - target_width) // 2
         canvas.alpha_composite(overlay_slide0, (x_offset, 0))
     
     # 3. Top bar collée en haut, AU-DESSUS de l'overlay (0 margin)
     top_bar_path = os.path.join(ASSETS_DIR, "top_bar.png")
-    if os.path.exists(top_bar_path):
-        top_bar = Image.open(top_bar_path).convert("RGBA")
+    top_bar_size = asset_size(top_bar_path)
+    if top_bar_size:
         # Redimensionner pour correspondre à la largeur du canvas si nécessaire
-        if top_bar.size[0] != CANVAS_SIZE[0]:
-            scale = CANVAS_SIZE[0] / top_bar.size[0]
-            top_bar = top_bar.resize(
-                (int(top_bar.size[0] * scale), int(top_bar.size[1] * scale)),
-                Image.LANCZOS
-            )
+        scale = CANVAS_SIZE[0] / top_bar_size[0]
+        top_bar = load_overlay(top_bar_path, (int(top_bar_size[0] * scale), int(top_bar_size[1] * scale)))
         canvas.alpha_composite(top_bar, (0, 0))
     
     draw = ImageDraw.Draw(canvas)
     
     # Logo principal (haut) - cover (scale x2) - collé en haut au centre (0px)
-    logo_path = os.path.join(ASSETS_DIR, "Logo.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo_size = (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2)  # 400×130
-        logo = logo.resize(logo_size, Image.LANCZOS)
+    logo_size = (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2)  # 400×130
+    logo = load_overlay(os.path.join(ASSETS_DIR, "Logo.png"), logo_size)
+    if logo is not None:
         logo_x = (CANVAS_SIZE[0] - logo_size[0]) // 2
         canvas.alpha_composite(logo, (logo_x, 0))  # 0px du haut
     
     # Logo slide 0 - "Le roll Bourse" (168px top, 45px left)
-    cover_logo_path = os.path.join(ASSETS_DIR, "Logo_slide0.png")
+    cover_logo = load_overlay(os.path.join(ASSETS_DIR, "Logo_slide0.png"))
     cover_logo_height = 0
-    if os.path.exists(cover_logo_path):
-        cover_logo = Image.open(cover_logo_path).convert("RGBA")
+    if cover_logo is not None:
         cover_logo_height = cover_logo.size[1]
         # Pas de scale, utiliser la taille originale de l'asset
         canvas.alpha_composite(cover_logo, (45, 168))
@@ -353,7 +295,7 @@ def generate_cover_slide(
     # Date - 51px sous le logo, 50px left, taille 68, letter spacing -1%
     date_str = _format_french_date()
     date_font_size = 68
-    date_font = _load_font(FONT_DATE_PATH, date_font_size, weight=DATE_FONT_WEIGHT)
+    date_font = load_font(FONT_DATE_PATH, date_font_size, weight=DATE_FONT_WEIGHT)
     
     # Position : 168px (logo top) + hauteur du logo + 51px
     date_y = 168 + cover_logo_height + 51
@@ -368,23 +310,21 @@ def generate_cover_slide(
     
     # Swipe (cover) - 84px de large, centré avec la date + 5px vers le bas, à droite avec 50px margin
     swipe_path = os.path.join(ASSETS_DIR, "Swipe.png")
-    if os.path.exists(swipe_path):
-        swipe = Image.open(swipe_path).convert("RGBA")
+    swipe_size = asset_size(swipe_path)
+    if swipe_size:
         # Forcer largeur à 84px, hauteur proportionnelle
-        original_width, original_height = swipe.size
+        original_width, original_height = swipe_size
         target_width = 84
         scale = target_width / original_width
         target_height = int(original_height * scale)
-        swipe = swipe.resize((target_width, target_height), Image.LANCZOS)
+        swipe = load_overlay(swipe_path, (target_width, target_height))
         # Position X : à droite avec 50px de margin
         swipe_x = CANVAS_SIZE[0] - swipe.size[0] - 50
         # Position Y : centré avec la date + 5px vers le bas
         swipe_y = date_y + (date_height - swipe.size[1]) // 2 + 5
         canvas.alpha_composite(swipe, (swipe_x, swipe_y))
     
-    output = BytesIO()
-    canvas.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return encode_slide(canvas, profile)
 
 
 def upload_slide_bytes(filename: str, image_bytes: bytes) -> Optional[str]:
@@ -429,6 +369,7 @@ def clear_slide_files() -> bool:
         if not files:
             return True
         supabase.storage.from_(SLIDES_BUCKET).remove(list(files))
+        forget_slide_manifest(SLIDES_BUCKET)
         return True
     except Exception:
         return False
@@ -8,11 +8,14 @@ from __future__ import annotations
 from io import BytesIO
 from typing import Optional, Tuple, Set
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import requests
 import os
 
 from db.supabase_client import get_supabase
+from services.carousel.render_assets import asset_size, load_overlay
+from services.carousel.slide_encoder import PUBLISH_PROFILE, encode_slide
+from services.carousel.text_fit import fit_text
 
 
 ASSETS_DIR = os.path.join(
@@ -50,16 +53,6 @@ TITLE_LETTER_SPACING = -0.01  # -1%
 CONTENT_LETTER_SPACING = 0.01  # +1%
 
 
-def _load_font(path: str, size: int, weight: int | None = None) -> ImageFont.ImageFont:
-    if os.path.exists(path):
-        try:
-            axis = {"wght": weight} if weight else None
-            return ImageFont.truetype(path, size=size, layout_engine=ImageFont.Layout.RAQM, axis=axis)
-        except Exception:
-            return ImageFont.truetype(path, size=size)
-    return ImageFont.load_default()
-
-
 def _load_image_from_url(image_url: str) -> Image.Image:
     response = requests.get(image_url, timeout=20)
     response.raise_for_status()
@@ -81,45 +74,6 @@ def _cover_resize(img: Image.Image, target: Tuple[int, int]) -> Image.Image:
     return img.crop((left, top, left + target_w, top + target_h))
 
 
-def _wrap_text(text: str, draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, max_width: int) -> list[str]:
-    words = text.split()
-    lines = []
-    current = []
-    for word in words:
-        candidate = " ".join(current + [word])
-        if draw.textlength(candidate, font=font) <= max_width:
-            current.append(word)
-        else:
-            if current:
-                lines.append(" ".join(current))
-            current = [word]
-    if current:
-        lines.append(" ".join(current))
-    return lines
-
-
-def _fit_text(
-    draw: ImageDraw.ImageDraw,
-    text: str,
-    max_width: int,
-    max_height: int,
-    start_size: int,
-    font_path: str,
-    weight: int | None = None
-) -> tuple[ImageFont.ImageFont, list[str]]:
-    size = start_size
-    while size > 12:
-        font = _load_font(font_path, size, weight=weight)
-        lines = _wrap_text(text, draw, font, max_width)
-        line_height = int(size * 1.2)
-        total_height = line_height * len(lines)
-        if total_height <= max_height:
-            return font, lines
-        size -= 2
-    font = _load_font(font_path, 12, weight=weight)
-    return font, _wrap_text(text, draw, font, max_width)
-
-
 def _sentence_case(text: str) -> str:
     parts = []
     for part in text.strip().split(". "):
@@ -135,10 +89,11 @@ def generate_carousel_slide(
     title: str,
     content: str,
     image_url: Optional[str] = None,
-    image_bytes: Optional[bytes] = None
+    image_bytes: Optional[bytes] = None,
+    profile: str = PUBLISH_PROFILE
 ) -> bytes:
     """
-    Retourne un PNG (bytes) de la slide finale.
+    Retourne la slide finale encodée (PNG "publish" par défaut, cf. slide_encoder).
     Canvas 1080×1350 avec fond #F4F4EB, image 5:4 (1080×864) collée en bas.
     """
     if not image_url and not image_bytes:
@@ -168,30 +123,27 @@ def generate_carousel_slide(
     overlay_width = 1100
     overlay_height = 600
     overlay_x = -10  # Centré avec clipping
-    if os.path.exists(overlay_slide0_path):
-        overlay_slide0 = Image.open(overlay_slide0_path).convert("RGBA")
-        # Forcer à 1100x600 (pas de ratio, taille fixe)
-        overlay_slide0 = overlay_slide0.resize((overlay_width, overlay_height), Image.LANCZOS)
+    # Forcer à 1100x600 (pas de ratio, taille fixe)
+    overlay_slide0 = load_overlay(overlay_slide0_path, (overlay_width, overlay_height))
+    if overlay_slide0 is not None:
         canvas.alpha_composite(overlay_slide0, (overlay_x, 0))
 
     draw = ImageDraw.Draw(canvas)
 
     # Logo
-    logo_path = os.path.join(ASSETS_DIR, "Logo.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo = logo.resize(LOGO_SIZE, Image.LANCZOS)
+    logo = load_overlay(os.path.join(ASSETS_DIR, "Logo.png"), LOGO_SIZE)
+    if logo is not None:
         logo_x = (CANVAS_SIZE[0] - LOGO_SIZE[0]) // 2
         canvas.alpha_composite(logo, (logo_x, LOGO_TOP))
 
     # swipe_breaking.png - En bas à droite de l'overlay : 50px du bas, 50px margin right
     swipe_breaking_path = os.path.join(ASSETS_DIR, "swipe_breaking.png")
-    if os.path.exists(swipe_breaking_path):
-        swipe_breaking = Image.open(swipe_breaking_path).convert("RGBA")
+    swipe_breaking_size = asset_size(swipe_breaking_path)
+    if swipe_breaking_size:
         # Augmenter la taille x1.2
-        new_width = int(swipe_breaking.size[0] * 1.2)
-        new_height = int(swipe_breaking.size[1] * 1.2)
-        swipe_breaking = swipe_breaking.resize((new_width, new_height), Image.LANCZOS)
+        new_width = int(swipe_breaking_size[0] * 1.2)
+        new_height = int(swipe_breaking_size[1] * 1.2)
+        swipe_breaking = load_overlay(swipe_breaking_path, (new_width, new_height))
         # Position: 50px du bas de l'overlay (overlay fait 600px de haut)
         swipe_breaking_y = overlay_height - 50 - swipe_breaking.size[1]
         # Position X: 50px du bord droit de l'overlay (overlay_x = -10, largeur = 1100)
@@ -203,10 +155,10 @@ def generate_carousel_slide(
     title_bg_path = os.path.join(ASSETS_DIR, "Title_bg_breaking.png")
     TITLE_BG_SIDE_MARGIN = 50
     CONTENT_BOTTOM_MARGIN = 20
-    if os.path.exists(title_bg_path):
-        title_bg = Image.open(title_bg_path).convert("RGBA")
+    title_bg_size = asset_size(title_bg_path)
+    if title_bg_size:
         title_bg_width = CANVAS_SIZE[0] - (TITLE_BG_SIDE_MARGIN * 2)
-        title_bg = title_bg.resize((title_bg_width, title_bg.size[1]), Image.LANCZOS)
+        title_bg = load_overlay(title_bg_path, (title_bg_width, title_bg_size[1]))
         canvas.alpha_composite(title_bg, (TITLE_BG_SIDE_MARGIN, TITLE_BG_TOP))
         title_bg_height = title_bg.size[1]
     else:
@@ -215,7 +167,7 @@ def generate_carousel_slide(
     # Title text - Inter Bold 46, blanc, letter spacing -1%
     title_max_width = CANVAS_SIZE[0] - LEFT_MARGIN - RIGHT_MARGIN
     TITLE_FONT_WEIGHT = 700  # Bold
-    title_font, title_lines = _fit_text(
+    title_font, title_lines = fit_text(
         draw, title, title_max_width, 80, start_size=TITLE_FONT_SIZE, font_path=FONT_TITLE_PATH, weight=TITLE_FONT_WEIGHT
     )
     title_block_height = int(title_font.size * 1.2) * len(title_lines[:2])
@@ -230,7 +182,7 @@ def generate_carousel_slide(
     content_max_height = CANVAS_SIZE[1] - content_top - CONTENT_BOTTOM_MARGIN
     content = _sentence_case(content)
     CONTENT_FONT_WEIGHT = 500  # Medium
-    content_font, content_lines = _fit_text(
+    content_font, content_lines = fit_text(
         draw, content, title_max_width, content_max_height, start_size=CONTENT_FONT_SIZE, font_path=FONT_CONTENT_PATH, weight=CONTENT_FONT_WEIGHT
     )
     line_height = int(content_font.size * 1.25)
@@ -243,9 +195,7 @@ def generate_carousel_slide(
         y += line_height
 
     # Export
-    output = BytesIO()
-    canvas.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return encode_slide(canvas, profile)
 
 
 def _format_french_date(dt: Optional[datetime] = None) -> str:
@@ -264,7 +214,8 @@ def _format_french_date(dt: Optional[datetime] = None) -> str:
 def generate_cover_slide(
     title: str,
     image_url: Optional[str] = None,
-    image_bytes: Optional[bytes] = None
+    image_bytes: Optional[bytes] = None,
+    profile: str = PUBLISH_PROFILE
 ) -> bytes:
     """
     Génère la slide de couverture (position 0) pour Breaking.
@@ -298,49 +249,42 @@ def generate_cover_slide(
     # Les 10px de chaque côté seront clippés automatiquement par le canvas
     overlay_slide0_path = os.path.join(ASSETS_DIR, "Overlay_Slide0.png")
     overlay_height = 0  # Initialisé pour calcul du Swipe
-    if os.path.exists(overlay_slide0_path):
-        overlay_slide0 = Image.open(overlay_slide0_path).convert("RGBA")
+    overlay_slide0_size = asset_size(overlay_slide0_path)
+    if overlay_slide0_size:
         # Forcer le redimensionnement à 1100px de large (20px de plus que le canvas)
-        original_width, original_height = overlay_slide0.size
+        original_width, original_height = overlay_slide0_size
         target_width = 1100  # 20px de plus pour gérer les strokes/patterns
         scale = target_width / original_width
         target_height = int(original_height * scale)
         overlay_height = target_height  # Sauvegarder pour le Swipe
-        overlay_slide0 = overlay_slide0.resize((target_width, target_height), Image.LANCZOS)
+        overlay_slide0 = load_overlay(overlay_slide0_path, (target_width, target_height))
         # Centrer : (1080 - 1100) / 2 = -10px (déborde de 10px de chaque côté)
         x_offset = (CANVAS_SIZE[0] - target_width) // 2
         canvas.alpha_composite(overlay_slide0, (x_offset, 0))
     
     # 3. Top bar collée en haut, AU-DESSUS de l'overlay (0 margin)
     top_bar_path = os.path.join(ASSETS_DIR, "top_bar.png")
-    if os.path.exists(top_bar_path):
-        top_bar = Image.open(top_bar_path).convert("RGBA")
+    top_bar_size = asset_size(top_bar_path)
+    if top_bar_size:
         # Redimensionner pour correspondre à la largeur du canvas si nécessaire
-        if top_bar.size[0] != CANVAS_SIZE[0]:
-            scale = CANVAS_SIZE[0] / top_bar.size[0]
-            top_bar = top_bar.resize(
-                (int(top_bar.size[0] * scale), int(top_bar.size[1] * scale)),
-                Image.LANCZOS
-            )
+        scale = CANVAS_SIZE[0] / top_bar_size[0]
+        top_bar = load_overlay(top_bar_path, (int(top_bar_size[0] * scale), int(top_bar_size[1] * scale)))
         canvas.alpha_composite(top_bar, (0, 0))
     
     draw = ImageDraw.Draw(canvas)
     
     # Logo principal (haut) - cover (scale x2 = 400×130) - collé en haut au centre (0px)
-    logo_path = os.path.join(ASSETS_DIR, "Logo.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo_size = (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2)  # 400×130
-        logo = logo.resize(logo_size, Image.LANCZOS)
+    logo_size = (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2)  # 400×130
+    logo = load_overlay(os.path.join(ASSETS_DIR, "Logo.png"), logo_size)
+    if logo is not None:
         logo_x = (CANVAS_SIZE[0] - logo_size[0]) // 2
         canvas.alpha_composite(logo, (logo_x, 0))  # 0px du haut
     
     # Logo Breaking - "Breaking_logo.png" (176px top, centré)
-    cover_logo_path = os.path.join(ASSETS_DIR, "Breaking_logo.png")
+    cover_logo = load_overlay(os.path.join(ASSETS_DIR, "Breaking_logo.png"))
     cover_logo_height = 0
     cover_logo_width = 0
-    if os.path.exists(cover_logo_path):
-        cover_logo = Image.open(cover_logo_path).convert("RGBA")
+    if cover_logo is not None:
         cover_logo_height = cover_logo.size[1]
         cover_logo_width = cover_logo.size[0]
         # Centrer horizontalement
@@ -353,7 +297,7 @@ def generate_cover_slide(
     TITLE_COVER_FONT_SIZE = 50  # Changé de 53 à 50
     TITLE_FONT_WEIGHT = 600  # SemiBold (changé de 700 Bold)
     FONT_TITLE_COVER_PATH = os.path.join(ASSETS_DIR, "Manrope-SemiBold.ttf")  # Changé de Bold à SemiBold
-    title_font, title_lines = _fit_text(
+    title_font, title_lines = fit_text(
         draw,
         title_text,
         title_max_width,
@@ -379,14 +323,14 @@ def generate_cover_slide(
     
     # Swipe (cover) - 84px de large, 60px du bas de l'overlay, 60px margin right
     swipe_path = os.path.join(ASSETS_DIR, "Swipe.png")
-    if os.path.exists(swipe_path):
-        swipe = Image.open(swipe_path).convert("RGBA")
+    swipe_size = asset_size(swipe_path)
+    if swipe_size:
         # Forcer largeur à 84px, hauteur proportionnelle
-        original_width, original_height = swipe.size
+        original_width, original_height = swipe_size
         target_width = 84
         scale = target_width / original_width
         target_height = int(original_height * scale)
-        swipe = swipe.resize((target_width, target_height), Image.LANCZOS)
+        swipe = load_overlay(swipe_path, (target_width, target_height))
         # Position X : 60px de margin right
         swipe_x = CANVAS_SIZE[0] - swipe.size[0] - 60
         # Position Y : 60px du bas de l'overlay (overlay_height - 60 - swipe_height)
@@ -397,9 +341,7 @@ def generate_cover_slide(
             swipe_y = CANVAS_SIZE[1] - 60 - swipe.size[1]
         canvas.alpha_composite(swipe, (swipe_x, swipe_y))
     
-    output = BytesIO()
-    canvas.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return encode_slide(canvas, profile)
 
 
 def upload_slide_bytes(filename: str, image_bytes: bytes) -> Optional[str]:
@@ -16,9 +16,9 @@ from services.carousel.crypto.carousel_image_service import (
     read_carousel_image,
 )
 from services.carousel.crypto.carousel_slide_service import (
+    SLIDES_BUCKET,
     clear_slide_files,
     generate_carousel_slide,
-    generate_cover_slide,
     upload_slide_bytes,
 )
 from services.carousel.crypto.generate_carousel_texts_service import (
@@ -29,6 +29,8 @@ from services.carousel.crypto.generate_carousel_caption_service import (
     generate_caption_from_items,
     upload_caption_text,
 )
+from services.carousel.render_cache import SlideManifest, upload_if_changed
+from services.carousel.render_pool import SlideRenderer
 
 
 class CryptoCarouselJob:
@@ -468,9 +470,13 @@ class CryptoCarouselJob:
             all_items,
             key=lambda i: (0 if i.get("position") == 0 else 1, i.get("position", 999))
         )
+        # Manifest du bucket : slides déjà publiées à l'identique ni re-rendues ni re-uploadées
+        manifest = SlideManifest(SLIDES_BUCKET).load()
+        renderer = SlideRenderer(generate_carousel_slide.__module__, len(items_sorted), manifest=manifest)
         
+        # Rendus lancés d'abord (pool de processus si assez de slides), upload ensuite dans l'ordre
+        pending = []
         for item in items_sorted:
-            item_id = item["id"]
             position = item["position"]
             title_carou = item.get("title_carou") or ""
             content_carou = item.get("content_carou") or ""
@@ -480,24 +486,30 @@ class CryptoCarouselJob:
                 self._log(f"⚠️ Slide {position} : URL image manquante, skip.")
                 continue
             
+            if position == 0:
+                pending.append((position, renderer.submit("generate_cover_slide", image_url=image_url)))
+            else:
+                if not title_carou or not content_carou:
+                    self._log(f"⚠️ Slide {position} : Titre ou contenu manquant, skip.")
+                    continue
+                pending.append((position, renderer.submit(
+                    "generate_carousel_slide",
+                    title=title_carou,
+                    content=content_carou,
+                    image_url=image_url
+                )))
+        
+        for position, render in pending:
             try:
-                if position == 0:
-                    slide_bytes = generate_cover_slide(image_url=image_url)
+                slide_bytes = render()
+                if upload_if_changed(manifest, f"slide_{position}.png", render.key, slide_bytes, upload_slide_bytes):
+                    self._log(f"✅ Slide {position} générée et uploadée.")
                 else:
-                    if not title_carou or not content_carou:
-                        self._log(f"⚠️ Slide {position} : Titre ou contenu manquant, skip.")
-                        continue
-                    slide_bytes = generate_carousel_slide(
-                        title=title_carou,
-                        content=content_carou,
-                        image_url=image_url
-                    )
-                
-                upload_slide_bytes(f"slide_{position}.png", slide_bytes)
-                self._log(f"✅ Slide {position} générée et uploadée.")
+                    self._log(f"♻️ Slide {position} inchangée (cache de rendu).")
             except Exception as e:
                 self._log(f"❌ Erreur génération slide {position}: {str(e)[:100]}")
                 self.errors.append(f"Slide {position} : {str(e)[:100]}")
+        manifest.save()
         
         # Upload outro slide
         outro_path = "front/layout/assets/carousel/crypto/outro_crypto.png"
@@ -629,6 +641,9 @@ def generate_slides_parallel(all_items: List[Dict], progress_callback=None) -> D
     error_count = 0
     results = []
     supabase = get_supabase()
+    # Les threads gardent le téléchargement / l'upload, le rendu Pillow part dans le pool de processus
+    manifest = SlideManifest(SLIDES_BUCKET).load()
+    renderer = SlideRenderer(generate_carousel_slide.__module__, len(all_items), manifest=manifest)
     
     def generate_one_slide(item):
         """Génère une seule slide pour un item."""
@@ -653,18 +668,20 @@ def generate_slides_parallel(all_items: List[Dict], progress_callback=None) -> D
             
             # Générer la slide
             if position == 0:
-                slide_bytes = generate_cover_slide(image_bytes=image_bytes)
+                render = renderer.submit("generate_cover_slide", image_bytes=image_bytes)
             else:
                 if not title_carou or not content_carou:
                     raise Exception("Titre/contenu manquant")
-                slide_bytes = generate_carousel_slide(
+                render = renderer.submit(
+                    "generate_carousel_slide",
                     title=title_carou,
                     content=content_carou,
                     image_bytes=image_bytes
                 )
+            slide_bytes = render()
             
-            # Upload
-            upload_slide_bytes(f"slide_{position}.png", slide_bytes)
+            # Upload (sauté si la slide publiée est identique)
+            upload_if_changed(manifest, f"slide_{position}.png", render.key, slide_bytes, upload_slide_bytes)
             
             if progress_callback:
                 progress_callback(item_id, position, True)
@@ -686,6 +703,7 @@ def generate_slides_parallel(all_items: List[Dict], progress_callback=None) -> D
                 success_count += 1
             else:
                 error_count += 1
+    manifest.save()
     
     return {
         "status": "success" if error_count == 0 else "partial" if success_count > 0 else "error",
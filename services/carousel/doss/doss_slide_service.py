@@ -11,6 +11,10 @@ from PIL import Image, ImageDraw, ImageFont
 import requests
 import os
 
+from services.carousel.render_assets import asset_size, load_font, load_overlay
+from services.carousel.slide_encoder import PUBLISH_PROFILE, encode_slide
+from services.carousel.text_fit import wrap_text
+
 
 ASSETS_DIR = os.path.join(
     os.path.dirname(__file__),
@@ -71,16 +75,6 @@ HOOK_LINE1_LETTER_SPACING = -0.09  # -9%
 HOOK_LINE23_LETTER_SPACING = -0.01  # -1%
 
 
-def _load_font(path: str, size: int, weight: int | None = None) -> ImageFont.ImageFont:
-    if os.path.exists(path):
-        try:
-            axis = {"wght": weight} if weight else None
-            return ImageFont.truetype(path, size=size, layout_engine=ImageFont.Layout.RAQM, axis=axis)
-        except Exception:
-            return ImageFont.truetype(path, size=size)
-    return ImageFont.load_default()
-
-
 def _load_image_from_url(image_url: str) -> Image.Image:
     response = requests.get(image_url, timeout=20)
     response.raise_for_status()
@@ -120,45 +114,6 @@ def _cover_resize_anchor(img: Image.Image, target: Tuple[int, int], anchor: str
     return img.crop((left, top, left + target_w, top + target_h))
 
 
-def _wrap_text(text: str, draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, max_width: int) -> list[str]:
-    words = text.split()
-    lines = []
-    current = []
-    for word in words:
-        candidate = " ".join(current + [word])
-        if draw.textlength(candidate, font=font) <= max_width:
-            current.append(word)
-        else:
-            if current:
-                lines.append(" ".join(current))
-            current = [word]
-    if current:
-        lines.append(" ".join(current))
-    return lines
-
-
-def _fit_text(
-    draw: ImageDraw.ImageDraw,
-    text: str,
-    max_width: int,
-    max_height: int,
-    start_size: int,
-    font_path: str,
-    weight: int | None = None
-) -> tuple[ImageFont.ImageFont, list[str]]:
-    size = start_size
-    while size > 12:
-        font = _load_font(font_path, size, weight=weight)
-        lines = _wrap_text(text, draw, font, max_width)
-        line_height = int(size * 1.2)
-        total_height = line_height * len(lines)
-        if total_height <= max_height:
-            return font, lines
-        size -= 2
-    font = _load_font(font_path, 12, weight=weight)
-    return font, _wrap_text(text, draw, font, max_width)
-
-
 def _strip_highlight_markers(text: str) -> str:
     return text.replace("**", "")
 
@@ -206,7 +161,8 @@ def generate_doss_slide(
     content: str,
     image_url: Optional[str] = None,
     image_bytes: Optional[bytes] = None,
-    position: int | None = None
+    position: int | None = None,
+    profile: str = PUBLISH_PROFILE
 ) -> bytes:
     """
     Génère une slide Doss (1-4) avec le style Eco :
@@ -237,31 +193,28 @@ def generate_doss_slide(
     
     # 2. Overlay au-dessus de l'image (1100x600, clippé sur les côtés comme Eco)
     overlay_path = os.path.join(ASSETS_DIR, "Overlay_Slide0.png")
-    if os.path.exists(overlay_path):
-        overlay = Image.open(overlay_path).convert("RGBA")
-        # Redimensionner à 1100x600 (comme Eco)
-        overlay = overlay.resize((1100, 600), Image.LANCZOS)
+    # Redimensionner à 1100x600 (comme Eco)
+    overlay = load_overlay(overlay_path, (1100, 600))
+    if overlay is not None:
         # Position : X=-10 pour clipper 10px de chaque côté, Y=0 (collé en haut comme Eco)
         overlay_x = -10
         overlay_y = 0
         canvas.alpha_composite(overlay, (overlay_x, overlay_y))
     
     # 3. Logo en haut (200x65, centré, -15px du top pour clip)
-    logo_path = os.path.join(ASSETS_DIR, "Logo.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo = logo.resize(LOGO_SIZE, Image.LANCZOS)
+    logo = load_overlay(os.path.join(ASSETS_DIR, "Logo.png"), LOGO_SIZE)
+    if logo is not None:
         logo_x = (CANVAS_SIZE[0] - LOGO_SIZE[0]) // 2
         canvas.alpha_composite(logo, (logo_x, LOGO_TOP))
     
     # 4. Swipe (1.2x, 50px du bas de l'overlay, 50px right)
     swipe_path = os.path.join(ASSETS_DIR, "swipe_doss.png")
-    if os.path.exists(swipe_path):
-        swipe = Image.open(swipe_path).convert("RGBA")
+    swipe_size = asset_size(swipe_path)
+    if swipe_size:
         # Scale x1.2
-        new_width = int(swipe.size[0] * 1.2)
-        new_height = int(swipe.size[1] * 1.2)
-        swipe = swipe.resize((new_width, new_height), Image.LANCZOS)
+        new_width = int(swipe_size[0] * 1.2)
+        new_height = int(swipe_size[1] * 1.2)
+        swipe = load_overlay(swipe_path, (new_width, new_height))
         # Position : 50px du bas de l'overlay (overlay_y + 600 - 50 - swipe height)
         swipe_x = CANVAS_SIZE[0] - new_width - 50
         swipe_y = overlay_y + 600 - 50 - new_height
@@ -286,24 +239,24 @@ def generate_doss_slide(
         # D'abord, charger title_bg_slide_1.png avec 50px de margin (réduit ÷ 1,1)
         title_bg_slide1_path = os.path.join(ASSETS_DIR, "title_bg_slide_1.png")
         title_bg_side_margin = 50  # Comme Eco
-        if os.path.exists(title_bg_slide1_path):
-            title_bg_slide1 = Image.open(title_bg_slide1_path).convert("RGBA")
+        title_bg_slide1_size = asset_size(title_bg_slide1_path)
+        if title_bg_slide1_size:
             # Réduire la hauteur ÷ 1,1
-            new_height = int(title_bg_slide1.size[1] / 1.1)
+            new_height = int(title_bg_slide1_size[1] / 1.1)
             # Redimensionner pour tenir compte des marges : largeur canvas - 2*50px
             title_bg_width = CANVAS_SIZE[0] - (title_bg_side_margin * 2)
-            title_bg_slide1 = title_bg_slide1.resize((title_bg_width, new_height), Image.LANCZOS)
+            title_bg_slide1 = load_overlay(title_bg_slide1_path, (title_bg_width, new_height))
             title_zone_height = title_bg_slide1.size[1]
             # Positionner avec 50px de margin left
             canvas.alpha_composite(title_bg_slide1, (title_bg_side_margin, title_top))
         
         # Ensuite, afficher le titre en BLANC par-dessus (MAJUSCULES, taille 44 - réduit de 48)
-        title_font = _load_font(os.path.join(ASSETS_DIR, "Inter_18pt-Bold.ttf"), 44, weight=700)
+        title_font = load_font(os.path.join(ASSETS_DIR, "Inter_18pt-Bold.ttf"), 44, weight=700)
         title_letter_spacing = int(44 * -0.01)
         
         # Wrap le titre (en MAJUSCULES)
         title_max_width = CANVAS_SIZE[0] - (LEFT_MARGIN * 2)
-        title_lines = _wrap_text(title.upper(), draw, title_font, title_max_width)
+        title_lines = wrap_text(title.upper(), draw, title_font, title_max_width)
         title_line_height = int(44 * 1.2)
         
         # Position titre : centré verticalement dans title_bg_slide1
@@ -323,17 +276,17 @@ def generate_doss_slide(
         }
         title_asset_path = os.path.join(ASSETS_DIR, title_asset_map[position])
         title_bg_side_margin = 50  # Comme Eco
-        if os.path.exists(title_asset_path):
-            title_asset = Image.open(title_asset_path).convert("RGBA")
+        title_asset_size = asset_size(title_asset_path)
+        if title_asset_size:
             # Réduire la hauteur ÷ 1,1
-            new_height = int(title_asset.size[1] / 1.1)
-            title_asset = title_asset.resize((title_asset.size[0], new_height), Image.LANCZOS)
+            new_height = int(title_asset_size[1] / 1.1)
+            title_asset = load_overlay(title_asset_path, (title_asset_size[0], new_height))
             title_zone_height = title_asset.size[1]
             # 50px de margin left (aligné à gauche comme Eco)
             canvas.alpha_composite(title_asset, (title_bg_side_margin, title_top))
     
     # 7. CONTENU (Inter Medium 39px, NOIR, letter spacing +1%)
-    content_font = _load_font(os.path.join(ASSETS_DIR, "Inter_18pt-Medium.ttf"), 39, weight=500)
+    content_font = load_font(os.path.join(ASSETS_DIR, "Inter_18pt-Medium.ttf"), 39, weight=500)
     content_letter_spacing = int(39 * 0.01)
     
     # Position contenu : DYNAMIQUE comme Eco (title_top + title_zone_height + CONTENT_TOP_GAP)
@@ -341,7 +294,7 @@ def generate_doss_slide(
     content_max_width = CANVAS_SIZE[0] - (LEFT_MARGIN * 2)
     
     # Wrap le contenu
-    content_lines = _wrap_text(content.replace("**", ""), draw, content_font, content_max_width)
+    content_lines = wrap_text(content.replace("**", ""), draw, content_font, content_max_width)
     content_line_height = int(39 * 1.25)  # 1.25 comme Eco
     
     for line in content_lines[:6]:  # Max 6 lignes
@@ -350,15 +303,14 @@ def generate_doss_slide(
         draw.text((LEFT_MARGIN, content_y), line, font=content_font, fill="black", spacing=content_letter_spacing)
         content_y += content_line_height
     
-    output = BytesIO()
-    canvas.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return encode_slide(canvas, profile)
 
 
 def generate_cover_slide(
     hook: str,
     image_url: Optional[str] = None,
-    image_bytes: Optional[bytes] = None
+    image_bytes: Optional[bytes] = None,
+    profile: str = PUBLISH_PROFILE
 ) -> bytes:
     """
     Génère la slide de couverture (slide 0) pour Doss.
@@ -391,13 +343,13 @@ def generate_cover_slide(
     overlay_slide0_path = os.path.join(ASSETS_DIR, "Overlay_Slide0.png")
     overlay_height = 0  # Pour positionner le Swipe plus tard
     overlay_x_offset = 0
-    if os.path.exists(overlay_slide0_path):
-        overlay_slide0 = Image.open(overlay_slide0_path).convert("RGBA")
-        original_width, original_height = overlay_slide0.size
+    overlay_slide0_size = asset_size(overlay_slide0_path)
+    if overlay_slide0_size:
+        original_width, original_height = overlay_slide0_size
         target_width = 1100
         scale = target_width / original_width
         target_height = int(original_height * scale)
-        overlay_slide0 = overlay_slide0.resize((target_width, target_height), Image.LANCZOS)
+        overlay_slide0 = load_overlay(overlay_slide0_path, (target_width, target_height))
         x_offset = (CANVAS_SIZE[0] - target_width) // 2
         overlay_x_offset = x_offset
         overlay_height = target_height
@@ -405,36 +357,30 @@ def generate_cover_slide(
     
     # 3. Top bar collée en haut
     top_bar_path = os.path.join(ASSETS_DIR, "top_bar.png")
-    if os.path.exists(top_bar_path):
-        top_bar = Image.open(top_bar_path).convert("RGBA")
-        if top_bar.size[0] != CANVAS_SIZE[0]:
-            scale = CANVAS_SIZE[0] / top_bar.size[0]
-            top_bar = top_bar.resize(
-                (int(top_bar.size[0] * scale), int(top_bar.size[1] * scale)),
-                Image.LANCZOS
-            )
+    top_bar_size = asset_size(top_bar_path)
+    if top_bar_size:
+        scale = CANVAS_SIZE[0] / top_bar_size[0]
+        top_bar = load_overlay(top_bar_path, (int(top_bar_size[0] * scale), int(top_bar_size[1] * scale)))
         canvas.alpha_composite(top_bar, (0, 0))
     
     draw = ImageDraw.Draw(canvas)
     
     # Logo principal (haut) - cover (scale x2 = 400×130) - collé en haut au centre
-    logo_path = os.path.join(ASSETS_DIR, "Logo.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo_size = (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2)  # 400×130
-        logo = logo.resize(logo_size, Image.LANCZOS)
+    logo_size = (LOGO_SIZE[0] * 2, LOGO_SIZE[1] * 2)  # 400×130
+    logo = load_overlay(os.path.join(ASSETS_DIR, "Logo.png"), logo_size)
+    if logo is not None:
         logo_x = (CANVAS_SIZE[0] - logo_size[0]) // 2
         canvas.alpha_composite(logo, (logo_x, 0))
     
     # Logo slide 0 - "Le Doss'" (213px top, 45px left, réduit ÷ 1,1)
     cover_logo_path = os.path.join(ASSETS_DIR, "Logo_slide_0.png")
     cover_logo_height = 0
-    if os.path.exists(cover_logo_path):
-        cover_logo = Image.open(cover_logo_path).convert("RGBA")
+    cover_logo_size = asset_size(cover_logo_path)
+    if cover_logo_size:
         # Réduire la taille ÷ 1,1
-        new_width = int(cover_logo.size[0] / 1.1)
-        new_height = int(cover_logo.size[1] / 1.1)
-        cover_logo = cover_logo.resize((new_width, new_height), Image.LANCZOS)
+        new_width = int(cover_logo_size[0] / 1.1)
+        new_height = int(cover_logo_size[1] / 1.1)
+        cover_logo = load_overlay(cover_logo_path, (new_width, new_height))
         cover_logo_height = cover_logo.size[1]
         canvas.alpha_composite(cover_logo, (45, 213))
     
@@ -461,19 +407,19 @@ def generate_cover_slide(
     
     # LIGNE 1 : Sujet principal (Inter Bold 100px, -9%)
     if hook_line1_text:
-        hook_line1_font = _load_font(FONT_HOOK_LINE1_PATH, HOOK_LINE1_FONT_SIZE, weight=700)
+        hook_line1_font = load_font(FONT_HOOK_LINE1_PATH, HOOK_LINE1_FONT_SIZE, weight=700)
         line1_letter_spacing = int(HOOK_LINE1_FONT_SIZE * HOOK_LINE1_LETTER_SPACING)
         draw.text((hook_x, hook_y), hook_line1_text, font=hook_line1_font, fill="#000000", spacing=line1_letter_spacing)
         hook_y += int(HOOK_LINE1_FONT_SIZE * 1.2)
     
     # LIGNES 2-4 : Reste du hook (Manrope SemiBold 52px, -1%)
     if hook_line23_text:
-        hook_line23_font = _load_font(FONT_HOOK_PATH, HOOK_LINE23_FONT_SIZE, weight=HOOK_FONT_WEIGHT)
+        hook_line23_font = load_font(FONT_HOOK_PATH, HOOK_LINE23_FONT_SIZE, weight=HOOK_FONT_WEIGHT)
         line23_letter_spacing = int(HOOK_LINE23_FONT_SIZE * HOOK_LINE23_LETTER_SPACING)
         
         # Wrap sur 3 lignes max
         hook_max_width = CANVAS_SIZE[0] - 100  # Marges 50px de chaque côté
-        hook_lines_23 = _wrap_text(hook_line23_text, draw, hook_line23_font, hook_max_width)
+        hook_lines_23 = wrap_text(hook_line23_text, draw, hook_line23_font, hook_max_width)
         hook_line23_height = int(HOOK_LINE23_FONT_SIZE * 1.2)
         
         for line in hook_lines_23[:3]:  # Max 3 lignes
@@ -483,13 +429,13 @@ def generate_cover_slide(
     # Swipe (cover) - 84px de large, en bas à droite de l'Overlay_Slide0
     # Position : 50px du bas de l'overlay, 50px de margin right (par rapport à l'overlay)
     swipe_path = os.path.join(ASSETS_DIR, "Swipe.png")
-    if os.path.exists(swipe_path) and overlay_height > 0:
-        swipe = Image.open(swipe_path).convert("RGBA")
-        original_width, original_height = swipe.size
+    swipe_size = asset_size(swipe_path)
+    if swipe_size and overlay_height > 0:
+        original_width, original_height = swipe_size
         target_width = 84
         scale = target_width / original_width
         target_height = int(original_height * scale)
-        swipe = swipe.resize((target_width, target_height), Image.LANCZOS)
+        swipe = load_overlay(swipe_path, (target_width, target_height))
         
         # Position par rapport à l'overlay (1100px de large, centré avec offset)
         # Overlay right edge = overlay_x_offset + 1100
@@ -500,7 +446,5 @@ def generate_cover_slide(
         
         canvas.alpha_composite(swipe, (swipe_x, swipe_y))
     
-    output = BytesIO()
-    canvas.convert("RGB").save(output, format="PNG")
-    return output.getvalue()
+    return encode_slide(canvas, profile)
 
@@ -446,58 +446,65 @@ class EcoCarouselJob:
     def _generate_final_slides(self) -> None:
         """Génère les slides composites finales (image + texte + overlay)."""
         import os
-        from services.carousel.eco.carousel_slide_service import (
-            generate_carousel_slide,
-            generate_cover_slide,
-            upload_slide_bytes,
-        )
+        from services.carousel.eco.carousel_slide_service import SLIDES_BUCKET, upload_slide_bytes
         from services.carousel.eco.carousel_image_service import read_carousel_image
+        from services.carousel.render_cache import SlideManifest, upload_if_changed
+        from services.carousel.render_pool import SlideRenderer
         
         supabase = get_supabase()
         
         # Récupérer tous les items
         carousel_data = supabase.table("carousel_eco").select("*").order("position").execute()
         items = carousel_data.data if carousel_data.data else []
+        # Manifest du bucket : slides déjà publiées à l'identique ni re-rendues ni re-uploadées
+        manifest = SlideManifest(SLIDES_BUCKET).load()
+        renderer = SlideRenderer("services.carousel.eco.carousel_slide_service", len(items), manifest=manifest)
         
+        # Rendus lancés d'abord (pool de processus si assez de slides), upload ensuite dans l'ordre
+        pending = []
         for item in items:
             position = item["position"]
-            item_id = item["id"]
+            image_url = item.get("image_url")
+            image_bytes = None if image_url else read_carousel_image(position)
             
-            try:
-                if position == 0:
-                    # Cover
-                    image_url = item.get("image_url")
-                    image_bytes = None if image_url else read_carousel_image(position)
-                    
-                    if image_url or image_bytes:
-                        slide_bytes = generate_cover_slide(
-                            image_url=image_url,
-                            image_bytes=image_bytes
-                        )
-                        upload_slide_bytes(f"slide_{position}.png", slide_bytes)
-                        self._log(f"  ✅ Slide cover générée")
+            if position == 0:
+                # Cover
+                if image_url or image_bytes:
+                    render = renderer.submit(
+                        "generate_cover_slide",
+                        image_url=image_url,
+                        image_bytes=image_bytes
+                    )
+                    pending.append((position, render, "  ✅ Slide cover générée"))
+            
+            else:
+                # Items normaux
+                title_carou = item.get("title_carou")
+                content_carou = item.get("content_carou")
                 
+                if title_carou and content_carou and (image_url or image_bytes):
+                    render = renderer.submit(
+                        "generate_carousel_slide",
+                        title=title_carou,
+                        content=content_carou,
+                        image_url=image_url,
+                        image_bytes=image_bytes
+                    )
+                    pending.append((position, render, f"  ✅ Slide #{position} générée"))
+        
+        for position, render, done_msg in pending:
+            try:
+                slide_bytes = render()
+                if upload_if_changed(manifest, f"slide_{position}.png", render.key, slide_bytes, upload_slide_bytes):
+                    self._log(done_msg)
                 else:
-                    # Items normaux
-                    title_carou = item.get("title_carou")
-                    content_carou = item.get("content_carou")
-                    image_url = item.get("image_url")
-                    image_bytes = None if image_url else read_carousel_image(position)
-                    
-                    if title_carou and content_carou and (image_url or image_bytes):
-                        slide_bytes = generate_carousel_slide(
-                            title=title_carou,
-                            content=content_carou,
-                            image_url=image_url,
-                            image_bytes=image_bytes
-                        )
-                        upload_slide_bytes(f"slide_{position}.png", slide_bytes)
-                        self._log(f"  ✅ Slide #{position} générée")
+                    self._log(f"  ♻️ Slide #{position} inchangée (cache de rendu)")
             
             except Exception as e:
                 error_msg = f"Erreur slide {position}: {str(e)[:100]}"
                 self.errors.append(error_msg)
                 self._log(f"  ⚠️ {error_msg}")
+        manifest.save()
         
         # Upload outro
         outro_path = os.path.join(
@@ -709,12 +716,14 @@ def generate_slides_parallel(items: List[Dict], progress_callback=None) -> Dict[
     """
     import os
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    from services.carousel.eco.carousel_slide_service import (
-        generate_carousel_slide,
-        generate_cover_slide,
-        upload_slide_bytes,
-    )
+    from services.carousel.eco.carousel_slide_service import SLIDES_BUCKET, upload_slide_bytes
     from services.carousel.eco.carousel_image_service import read_carousel_image
+    from services.carousel.render_cache import SlideManifest, upload_if_changed
+    from services.carousel.render_pool import SlideRenderer
+    
+    # Les threads gardent le téléchargement / l'upload, le rendu Pillow part dans le pool de processus
+    manifest = SlideManifest(SLIDES_BUCKET).load()
+    renderer = SlideRenderer("services.carousel.eco.carousel_slide_service", len(items), manifest=manifest)
     
     def process_single_slide(item):
         """Génère une slide pour un item."""
@@ -746,18 +755,20 @@ def generate_slides_parallel(items: List[Dict], progress_callback=None) -> Dict[
             
             # Générer la slide
             if position == 0:
-                slide_bytes = generate_cover_slide(image_bytes=image_bytes)
+                render = renderer.submit("generate_cover_slide", image_bytes=image_bytes)
                 slide_filename = "slide_0.png"
             else:
-                slide_bytes = generate_carousel_slide(
+                render = renderer.submit(
+                    "generate_carousel_slide",
                     image_bytes=image_bytes,
                     title=title,
                     content=content
                 )
                 slide_filename = f"slide_{position}.png"
+            slide_bytes = render()
             
-            # Upload
-            upload_slide_bytes(slide_filename, slide_bytes)
+            # Upload (sauté si la slide publiée est identique)
+            upload_if_changed(manifest, slide_filename, render.key, slide_bytes, upload_slide_bytes)
             
             if progress_callback:
                 progress_callback(item_id, position, True)
@@ -793,6 +804,7 @@ def generate_slides_parallel(items: List[Dict], progress_callback=None) -> Dict[
                     "status": "error",
                     "message": f"Thread error: {str(e)}"
                 })
+    manifest.save()
     
     # Agréger
     total = len(items)
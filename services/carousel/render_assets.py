@@ -0,0 +1,76 @@
+"""
+===========================================
+🎨 RENDER ASSETS
+===========================================
+Registre process-wide des polices et overlays des slides (Pillow)
+- Polices mémoïsées par (path, size, weight) → plus de truetype() à chaque taille testée
+- Assets PNG (logos, title_bg, swipe, overlays…) ouverts une seule fois par path
+- Versions redimensionnées mémoïsées par (path, taille cible), resize en alpha prémultiplié
+- Les images retournées sont partagées : lecture seule (alpha_composite ne les modifie pas)
+"""
+
+import os
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from PIL import Image, ImageFont
+
+
+FONT_CACHE_SIZE = 256
+ASSET_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: str, size: int, weight: Optional[int] = None) -> ImageFont.ImageFont:
+    """
+    Police TrueType (RAQM + axe wght si dispo), fallback PIL par défaut si fichier absent.
+    """
+    if os.path.exists(path):
+        try:
+            # Variable font support if available
+            axis = {"wght": weight} if weight else None
+            return ImageFont.truetype(path, size=size, layout_engine=ImageFont.Layout.RAQM, axis=axis)
+        except Exception:
+            return ImageFont.truetype(path, size=size)
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _open_asset(path: str) -> Optional[Image.Image]:
+    if not os.path.exists(path):
+        return None
+    with Image.open(path) as img:
+        return img.convert("RGBA")
+
+
+def asset_size(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Taille d'origine de l'asset (None si absent).
+    """
+    img = _open_asset(path)
+    return img.size if img is not None else None
+
+
+@lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _resized_asset(path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+    img = _open_asset(path)
+    if img is None:
+        return None
+    # Même chemin que Image.resize sur du RGBA (RGBa → LANCZOS → RGBA), fait une seule fois
+    return img.convert("RGBa").resize(size, Image.LANCZOS).convert("RGBA")
+
+
+def load_overlay(path: str, size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+    """
+    Asset RGBA prêt pour alpha_composite, redimensionné à `size` si fourni.
+    None si le fichier est absent. Ne pas modifier l'image retournée (partagée).
+    """
+    if size is None or tuple(size) == asset_size(path):
+        return _open_asset(path)
+    return _resized_asset(path, (int(size[0]), int(size[1])))
+
+
+def clear_render_assets() -> None:
+    load_font.cache_clear()
+    _open_asset.cache_clear()
+    _resized_asset.cache_clear()
@@ -0,0 +1,510 @@
+"""
+===========================================
+🗃️ RENDER CACHE
+===========================================
+Cache des slides rendues, adressé par contenu
+- Clé = hash(template, champs texte, hash de l'image, profil d'encodage)
+- Template = source du service + modules de rendu + assets (polices, overlays)
+- Local : SQLite sous CACHE_DIR (LRU borné en taille)
+- Storage : manifest JSON par bucket de slides (slide_N.png → clé + sha256)
+  → slide inchangée = ni rendu ni upload, slide publiée réutilisable sur un autre poste
+- Publication PNG en arrière-plan pour les vues Streamlit
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, NamedTuple, Optional
+
+import requests
+
+from db.supabase_client import get_supabase
+from services.carousel.slide_encoder import CANVAS_PROFILE, PUBLISH_PROFILE, SLIDE_PROFILES, encode_slide
+from services.utils.llm_cache import CACHE_DIR
+
+
+RENDER_CACHE_PATH = os.path.join(CACHE_DIR, "slide_render_cache.sqlite3")
+RENDER_CACHE_MAX_BYTES = 500 * 1024 * 1024
+RENDER_CACHE_VERSION = 1
+RENDER_MANIFEST_FILENAME = "render_manifest.json"
+MANIFEST_TTL_SEC = 60
+IMAGE_TIMEOUT_SEC = 20
+PUBLISH_WORKERS = 4
+
+# Modules partagés par tous les templates (une modif invalide tout le cache)
+SHARED_RENDER_MODULES = (
+    "services.carousel.render_assets",
+    "services.carousel.text_fit",
+)
+# Covers Bourse / Crypto / Eco / PEA : date du jour dans la slide
+DATED_RENDERS = {"generate_cover_slide"}
+
+
+class RenderedSlide(NamedTuple):
+    key: str
+    data: bytes
+    cached: bool
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_fingerprints: Dict[str, str] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def template_fingerprint(module_name: str) -> str:
+    """
+    Empreinte du template : source du service, modules de rendu partagés,
+    contenu des assets (ASSETS_DIR du service). Calculée une fois par process.
+    """
+    with _fingerprints_lock:
+        if module_name in _fingerprints:
+            return _fingerprints[module_name]
+    digest = hashlib.sha256()
+    for name in (module_name, *SHARED_RENDER_MODULES):
+        source = importlib.import_module(name).__file__
+        digest.update(f"{name}:{_sha256_file(source)}\n".encode("utf-8"))
+    assets_dir = getattr(importlib.import_module(module_name), "ASSETS_DIR", None)
+    if assets_dir and os.path.isdir(assets_dir):
+        for root, dirs, files in os.walk(assets_dir):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                rel = os.path.relpath(path, assets_dir)
+                digest.update(f"{rel}:{_sha256_file(path)}\n".encode("utf-8"))
+    fingerprint = digest.hexdigest()
+    with _fingerprints_lock:
+        _fingerprints[module_name] = fingerprint
+    return fingerprint
+
+
+def fetch_image_bytes(kwargs: dict) -> dict:
+    """
+    Remplace image_url par les bytes téléchargés (la clé dépend du contenu de l'image).
+    """
+    if not kwargs.get("image_url") or kwargs.get("image_bytes"):
+        return kwargs
+    response = requests.get(kwargs["image_url"], timeout=IMAGE_TIMEOUT_SEC)
+    response.raise_for_status()
+    return {**kwargs, "image_url": None, "image_bytes": response.content}
+
+
+def slide_render_key(module_name: str, func_name: str, kwargs: dict, profile: str = PUBLISH_PROFILE) -> str:
+    """
+    Clé de rendu. kwargs = arguments du generate_* avec image_bytes résolus
+    (voir fetch_image_bytes).
+    """
+    fields = {name: value for name, value in kwargs.items() if name not in ("image_url", "image_bytes", "profile")}
+    image_bytes = kwargs.get("image_bytes") or b""
+    settings = {"profile": profile, "encoder": SLIDE_PROFILES[profile]}
+    if func_name in DATED_RENDERS:
+        settings["date"] = date.today().isoformat()
+    payload = json.dumps(
+        {
+            "version": RENDER_CACHE_VERSION,
+            "template": f"{module_name}.{func_name}",
+            "fingerprint": template_fingerprint(module_name),
+            "fields": fields,
+            "image": hashlib.sha256(image_bytes).hexdigest(),
+            "settings": settings,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SlideRenderCache:
+    """
+    Cache SQLite des slides encodées (clé → bytes), éviction LRU bornée en taille.
+    Thread-safe (une connexion + un lock).
+    """
+
+    def __init__(self, path: str = RENDER_CACHE_PATH, max_bytes: int = RENDER_CACHE_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS slides ("
+            " key TEXT PRIMARY KEY,"
+            " template TEXT,"
+            " data BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_slides_accessed ON slides(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM slides WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE slides SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return bytes(row[0])
+
+    def set(self, key: str, data: bytes, template: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO slides (key, template, data, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, template, sqlite3.Binary(data), len(data), now, now),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM slides").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # LRU : on supprime les moins récemment lues jusqu'à repasser sous ~90% du max
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM slides ORDER BY accessed_at ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= target:
+                break
+            to_delete.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM slides WHERE key = ?", to_delete)
+        self.evictions += len(to_delete)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM slides"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM slides")
+            self._conn.commit()
+
+
+_cache: Optional[SlideRenderCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_slide_render_cache() -> Optional[SlideRenderCache]:
+    """
+    Cache partagé par process (None si le disque n'est pas utilisable).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = SlideRenderCache()
+            except Exception as exc:
+                print(f"⚠️ Cache de rendu slides indisponible: {exc}")
+                return None
+        return _cache
+
+
+class SlideManifest:
+    """
+    Manifest des slides publiées d'un bucket : filename → {key, sha256}.
+    Stocké dans le bucket (render_manifest.json), supprimé avec les slides.
+    Plusieurs instances (vues, jobs) peuvent écrire le même bucket :
+    save() fusionne les entrées modifiées localement avec le manifest distant.
+    """
+
+    def __init__(self, bucket: str) -> None:
+        self.bucket = bucket
+        self.loaded_at = 0.0
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._changed: set = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def _read_remote(self) -> Dict[str, Dict[str, str]]:
+        storage = get_supabase().storage.from_(self.bucket)
+        present = {item.get("name") for item in storage.list() if item.get("name")}
+        if RENDER_MANIFEST_FILENAME not in present:
+            return {}
+        raw = json.loads(storage.download(RENDER_MANIFEST_FILENAME))
+        # Entrées dont la slide a été supprimée entre-temps ignorées
+        return {name: entry for name, entry in raw.items() if name in present}
+
+    def load(self) -> "SlideManifest":
+        entries: Dict[str, Dict[str, str]] = {}
+        try:
+            entries = self._read_remote()
+        except Exception as exc:
+            print(f"⚠️ Manifest slides illisible ({self.bucket}): {exc}")
+        with self._lock:
+            # Entrées pas encore sauvegardées conservées
+            entries.update({name: self._entries[name] for name in self._changed})
+            self._entries = entries
+            self.loaded_at = time.time()
+        return self
+
+    def matches(self, filename: str, key: str, data: Optional[bytes] = None) -> bool:
+        """
+        True si la slide publiée à cet emplacement a cette clé
+        (et, si data est fourni, exactement ce contenu).
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+        if entry is None or entry.get("key") != key:
+            return False
+        return data is None or entry.get("sha256") == hashlib.sha256(data).hexdigest()
+
+    def fetch(self, key: str) -> Optional[bytes]:
+        """
+        Slide publiée avec cette clé (quel que soit son emplacement), vérifiée par sha256.
+        """
+        with self._lock:
+            candidates = [(name, entry) for name, entry in self._entries.items() if entry.get("key") == key]
+        for filename, entry in candidates:
+            try:
+                data = get_supabase().storage.from_(self.bucket).download(filename)
+            except Exception:
+                continue
+            # La slide a pu être remplacée depuis le chargement du manifest
+            if data and hashlib.sha256(data).hexdigest() == entry.get("sha256"):
+                return data
+        return None
+
+    def record(self, filename: str, key: str, data: bytes) -> None:
+        with self._lock:
+            self._entries[filename] = {"key": key, "sha256": hashlib.sha256(data).hexdigest()}
+            self._changed.add(filename)
+
+    def save(self) -> bool:
+        """
+        Relit le manifest distant et y fusionne les entrées modifiées localement
+        (un autre job / une vue a pu publier d'autres slides depuis le load).
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._changed:
+                    return True
+                changes = {name: dict(self._entries[name]) for name in self._changed}
+            try:
+                merged = self._read_remote()
+                merged.update(changes)
+                get_supabase().storage.from_(self.bucket).upload(
+                    RENDER_MANIFEST_FILENAME,
+                    json.dumps(merged, sort_keys=True).encode("utf-8"),
+                    file_options={"content-type": "application/json", "upsert": True},
+                )
+            except Exception as exc:
+                print(f"⚠️ Manifest slides non sauvegardé ({self.bucket}): {exc}")
+                return False
+            with self._lock:
+                # Entrées re-modifiées pendant la sauvegarde : restent à sauvegarder
+                self._changed = {name for name in self._changed if self._entries.get(name) != changes.get(name)}
+                merged.update({name: self._entries[name] for name in self._changed})
+                self._entries = merged
+                self.loaded_at = time.time()
+            return True
+
+
+_manifests: Dict[str, SlideManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_slide_manifest(bucket: str, max_age_sec: float = MANIFEST_TTL_SEC) -> SlideManifest:
+    """
+    Manifest partagé par process, rechargé depuis le storage après max_age_sec.
+    """
+    with _manifests_lock:
+        manifest = _manifests.get(bucket)
+        if manifest is None:
+            manifest = _manifests[bucket] = SlideManifest(bucket)
+    if time.time() - manifest.loaded_at > max_age_sec:
+        manifest.load()
+    return manifest
+
+
+def forget_slide_manifest(bucket: str) -> None:
+    """
+    Invalide le manifest en mémoire (bucket vidé par clear_slide_files).
+    """
+    with _manifests_lock:
+        _manifests.pop(bucket, None)
+
+
+def lookup_slide(key: str, manifest: Optional[SlideManifest] = None) -> Optional[bytes]:
+    """
+    Slide déjà rendue : cache local, sinon slide publiée dans le storage.
+    """
+    cache = get_slide_render_cache()
+    data = cache.get(key) if cache is not None else None
+    if data is None and manifest is not None:
+        data = manifest.fetch(key)
+        if data is not None and cache is not None:
+            cache.set(key, data)
+    return data
+
+
+def store_slide(key: str, data: bytes, template: str = "") -> None:
+    cache = get_slide_render_cache()
+    if cache is not None:
+        cache.set(key, data, template)
+
+
+def render_slide_cached(
+    render: Callable[..., bytes],
+    profile: str = PUBLISH_PROFILE,
+    manifest: Optional[SlideManifest] = None,
+    **kwargs,
+) -> RenderedSlide:
+    """
+    Rend via render(**kwargs, profile=profile) (generate_* d'un service),
+    sauf si une slide identique est déjà en cache (local ou storage).
+    """
+    kwargs = fetch_image_bytes(kwargs)
+    key = slide_render_key(render.__module__, render.__name__, kwargs, profile)
+    data = lookup_slide(key, manifest if profile == PUBLISH_PROFILE else None)
+    if data is not None:
+        return RenderedSlide(key, data, True)
+    data = render(**kwargs, profile=profile)
+    store_slide(key, data, f"{render.__module__}.{render.__name__}")
+    return RenderedSlide(key, data, False)
+
+
+def render_slide_once(
+    render: Callable[..., bytes],
+    manifest: Optional[SlideManifest] = None,
+    **kwargs,
+) -> Callable[..., RenderedSlide]:
+    """
+    Comme render_slide_cached, pour plusieurs profils d'une même slide :
+    le canvas est rendu une seule fois (au premier profil absent du cache)
+    puis encodé dans chaque profil demandé.
+    """
+    kwargs = fetch_image_bytes(kwargs)
+    template = f"{render.__module__}.{render.__name__}"
+    canvas_lock = threading.Lock()
+    canvas = []
+
+    def _render(profile: str = PUBLISH_PROFILE) -> RenderedSlide:
+        key = slide_render_key(render.__module__, render.__name__, kwargs, profile)
+        data = lookup_slide(key, manifest if profile == PUBLISH_PROFILE else None)
+        if data is not None:
+            return RenderedSlide(key, data, True)
+        with canvas_lock:
+            if not canvas:
+                canvas.append(render(**kwargs, profile=CANVAS_PROFILE))
+        data = encode_slide(canvas[0], profile)
+        store_slide(key, data, template)
+        return RenderedSlide(key, data, False)
+
+    return _render
+
+
+def upload_if_changed(
+    manifest: Optional[SlideManifest],
+    filename: str,
+    key: str,
+    data: bytes,
+    upload: Callable[[str, bytes], object],
+) -> bool:
+    """
+    Upload la slide sauf si le storage contient déjà ce rendu à cet emplacement.
+    Retourne True si un upload a été fait, False si la slide est inchangée.
+    upload retourne None en cas d'échec (upload_slide_bytes des services) :
+    rien n'est alors enregistré dans le manifest et RuntimeError est levée.
+    """
+    if manifest is not None and key and manifest.matches(filename, key, data):
+        return False
+    if upload(filename, data) is None:
+        raise RuntimeError(f"Upload de {filename} échoué")
+    if manifest is not None and key:
+        manifest.record(filename, key, data)
+    return True
+
+
+def publish_rendered_slide(
+    manifest: Optional[SlideManifest],
+    filename: str,
+    upload: Callable[[str, bytes], object],
+    slide: RenderedSlide,
+) -> bool:
+    """
+    upload_if_changed + sauvegarde du manifest (publication d'une slide isolée).
+    """
+    uploaded = upload_if_changed(manifest, filename, slide.key, slide.data, upload)
+    if uploaded and manifest is not None:
+        manifest.save()
+    return uploaded
+
+
+_publish_executor: Optional[ThreadPoolExecutor] = None
+_publish_lock = threading.Lock()
+
+
+def publish_slide_async(
+    render: Callable[[], RenderedSlide],
+    upload: Callable[[RenderedSlide], object],
+) -> "Future[RenderedSlide]":
+    """
+    Rend la version publish et l'uploade dans un thread dédié.
+    Le Future retourne la slide publiée (réutilisable pour les exports).
+    """
+    global _publish_executor
+    with _publish_lock:
+        if _publish_executor is None:
+            _publish_executor = ThreadPoolExecutor(
+                max_workers=PUBLISH_WORKERS,
+                thread_name_prefix="slide-publish",
+            )
+        executor = _publish_executor
+
+    def _publish() -> RenderedSlide:
+        slide = render()
+        upload(slide)
+        return slide
+
+    return executor.submit(_publish)
+
+
+def published_slide_bytes(preview: Optional[dict]) -> Optional[bytes]:
+    """
+    Bytes publiés d'une entrée slide_previews (attend la publication en cours).
+    None si absente ou en échec → la slide doit être re-rendue en "publish".
+    """
+    if not preview:
+        return None
+    publish = preview.get("publish")
+    if publish is None:
+        # Entrée rendue directement en "publish"
+        return preview.get("bytes")
+    try:
+        return publish.result().data
+    except Exception:
+        return None
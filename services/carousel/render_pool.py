@@ -0,0 +1,208 @@
+"""
+===========================================
+🏭 RENDER POOL
+===========================================
+Rendu des slides dans un pool de processus (Pillow est CPU-bound, les threads
+se partagent le GIL)
+- Entrée en bytes (image téléchargée côté thread), sortie PNG en bytes
+- Cache de rendu consulté avant envoi (slide inchangée → aucun rendu)
+- Workers "spawn" préchauffés pour tous les templates (pool partagé par
+  Bourse / Crypto / Eco / PEA) : import du service + slides factices
+  (polices, overlays redimensionnés, largeurs de mots en cache)
+- Utilisé automatiquement quand il y a plus de slides que de cœurs
+- Pool cassé / indisponible → rendu local dans le thread appelant
+"""
+
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from services.carousel.render_cache import (
+    SlideManifest,
+    fetch_image_bytes,
+    lookup_slide,
+    slide_render_key,
+    store_slide,
+)
+from services.carousel.slide_encoder import PUBLISH_PROFILE
+
+
+RENDER_WORKERS = os.cpu_count() or 1
+RENDER_START_METHOD = "spawn"
+WARM_IMAGE_SIZE = (1080, 864)
+# Services rendus via SlideRenderer : tous préchauffés dans chaque worker
+RENDER_TEMPLATES = (
+    "services.carousel.bourse.carousel_slide_service",
+    "services.carousel.crypto.carousel_slide_service",
+    "services.carousel.eco.carousel_slide_service",
+    "services.carousel.pea.carousel_slide_service",
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def use_render_pool(slide_count: int) -> bool:
+    return RENDER_WORKERS > 1 and slide_count > RENDER_WORKERS
+
+
+def _warm_image_bytes() -> bytes:
+    from PIL import Image
+
+    output = BytesIO()
+    Image.new("RGB", WARM_IMAGE_SIZE, (128, 128, 128)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def _init_worker(module_names: Tuple[str, ...]) -> None:
+    """
+    Initializer des workers : un rendu factice par template remplit les caches du process
+    (le pool est partagé, un worker peut recevoir les slides de n'importe quel service).
+    """
+    image_bytes = _warm_image_bytes()
+    for module_name in module_names:
+        try:
+            module = importlib.import_module(module_name)
+            module.generate_cover_slide(image_bytes=image_bytes)
+            module.generate_carousel_slide(
+                title="Préchauffage du rendu",
+                content="Les polices et les overlays sont chargés une fois par worker.",
+                image_bytes=image_bytes,
+            )
+        except Exception as exc:
+            print(f"⚠️ Préchauffage worker slides KO ({module_name}): {exc}")
+
+
+def _render_in_worker(module_name: str, func_name: str, kwargs: dict) -> bytes:
+    return getattr(importlib.import_module(module_name), func_name)(**kwargs)
+
+
+def get_render_pool(module_name: str) -> Optional[ProcessPoolExecutor]:
+    """
+    Pool partagé par process (None si les processus ne peuvent pas être créés),
+    workers préchauffés pour RENDER_TEMPLATES (+ module_name s'il n'y figure pas).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            templates = RENDER_TEMPLATES if module_name in RENDER_TEMPLATES else (*RENDER_TEMPLATES, module_name)
+            try:
+                _pool = ProcessPoolExecutor(
+                    max_workers=RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context(RENDER_START_METHOD),
+                    initializer=_init_worker,
+                    initargs=(templates,),
+                )
+            except Exception as exc:
+                print(f"⚠️ Pool de rendu indisponible: {exc}")
+                return None
+        return _pool
+
+
+def _discard_render_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class PendingSlide(NamedTuple):
+    """
+    Rendu lancé : key = clé du cache de rendu, appel → bytes encodés.
+    """
+    key: str
+    cached: bool
+    result: Callable[[], bytes]
+
+    def __call__(self) -> bytes:
+        return self.result()
+
+
+class SlideRenderer:
+    """
+    Rend les slides d'un service (generate_cover_slide / generate_carousel_slide…),
+    dans le pool de processus si le nombre de slides le justifie, sinon en local.
+    Les slides déjà rendues (cache local ou manifest du bucket) ne sont pas re-rendues.
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        slide_count: int,
+        manifest: Optional[SlideManifest] = None,
+    ) -> None:
+        self.module_name = module_name
+        self.manifest = manifest
+        self._module = importlib.import_module(module_name)
+        self._pool = get_render_pool(module_name) if use_render_pool(slide_count) else None
+
+    @property
+    def parallel(self) -> bool:
+        return self._pool is not None
+
+    def _local(self, func_name: str, kwargs: dict) -> bytes:
+        return getattr(self._module, func_name)(**kwargs)
+
+    def _dispatch(self, func_name: str, kwargs: dict) -> Callable[[], bytes]:
+        pool = self._pool
+        if pool is None:
+            return lambda: self._local(func_name, kwargs)
+
+        try:
+            future = pool.submit(_render_in_worker, self.module_name, func_name, kwargs)
+        except (BrokenProcessPool, RuntimeError):
+            _discard_render_pool(pool)
+            self._pool = None
+            return lambda: self._local(func_name, kwargs)
+
+        def _result() -> bytes:
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                # Worker tué (OOM…) : on termine la slide en local
+                _discard_render_pool(pool)
+                return self._local(func_name, kwargs)
+        return _result
+
+    def submit(self, func_name: str, **kwargs) -> PendingSlide:
+        """
+        Lance le rendu et retourne la slide en attente (appel → bytes encodés).
+        Les erreurs du rendu sont levées à l'appel.
+        """
+        # Téléchargement dans le thread appelant : la clé dépend du contenu de l'image
+        try:
+            kwargs = fetch_image_bytes(kwargs)
+        except Exception as exc:
+            def _failed(error: Exception = exc) -> bytes:
+                raise error
+            return PendingSlide("", False, _failed)
+
+        key = slide_render_key(self.module_name, func_name, kwargs, kwargs.get("profile", PUBLISH_PROFILE))
+        data = lookup_slide(key, self.manifest)
+        if data is not None:
+            return PendingSlide(key, True, lambda: data)
+
+        render = self._dispatch(func_name, kwargs)
+
+        def _store() -> bytes:
+            slide_bytes = render()
+            store_slide(key, slide_bytes, f"{self.module_name}.{func_name}")
+            return slide_bytes
+        return PendingSlide(key, False, _store)
+
+    def render(self, func_name: str, **kwargs) -> bytes:
+        return self.submit(func_name, **kwargs)()
@@ -0,0 +1,81 @@
+"""
+===========================================
+🗜️ SLIDE ENCODER
+===========================================
+Encodage des slides rendues (Pillow) selon un profil de sortie
+- "publish" : PNG sans perte, compress_level explicite (fichiers storage / exports)
+- "preview" : JPEG haute qualité, ~50x plus rapide et ~3x plus léger (affichage Streamlit)
+- "preview_lossless" : WebP sans perte, méthode la plus rapide
+- "canvas" : pas d'encodage, canvas RGB retourné tel quel (rendu unique encodé ensuite
+  dans plusieurs profils, cf. render_cache.render_slide_once)
+"""
+
+from io import BytesIO
+
+from typing import Union
+
+from PIL import Image
+
+
+PUBLISH_PROFILE = "publish"
+PREVIEW_PROFILE = "preview"
+CANVAS_PROFILE = "canvas"
+
+# compress_level 3 : pixels identiques au niveau 6 par défaut, encodage ~2,5x plus rapide (+10 % de poids)
+SLIDE_PROFILES = {
+    "publish": {
+        "format": "PNG",
+        "extension": "png",
+        "content_type": "image/png",
+        "options": {"compress_level": 3},
+    },
+    "preview": {
+        "format": "JPEG",
+        "extension": "jpg",
+        "content_type": "image/jpeg",
+        "options": {"quality": 90, "subsampling": 0},
+    },
+    "preview_lossless": {
+        "format": "WEBP",
+        "extension": "webp",
+        "content_type": "image/webp",
+        "options": {"lossless": True, "quality": 0, "method": 0},
+    },
+}
+
+
+def _get_profile(profile: str) -> dict:
+    try:
+        return SLIDE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Profil d'encodage inconnu: {profile}") from None
+
+
+def encode_slide(canvas: Image.Image, profile: str = PUBLISH_PROFILE) -> Union[bytes, Image.Image]:
+    """
+    Encode le canvas (RGB/RGBA) d'une slide selon le profil.
+    CANVAS_PROFILE : canvas RGB non encodé.
+    """
+    if profile == CANVAS_PROFILE:
+        return canvas.convert("RGB")
+    settings = _get_profile(profile)
+    output = BytesIO()
+    canvas.convert("RGB").save(output, format=settings["format"], **settings["options"])
+    return output.getvalue()
+
+
+def transcode_slide(slide_bytes: bytes, profile: str) -> bytes:
+    """
+    Ré-encode une slide déjà encodée (ex : PNG publié → preview légère).
+    """
+    with Image.open(BytesIO(slide_bytes)) as img:
+        return encode_slide(img, profile)
+
+
+def slide_extension(profile: str = PUBLISH_PROFILE) -> str:
+    return _get_profile(profile)["extension"]
+
+
+def slide_content_type(profile: str = PUBLISH_PROFILE) -> str:
+    return _get_profile(profile)["content_type"]
+
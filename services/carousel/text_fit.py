@@ -0,0 +1,109 @@
+"""
+===========================================
+📐 TEXT FIT
+===========================================
+Césure et ajustement de taille des textes de slides (Pillow)
+- Largeurs des mots mémoïsées par police (une mesure par mot et par taille)
+- Lignes mesurées incrémentalement (largeur ligne + espace + mot)
+- Mesure exacte de la ligne candidate seulement près de la limite (kerning / shaping)
+- Taille cherchée par dichotomie sur la même grille que la boucle historique
+  (start_size, start_size - 2, …, > 12, puis 12) → mêmes lignes, même police
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from PIL import ImageDraw, ImageFont
+
+from services.carousel.render_assets import load_font
+
+
+MIN_FONT_SIZE = 12
+SIZE_STEP = 2
+LINE_HEIGHT_RATIO = 1.2
+# Écart max toléré entre somme des mots et mesure réelle, par espace (en fraction de la taille)
+BOUNDARY_MARGIN_RATIO = 0.05
+
+
+@lru_cache(maxsize=65536)
+def _advance(font: ImageFont.ImageFont, mode: str, text: str) -> float:
+    return font.getlength(text, mode)
+
+
+def wrap_text(text: str, draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, max_width: int) -> List[str]:
+    """
+    Césure gloutonne mot à mot (identique à draw.textlength sur la ligne candidate).
+    """
+    mode = draw.fontmode
+    words = text.split()
+    space = _advance(font, mode, " ")
+    boundary_margin = getattr(font, "size", 10) * BOUNDARY_MARGIN_RATIO + 1
+    lines: List[str] = []
+    current: List[str] = []
+    current_width = 0.0
+    for word in words:
+        word_width = _advance(font, mode, word)
+        if not current:
+            # Premier mot de la ligne : placé même s'il dépasse
+            current = [word]
+            current_width = word_width
+            continue
+        width = current_width + space + word_width
+        margin = boundary_margin * len(current)
+        if max_width - margin < width <= max_width + margin:
+            # Zone d'incertitude : mesure réelle de la ligne candidate
+            width = _advance(font, mode, " ".join(current + [word]))
+        if width <= max_width:
+            current.append(word)
+            current_width = width
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            current_width = word_width
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def fit_text(
+    draw: ImageDraw.ImageDraw,
+    text: str,
+    max_width: int,
+    max_height: int,
+    start_size: int,
+    font_path: str,
+    weight: Optional[int] = None,
+) -> Tuple[ImageFont.ImageFont, List[str]]:
+    """
+    Plus grande taille de la grille (start_size, start_size - 2, …) dont le texte
+    tient dans max_width × max_height (interligne 1.2), sinon taille 12.
+    """
+    sizes = list(range(start_size, MIN_FONT_SIZE, -SIZE_STEP))
+    layouts = {}
+
+    def _fits(index: int) -> bool:
+        size = sizes[index]
+        font = load_font(font_path, size, weight=weight)
+        lines = wrap_text(text, draw, font, max_width)
+        layouts[index] = (font, lines)
+        return int(size * LINE_HEIGHT_RATIO) * len(lines) <= max_height
+
+    # Cas courant : la taille de départ tient
+    if sizes and _fits(0):
+        return layouts[0]
+    # Hauteur croissante avec la taille → premier index qui tient par dichotomie
+    low, high = 1, len(sizes)
+    while low < high:
+        mid = (low + high) // 2
+        if _fits(mid):
+            high = mid
+        else:
+            low = mid + 1
+    if low < len(sizes):
+        return layouts[low]
+    font = load_font(font_path, MIN_FONT_SIZE, weight=weight)
+    return font, wrap_text(text, draw, font, max_width)
+
+
+def clear_text_fit_cache() -> None:
+    _advance.cache_clear()
@@ -4,11 +4,13 @@
 from services.enrichment.enrichment_service import (
     enrich_all_items,
     enrich_items_batch,
+    enrich_items_concurrent,
     get_enrichment_stats,
 )
 
 __all__ = [
     "enrich_all_items",
     "enrich_items_batch",
+    "enrich_items_concurrent",
     "get_enrichment_stats",
 ]
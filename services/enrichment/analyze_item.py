@@ -1,12 +1,16 @@
 import json
+import random
 import streamlit as st
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from typing import Dict, Optional
 from prompts.theministry.enrich_metadata import PROMPT_ENRICH_METADATA
+from services.utils.rate_limiter import get_rate_limiter
 
 
 REQUEST_TIMEOUT = 60
 MAX_RETRIES = 2
+RATE_LIMIT_RETRIES = 4
+RATE_LIMIT_BACKOFF = 2.0
 client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
 
 
@@ -45,8 +49,12 @@ def analyze_metadata(title: str, content: str) -> Dict[str, object]:
     user_input = f"TITRE: {title}\n\nCONTENU: {content}"
     
     try:
-        # Retry logic pour gérer les timeouts
-        for attempt in range(MAX_RETRIES):
+        # Retry logic pour gérer les timeouts (et backoff dédié sur les 429)
+        limiter = get_rate_limiter("openai")
+        attempt = 0
+        rate_limited = 0
+        while True:
+            limiter.acquire()
             try:
                 response = client.chat.completions.create(
                     model="gpt-4o-mini",
@@ -65,13 +73,21 @@ def analyze_metadata(title: str, content: str) -> Dict[str, object]:
                 # Si succès, sortir de la boucle
                 break
                 
+            except RateLimitError:
+                rate_limited += 1
+                if rate_limited > RATE_LIMIT_RETRIES:
+                    raise
+                # Backoff exponentiel + jitter, appliqué à tous les workers
+                # (le prochain acquire() attend la fin de la pause)
+                limiter.penalize(RATE_LIMIT_BACKOFF * (2 ** (rate_limited - 1)) + random.uniform(0, 1))
+                
             except Exception as e:
-                if attempt < MAX_RETRIES - 1:
+                attempt += 1
+                if attempt < MAX_RETRIES:
                     # Retry sur timeout ou erreur réseau
                     continue
-                else:
-                    # Dernière tentative échouée, lever l'erreur
-                    raise e
+                # Dernière tentative échouée, lever l'erreur
+                raise e
         
         # Validation des champs
         required_fields = ["tags", "labels", "entities", "zone", "country"]
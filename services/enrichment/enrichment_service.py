@@ -1,10 +1,15 @@
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
 from db.supabase_client import get_supabase
 from services.enrichment.analyze_item import analyze_metadata
-from services.enrichment.update_metadata import update_item_metadata
+from services.enrichment.update_metadata import update_item_metadata, batch_update_metadata
 import time
 
 
+ENRICH_MAX_WORKERS = 8
+ENRICH_FLUSH_SIZE = 25
+
+
 def fetch_items_to_enrich(limit: Optional[int] = None, force_all: bool = False) -> List[Dict]:
     """
     Récupère les items à enrichir.
@@ -101,12 +106,169 @@ def enrich_single_item(item_id: str, title: str, content: str) -> Dict[str, obje
     }
 
 
-def enrich_items_batch(limit: Optional[int] = None) -> Dict[str, object]:
+def _analysis_to_update(item_id: str, analysis: Dict[str, object]) -> Dict[str, object]:
+    if analysis["status"] == "error":
+        return {
+            "id": item_id,
+            "tags": None,
+            "labels": None,
+            "entities": None,
+            "zone": None,
+            "country": None,
+            "error_message": analysis.get("message", "Erreur inconnue"),
+        }
+    return {
+        "id": item_id,
+        "tags": analysis["tags"],
+        "labels": analysis["labels"],
+        "entities": analysis["entities"],
+        "zone": analysis["zone"],
+        "country": analysis["country"],
+    }
+
+
+def _flush_updates(pending: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """
+    Pousse un lot d'analyses en DB et retourne les résultats par item
+    (même format que enrich_single_item).
+    """
+    updates = [_analysis_to_update(item_id, analysis) for item_id, analysis in pending]
+    try:
+        update_result = batch_update_metadata(updates)
+    except Exception as e:
+        # Un lot en échec ne doit pas interrompre tout l'enrichissement
+        update_result = {"details": [
+            {"id": item_id, "status": "error", "message": f"Erreur UPDATE : {str(e)[:200]}"}
+            for item_id, _ in pending
+        ]}
+    update_status = {detail["id"]: detail for detail in update_result.get("details", [])}
+    
+    results = []
+    for item_id, analysis in pending:
+        if analysis["status"] == "error":
+            results.append({
+                "status": "error",
+                "item_id": item_id,
+                "message": analysis.get("message", "Erreur analyse")
+            })
+            continue
+        
+        detail = update_status.get(item_id, {})
+        if detail.get("status") != "success":
+            results.append({
+                "status": "error",
+                "item_id": item_id,
+                "message": detail.get("message", "Erreur UPDATE")
+            })
+            continue
+        
+        results.append({
+            "status": "success",
+            "item_id": item_id,
+            "metadata": {
+                "tags": analysis["tags"],
+                "labels": analysis["labels"],
+                "entities": analysis["entities"],
+                "zone": analysis["zone"],
+                "country": analysis["country"]
+            },
+            "message": "Enrichissement réussi"
+        })
+    return results
+
+
+def enrich_items_concurrent(
+    items: List[Dict],
+    max_workers: int = ENRICH_MAX_WORKERS,
+    flush_size: int = ENRICH_FLUSH_SIZE,
+    progress_cb: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, object]:
+    """
+    Enrichit une liste d'items en parallèle.
+    
+    - Analyses IA sur un pool de threads borné (débit limité par le
+      token bucket "openai", backoff partagé sur les 429)
+    - Métadonnées poussées en DB par lots de `flush_size`
+    - progress_cb appelé depuis le thread appelant (compatible Streamlit) :
+      {"stage", "current", "total", "progress", "success", "errors", "message"}
+    
+    Returns:
+        Même format que enrich_items_batch
+    """
+    
+    start_time = time.time()
+    total = len(items)
+    success_count = 0
+    error_count = 0
+    done = 0
+    details = []
+    pending = []
+    
+    def _record(results: List[Dict[str, object]]) -> None:
+        nonlocal success_count, error_count
+        for result in results:
+            if result["status"] == "success":
+                success_count += 1
+            else:
+                error_count += 1
+            details.append(result)
+    
+    def _analyze(item: Dict) -> Dict[str, object]:
+        return analyze_metadata(item.get("title", ""), item.get("content", ""))
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_analyze, item): item.get("id") for item in items}
+        for future in as_completed(futures):
+            item_id = futures[future]
+            try:
+                analysis = future.result()
+            except Exception as e:
+                analysis = {"status": "error", "message": f"Erreur: {str(e)}"}
+            pending.append((item_id, analysis))
+            done += 1
+            
+            if len(pending) >= flush_size:
+                _record(_flush_updates(pending))
+                pending = []
+            
+            if progress_cb:
+                progress_cb({
+                    "stage": "enrich",
+                    "current": done,
+                    "total": total,
+                    "progress": done / total if total else 1,
+                    "success": success_count,
+                    "errors": error_count,
+                    "message": f"Enrich {done}/{total}",
+                })
+    
+    if pending:
+        _record(_flush_updates(pending))
+    
+    duration = time.time() - start_time
+    
+    return {
+        "status": "success" if error_count == 0 else "partial",
+        "total": total,
+        "success": success_count,
+        "errors": error_count,
+        "duration": round(duration, 2),
+        "details": details
+    }
+
+
+def enrich_items_batch(
+    limit: Optional[int] = None,
+    max_workers: int = ENRICH_MAX_WORKERS,
+    progress_cb: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, object]:
     """
     Enrichit un batch d'items (avec limit optionnel).
     
     Args:
         limit: Nombre max d'items à traiter (None = tous)
+        max_workers: Nombre d'analyses IA simultanées
+        progress_cb: Callback de progression (voir enrich_items_concurrent)
     
     Returns:
         {
@@ -119,8 +281,6 @@ def enrich_items_batch(limit: Optional[int] = None) -> Dict[str, object]:
         }
     """
     
-    start_time = time.time()
-    
     # Récupérer les items à enrichir
     items = fetch_items_to_enrich(limit=limit)
     
@@ -135,38 +295,7 @@ def enrich_items_batch(limit: Optional[int] = None) -> Dict[str, object]:
             "message": "Aucun item à enrichir"
         }
     
-    total = len(items)
-    success_count = 0
-    error_count = 0
-    details = []
-    
-    # Traiter chaque item
-    for idx, item in enumerate(items, start=1):
-        item_id = item.get("id")
-        title = item.get("title", "")
-        content = item.get("content", "")
-        
-        print(f"[{idx}/{total}] Traitement item {item_id}...")
-        
-        result = enrich_single_item(item_id, title, content)
-        
-        if result["status"] == "success":
-            success_count += 1
-        else:
-            error_count += 1
-        
-        details.append(result)
-    
-    duration = time.time() - start_time
-    
-    return {
-        "status": "success" if error_count == 0 else "partial",
-        "total": total,
-        "success": success_count,
-        "errors": error_count,
-        "duration": round(duration, 2),
-        "details": details
-    }
+    return enrich_items_concurrent(items, max_workers=max_workers, progress_cb=progress_cb)
 
 
 def enrich_all_items() -> Dict[str, object]:
@@ -1,7 +1,11 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from db.supabase_client import get_supabase
 
 
+METADATA_FIELDS = ("tags", "labels", "entities", "zone", "country")
+UPDATE_CHUNK_SIZE = 100
+
+
 def update_item_metadata(
     item_id: str,
     tags: Optional[str],
@@ -64,9 +68,13 @@ def update_item_metadata(
         }
 
 
-def batch_update_metadata(items_metadata: list) -> Dict[str, object]:
+def batch_update_metadata(items_metadata: list, chunk_size: int = UPDATE_CHUNK_SIZE) -> Dict[str, object]:
     """
     Met à jour plusieurs items en batch (optimisation).
+    Un seul UPSERT (on_conflict="id") de lignes {id, ...champs} par chunk ;
+    les lignes avec error_message sont envoyées dans des chunks à part
+    (mêmes colonnes par requête, error_message jamais écrasé à NULL).
+    Les ids proviennent de brew_items : l'upsert ne fait que des UPDATE.
     
     Args:
         items_metadata: Liste de dicts avec structure:
@@ -81,6 +89,7 @@ def batch_update_metadata(items_metadata: list) -> Dict[str, object]:
                 },
                 ...
             ]
+        chunk_size: Nombre max de lignes par requête UPSERT
     
     Returns:
         {
@@ -94,6 +103,7 @@ def batch_update_metadata(items_metadata: list) -> Dict[str, object]:
     updated_count = 0
     error_count = 0
     details = []
+    rows_by_columns: Dict[bool, List[Dict[str, object]]] = {False: [], True: []}
     
     for item in items_metadata:
         item_id = item.get("id")
@@ -102,26 +112,44 @@ def batch_update_metadata(items_metadata: list) -> Dict[str, object]:
             details.append({"id": "unknown", "status": "error", "message": "ID manquant"})
             continue
         
-        result = update_item_metadata(
-            item_id=item_id,
-            tags=item.get("tags"),
-            labels=item.get("labels"),
-            entities=item.get("entities"),
-            zone=item.get("zone"),
-            country=item.get("country"),
-            error_message=item.get("error_message")
-        )
-        
-        if result["status"] == "success":
-            updated_count += 1
-        else:
-            error_count += 1
-        
-        details.append({
-            "id": item_id,
-            "status": result["status"],
-            "message": result.get("message", "")
-        })
+        row = {"id": item_id}
+        row.update({field: item.get(field) for field in METADATA_FIELDS})
+        if item.get("error_message"):
+            row["error_message"] = item.get("error_message")
+        rows_by_columns["error_message" in row].append(row)
+    
+    for rows in rows_by_columns.values():
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            message = ""
+            try:
+                supabase = get_supabase()
+                response = (
+                    supabase.table("brew_items")
+                    .upsert(chunk, on_conflict="id")
+                    .execute()
+                )
+                updated_ids = {updated.get("id") for updated in (response.data or [])}
+            except Exception as e:
+                updated_ids = set()
+                message = f"Erreur UPSERT DB: {str(e)}"
+            
+            for row in chunk:
+                item_id = row["id"]
+                if item_id in updated_ids:
+                    updated_count += 1
+                    details.append({
+                        "id": item_id,
+                        "status": "success",
+                        "message": f"Item {item_id} mis à jour avec succès"
+                    })
+                else:
+                    error_count += 1
+                    details.append({
+                        "id": item_id,
+                        "status": "error",
+                        "message": message or f"Aucune ligne mise à jour pour l'item {item_id}"
+                    })
     
     return {
         "status": "success" if error_count == 0 else "partial",
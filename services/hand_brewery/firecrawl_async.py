@@ -0,0 +1,253 @@
+"""
+===========================================
+🔥 FIRECRAWL ASYNC CLIENT
+===========================================
+Client Firecrawl asyncio partagé par tout le process
+- Une boucle asyncio dédiée (thread daemon) + un httpx.AsyncClient (keep-alive)
+- Budget global : sémaphore de concurrence + token bucket "firecrawl"
+- Retries avec backoff exponentiel, 429 → pause globale (Retry-After)
+- Échéance optionnelle par thread : aucune tentative lancée une fois dépassée
+- Façade synchrone pour les jobs existants (threads)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+import streamlit as st
+
+from services.utils.rate_limiter import get_rate_limiter
+
+
+DEFAULT_API_URL = "https://api.firecrawl.dev"
+DEFAULT_MAX_CONCURRENCY = 5
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_TIMEOUT_SEC = 45
+# Marge HTTP au-delà du timeout de scrape côté Firecrawl
+HTTP_TIMEOUT_MARGIN_SEC = 15
+
+_RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def _secret(name: str, default: Optional[str] = None) -> Optional[str]:
+    try:
+        value = st.secrets.get(name)
+    except Exception:
+        value = None
+    return value or os.getenv(name) or default
+
+
+def _configured_concurrency() -> int:
+    try:
+        return max(1, int(_secret("FIRECRAWL_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY))))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_CONCURRENCY
+
+
+class _HTTPStatusError(Exception):
+    def __init__(self, status: int, body: str) -> None:
+        super().__init__(f"{status} {body}")
+        self.status = status
+
+
+class AsyncFirecrawlClient:
+    """
+    Client REST Firecrawl (/v2/scrape). Toutes les coroutines tournent sur la
+    même boucle : le sémaphore et la connexion HTTP sont donc partagés par
+    tous les jobs du process.
+    """
+
+    def __init__(self, api_key: str, api_url: str = DEFAULT_API_URL, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self.api_key = api_key
+        self.api_url = api_url.rstrip("/")
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._bucket = get_rate_limiter("firecrawl")
+        self._http = httpx.AsyncClient(
+            base_url=self.api_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    async def _acquire_token(self) -> None:
+        while True:
+            delay = self._bucket.try_acquire()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _post_scrape(self, url: str, formats: List[str], timeout_sec: int) -> Dict:
+        await self._acquire_token()
+        async with self._semaphore:
+            self.in_flight += 1
+            self.requests += 1
+            try:
+                response = await self._http.post(
+                    "/v2/scrape",
+                    json={"url": url, "formats": formats, "timeout": int(timeout_sec * 1000)},
+                    timeout=timeout_sec + HTTP_TIMEOUT_MARGIN_SEC,
+                )
+            finally:
+                self.in_flight -= 1
+
+        if response.status_code == 429:
+            self.rate_limited += 1
+            retry_after = response.headers.get("Retry-After")
+            try:
+                pause = float(retry_after) if retry_after else 5.0
+            except ValueError:
+                pause = 5.0
+            # Pause globale : tous les jobs du process lèvent le pied
+            self._bucket.penalize(pause)
+        if response.status_code >= 400:
+            raise _HTTPStatusError(response.status_code, response.text[:300])
+
+        payload = response.json()
+        if not payload.get("success", True):
+            raise RuntimeError(f"Firecrawl error: {payload.get('error') or 'échec du scrape'}")
+        return payload.get("data") or {}
+
+    async def scrape(
+        self,
+        url: str,
+        formats: Iterable[str],
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout_sec: int = DEFAULT_TIMEOUT_SEC,
+        deadline: Optional[float] = None,
+    ) -> Dict:
+        """
+        Scrape une URL. Retourne le dict "data" Firecrawl (markdown / html / metadata).
+        deadline (time.monotonic) : plus de tentative (ni de crédit consommé) au-delà.
+        """
+        formats = list(formats)
+        last_exc: Optional[Exception] = None
+        for attempt in range(max_retries + 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise RuntimeError("Firecrawl error: échéance dépassée, scrape abandonné")
+            try:
+                return await self._post_scrape(url, formats, timeout_sec)
+            except _HTTPStatusError as e:
+                last_exc = e
+                if attempt >= max_retries or e.status not in _RETRY_STATUS:
+                    raise RuntimeError(f"Firecrawl error: {e}")
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_exc = e
+                if attempt >= max_retries:
+                    raise RuntimeError(f"Firecrawl error: timeout/network ({e})")
+
+            self.retries += 1
+            # Backoff exponentiel avec jitter
+            base = min(2 ** attempt, 16)
+            await asyncio.sleep(min(timeout_sec, base + random.uniform(0.2, 0.9)))
+
+        raise RuntimeError(f"Firecrawl error: {str(last_exc) if last_exc else 'unknown'}")
+
+    async def scrape_many(self, urls: Iterable[str], formats: Iterable[str], **kwargs) -> List[object]:
+        """
+        Scrape plusieurs URLs en parallèle (dans la limite du budget global).
+        Retourne, dans l'ordre des URLs, le dict "data" ou l'exception levée.
+        """
+        formats = list(formats)
+        return await asyncio.gather(
+            *(self.scrape(url, formats, **kwargs) for url in urls),
+            return_exceptions=True,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Boucle partagée + façade synchrone
+# ---------------------------------------------------------------------------
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[AsyncFirecrawlClient] = None
+_client_key: Optional[str] = None
+_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        threading.Thread(target=_loop.run_forever, name="firecrawl-loop", daemon=True).start()
+    return _loop
+
+
+def _get_client() -> AsyncFirecrawlClient:
+    global _client, _client_key
+    api_key = _secret("FIRECRAWL_API_KEY")
+    if not api_key:
+        raise RuntimeError("FIRECRAWL_API_KEY manquante dans les secrets")
+    with _lock:
+        loop = _get_loop()
+        if _client is None or _client_key != api_key:
+            api_url = _secret("FIRECRAWL_API_URL", DEFAULT_API_URL)
+            concurrency = _configured_concurrency()
+
+            async def _build() -> AsyncFirecrawlClient:
+                # Construit dans la boucle partagée (sémaphore et client httpx y sont liés)
+                return AsyncFirecrawlClient(api_key, api_url=api_url, max_concurrency=concurrency)
+
+            _client = asyncio.run_coroutine_threadsafe(_build(), loop).result()
+            _client_key = api_key
+        return _client
+
+
+_thread_deadline = threading.local()
+
+
+def set_scrape_deadline(deadline: Optional[float]) -> None:
+    """
+    Échéance (time.monotonic) des scrapes lancés par le thread courant,
+    None pour la retirer. Un appelant qui abandonne un thread (timeout)
+    évite ainsi qu'il continue à consommer des crédits.
+    """
+    _thread_deadline.value = deadline
+
+
+def scrape_sync(
+    url: str,
+    formats: Iterable[str],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    timeout_sec: int = DEFAULT_TIMEOUT_SEC,
+) -> Dict:
+    """
+    Façade synchrone : bloque le thread appelant, le travail passe par la
+    boucle partagée (budget global). Respecte l'échéance du thread (set_scrape_deadline).
+    """
+    client = _get_client()
+    future = asyncio.run_coroutine_threadsafe(
+        client.scrape(
+            url,
+            formats,
+            max_retries=max_retries,
+            timeout_sec=timeout_sec,
+            deadline=getattr(_thread_deadline, "value", None),
+        ),
+        _get_loop(),
+    )
+    return future.result()
+
+
+def get_firecrawl_stats() -> Dict[str, int]:
+    with _lock:
+        return _client.stats() if _client is not None else {}
@@ -1,46 +1,11 @@
-import os
-import streamlit as st
-from firecrawl import FirecrawlApp
-import time
-import random
 from typing import Iterable, Optional
 
-
-DEFAULT_MAX_RETRIES = 3
-DEFAULT_TIMEOUT_SEC = 45
-
-
-def _is_retryable_error(msg: str) -> bool:
-    m = (msg or "").lower()
-    # Firecrawl (ou proxy) peut renvoyer des codes via message/exception.
-    retry_markers = [
-        "429",
-        "rate limit",
-        "too many requests",
-        "timeout",
-        "timed out",
-        "temporarily",
-        "503",
-        "502",
-        "504",
-        "overloaded",
-        "gateway",
-        "connection reset",
-        "connection aborted",
-        "ssl",
-    ]
-    non_retry_markers = [
-        "402",  # credits / paiement
-        "payment",
-        "credit",
-        "quota exceeded",
-        "invalid api key",
-        "unauthorized",
-        "forbidden",
-    ]
-    if any(x in m for x in non_retry_markers):
-        return False
-    return any(x in m for x in retry_markers)
+from services.hand_brewery.firecrawl_async import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT_SEC,
+    scrape_sync,
+)
+from services.hand_brewery.scrape_store import cached_scrape
 
 
 def _scrape_with_retries(
@@ -50,39 +15,23 @@ def _scrape_with_retries(
     max_retries: int = DEFAULT_MAX_RETRIES,
     timeout_sec: int = DEFAULT_TIMEOUT_SEC,
 ) -> object:
-    api_key = st.secrets.get("FIRECRAWL_API_KEY") or os.getenv("FIRECRAWL_API_KEY")
-    if not api_key:
-        raise RuntimeError("FIRECRAWL_API_KEY manquante dans les secrets")
-
-    # Instancier par appel (sécurité thread). Si besoin d'optim, on pourra passer à du thread-local.
-    app = FirecrawlApp(api_key=api_key)
-
-    last_exc: Optional[Exception] = None
-    for attempt in range(max_retries + 1):
-        try:
-            # Le SDK Firecrawl ne permet pas toujours un timeout paramétrable.
-            # On garde un timeout logique via retries + délai et on compte sur le SDK pour les timeouts réseau.
-            return app.scrape(url, formats=list(formats))
-        except Exception as e:
-            last_exc = e
-            msg = str(e)
-            if attempt >= max_retries or not _is_retryable_error(msg):
-                raise RuntimeError(f"Firecrawl error: {msg}")
-
-            # Backoff exponentiel avec jitter
-            base = min(2 ** attempt, 16)
-            jitter = random.uniform(0.2, 0.9)
-            sleep_s = min(timeout_sec, base + jitter)
-            time.sleep(sleep_s)
-
-    raise RuntimeError(f"Firecrawl error: {str(last_exc) if last_exc else 'unknown'}")
-
-
-def fetch_url_text(url: str) -> str:
+    # Passe par le client asyncio partagé : une seule connexion keep-alive et
+    # un budget de concurrence / débit commun à tous les jobs du process.
+    return scrape_sync(url, formats, max_retries=max_retries, timeout_sec=timeout_sec)
+
+
+def fetch_url_text(url: str, use_cache: bool = True, max_age_sec: Optional[int] = None) -> str:
     """
     Récupère le texte principal d'une page via Firecrawl.
     Gère les erreurs de crédits / API.
+    Passe par le scrape store local (fraîcheur par source) si use_cache.
     """
+    if use_cache:
+        return cached_scrape(url, "markdown", _fetch_url_text_live, max_age_sec=max_age_sec)
+    return _fetch_url_text_live(url)
+
+
+def _fetch_url_text_live(url: str) -> str:
     try:
         result = _scrape_with_retries(url=url, formats=["markdown"])
 
@@ -106,11 +55,18 @@ def fetch_url_text(url: str) -> str:
         raise RuntimeError(str(e))
 
 
-def fetch_url_html(url: str) -> str:
+def fetch_url_html(url: str, use_cache: bool = True, max_age_sec: Optional[int] = None) -> str:
     """
     Récupère le HTML d'une page via Firecrawl.
     Utile pour parser des listes d'URLs avec dates.
+    Passe par le scrape store local (fraîcheur courte pour les pages liste) si use_cache.
     """
+    if use_cache:
+        return cached_scrape(url, "html", _fetch_url_html_live, max_age_sec=max_age_sec)
+    return _fetch_url_html_live(url)
+
+
+def _fetch_url_html_live(url: str) -> str:
     try:
         result = _scrape_with_retries(url=url, formats=["html"])
         html = ""
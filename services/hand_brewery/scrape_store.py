@@ -0,0 +1,362 @@
+"""
+===========================================
+🗄️ SCRAPE STORE
+===========================================
+Store local des scrapes Firecrawl (SQLite)
+- Clé = URL normalisée (+ format markdown / html)
+- Contenu, date de fetch, hash du contenu
+- Politique de fraîcheur par source (host) et par format
+- Revalidation conditionnelle (If-Modified-Since) quand l'entrée est périmée
+- Registre des URLs déjà traitées avec succès (Mega Job)
+- Éviction LRU des scrapes, bornée en taille
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+from services.utils.llm_cache import CACHE_DIR
+
+
+SCRAPE_STORE_PATH = os.path.join(CACHE_DIR, "scrape_store.sqlite3")
+SCRAPE_STORE_MAX_BYTES = 300 * 1024 * 1024
+REVALIDATE_TIMEOUT_SEC = 6
+
+# Fraîcheur par défaut (secondes) :
+# - markdown = pages article, quasi immuables une fois publiées
+# - html = pages liste (fallback DOM), qui changent à chaque publication
+DEFAULT_FRESHNESS = {
+    "markdown": 7 * 24 * 3600,
+    "html": 15 * 60,
+}
+
+# Surcharges par source (host sans "www.")
+SOURCE_FRESHNESS: Dict[str, Dict[str, int]] = {
+    "bfmtv.com": {"html": 10 * 60},
+    "tradingsat.com": {"html": 10 * 60},
+    "fr.beincrypto.com": {"html": 20 * 60},
+    "boursedirect.fr": {"html": 15 * 60},
+    "boursier.com": {"html": 15 * 60},
+}
+
+_TRACKING_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid", "xtor", "at_medium", "at_campaign", "ref", "cmp"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalise une URL pour servir de clé :
+    scheme/host en minuscules, sans fragment, sans paramètres de tracking,
+    query triée, sans "/" final.
+    """
+    raw = (url or "").strip()
+    if not raw:
+        return ""
+    parts = urlsplit(raw)
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "https" and parts.port == 443) and not (scheme == "http" and parts.port == 80):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PREFIXES) and key.lower() not in _TRACKING_PARAMS
+    ]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def _source_key(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def freshness_for(url: str, fmt: str) -> int:
+    """
+    Durée de fraîcheur (secondes) d'un scrape pour cette source et ce format
+    """
+    overrides = SOURCE_FRESHNESS.get(_source_key(url), {})
+    return int(overrides.get(fmt, DEFAULT_FRESHNESS.get(fmt, 3600)))
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+class ScrapeStore:
+    """
+    Store SQLite des scrapes + URLs traitées, éviction LRU des scrapes bornée en taille.
+    Thread-safe (une connexion + un lock).
+    """
+
+    def __init__(self, path: str = SCRAPE_STORE_PATH, max_bytes: int = SCRAPE_STORE_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrapes ("
+            " url_key TEXT NOT NULL,"
+            " format TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " size INTEGER NOT NULL DEFAULT 0,"
+            " accessed_at REAL NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (url_key, format))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(scrapes)")}
+        if "size" not in columns:
+            # Store créé avant l'éviction : taille et date d'accès reconstituées
+            self._conn.execute("ALTER TABLE scrapes ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("ALTER TABLE scrapes ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE scrapes SET size = LENGTH(CAST(content AS BLOB)), accessed_at = fetched_at")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scrapes_accessed ON scrapes(accessed_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_urls ("
+            " url_key TEXT NOT NULL,"
+            " job TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " content_hash TEXT,"
+            " processed_at REAL NOT NULL,"
+            " PRIMARY KEY (url_key, job))"
+        )
+        self._conn.commit()
+
+    def get(self, url: str, fmt: str) -> Optional[Dict[str, object]]:
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, content, content_hash, fetched_at FROM scrapes WHERE url_key = ? AND format = ?",
+                (key, fmt),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE scrapes SET accessed_at = ? WHERE url_key = ? AND format = ?",
+                (time.time(), key, fmt),
+            )
+            self._conn.commit()
+        return {"url": row[0], "content": row[1], "content_hash": row[2], "fetched_at": row[3]}
+
+    def put(self, url: str, fmt: str, content: str) -> str:
+        digest = content_hash(content)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrapes"
+                " (url_key, format, url, content, content_hash, fetched_at, size, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), fmt, url, content, digest, now, len(content.encode("utf-8")), now),
+            )
+            self._evict_locked()
+            self._conn.commit()
+        return digest
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM scrapes").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # LRU : on supprime les moins récemment lus jusqu'à repasser sous ~90% du max
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT url_key, format, size FROM scrapes ORDER BY accessed_at ASC"
+        ).fetchall()
+        to_delete = []
+        for url_key, fmt, size in rows:
+            if total <= target:
+                break
+            to_delete.append((url_key, fmt))
+            total -= size
+        self._conn.executemany("DELETE FROM scrapes WHERE url_key = ? AND format = ?", to_delete)
+        self.evictions += len(to_delete)
+
+    def touch(self, url: str, fmt: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE scrapes SET fetched_at = ? WHERE url_key = ? AND format = ?",
+                (time.time(), normalize_url(url), fmt),
+            )
+            self._conn.commit()
+
+    def record(self, hit: bool, revalidated: bool = False) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if revalidated:
+                self.revalidated += 1
+
+    def mark_processed(self, urls: Iterable[str], job: str = "mega") -> None:
+        now = time.time()
+        rows = []
+        for url in urls:
+            key = normalize_url(url)
+            if not key:
+                continue
+            entry = self.get(url, "markdown")
+            rows.append((key, job, url, entry["content_hash"] if entry else None, now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO processed_urls (url_key, job, url, content_hash, processed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def processed_keys(self, urls: Iterable[str], job: str = "mega") -> set:
+        keys = list({normalize_url(url) for url in urls if url})
+        found = set()
+        with self._lock:
+            # Limite SQLite ~999 paramètres par requête
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT url_key FROM processed_urls WHERE job = ? AND url_key IN ({placeholders})",
+                    [job, *chunk],
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scrapes"
+            ).fetchone()
+            processed = self._conn.execute("SELECT COUNT(*) FROM processed_urls").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "processed": processed,
+        }
+
+
+_store: Optional[ScrapeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_scrape_store() -> Optional[ScrapeStore]:
+    """
+    Store partagé par process (None si le disque n'est pas utilisable).
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = ScrapeStore()
+            except Exception as exc:
+                print(f"⚠️ Scrape store indisponible: {exc}")
+                return None
+        return _store
+
+
+def _not_modified_since(url: str, fetched_at: float) -> bool:
+    """
+    GET conditionnel direct sur l'origine (sans Firecrawl) :
+    True si la page n'a pas changé depuis `fetched_at` (304 ou Last-Modified antérieur).
+    """
+    req = Request(
+        url,
+        headers={
+            "User-Agent": "Mozilla/5.0",
+            "If-Modified-Since": formatdate(fetched_at, usegmt=True),
+        },
+    )
+    try:
+        with urlopen(req, timeout=REVALIDATE_TIMEOUT_SEC) as response:
+            last_modified = response.headers.get("Last-Modified")
+            if not last_modified:
+                return False
+            return parsedate_to_datetime(last_modified).timestamp() <= fetched_at
+    except HTTPError as e:
+        return e.code == 304
+    except Exception:
+        return False
+
+
+def cached_scrape(url: str, fmt: str, fetch, max_age_sec: Optional[int] = None) -> str:
+    """
+    Retourne le contenu `fmt` de `url` depuis le store s'il est frais,
+    sinon tente une revalidation conditionnelle, sinon appelle `fetch(url)`
+    (Firecrawl) et enregistre le résultat.
+    """
+    store = get_scrape_store()
+    if store is None:
+        return fetch(url)
+
+    try:
+        entry = store.get(url, fmt)
+    except Exception:
+        entry = None
+
+    if entry is not None:
+        max_age = freshness_for(url, fmt) if max_age_sec is None else int(max_age_sec)
+        age = time.time() - float(entry["fetched_at"])
+        if age <= max_age:
+            store.record(hit=True)
+            return str(entry["content"])
+        if _not_modified_since(url, float(entry["fetched_at"])):
+            try:
+                store.touch(url, fmt)
+            except Exception:
+                pass
+            store.record(hit=True, revalidated=True)
+            return str(entry["content"])
+
+    store.record(hit=False)
+    content = fetch(url)
+    try:
+        store.put(url, fmt, content)
+    except Exception:
+        pass
+    return content
+
+
+def filter_unprocessed(items: List[Dict[str, str]], job: str = "mega") -> List[Dict[str, str]]:
+    """
+    Retire les items (dict avec "url") déjà traités avec succès par `job`
+    """
+    store = get_scrape_store()
+    if store is None or not items:
+        return list(items or [])
+    try:
+        done = store.processed_keys([item.get("url", "") for item in items], job=job)
+    except Exception:
+        return list(items)
+    return [item for item in items if normalize_url(item.get("url", "")) not in done]
+
+
+def mark_urls_processed(urls: Iterable[str], job: str = "mega") -> None:
+    store = get_scrape_store()
+    if store is None:
+        return
+    try:
+        store.mark_processed(urls, job=job)
+    except Exception as exc:
+        print(f"⚠️ Scrape store: marquage impossible ({exc})")
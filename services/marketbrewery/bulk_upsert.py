@@ -0,0 +1,104 @@
+"""
+===========================================
+📤 BULK UPSERT
+===========================================
+Écriture groupée dans les tables market_*
+- Convertit un DataFrame (ou une liste de dict) en lignes JSON-compatibles
+- UPSERT multi-lignes par chunks sur la clé (asset_id, date)
+- Retry par chunk (backoff exponentiel)
+- Rapport : lignes écrites / en échec
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+
+DEFAULT_CONFLICT_KEY = "asset_id,date"
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_DELAY = 1.0
+
+
+def frame_to_rows(frame: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Convertit un DataFrame en liste de dict (NaN → None, types numpy → types Python)
+    """
+    if frame is None or frame.empty:
+        return []
+    if columns:
+        frame = frame.reindex(columns=list(columns))
+    clean = frame.astype(object).where(frame.notna(), None)
+    return clean.to_dict("records")
+
+
+def _dedupe_rows(rows: List[Dict], conflict_columns: List[str]) -> List[Dict]:
+    # Postgres refuse qu'un même UPSERT touche deux fois la même clé :
+    # on garde la dernière occurrence de chaque (asset_id, date)
+    unique = {}
+    for row in rows:
+        unique[tuple(row.get(column) for column in conflict_columns)] = row
+    return list(unique.values())
+
+
+def bulk_upsert(
+    supabase,
+    table: str,
+    rows: List[Dict],
+    *,
+    on_conflict: str = DEFAULT_CONFLICT_KEY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+) -> Dict:
+    """
+    UPSERT multi-lignes par chunks.
+    Retourne {"table", "written", "failed", "chunks", "errors"}.
+    """
+    report = {"table": table, "written": 0, "failed": 0, "chunks": 0, "errors": []}
+    conflict_columns = [column.strip() for column in on_conflict.split(",") if column.strip()]
+    rows = _dedupe_rows(rows or [], conflict_columns)
+    if not rows:
+        return report
+
+    size = max(1, int(chunk_size))
+    for start in range(0, len(rows), size):
+        chunk = rows[start:start + size]
+        report["chunks"] += 1
+        for attempt in range(max_retries + 1):
+            try:
+                supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+                report["written"] += len(chunk)
+                break
+            except Exception as e:
+                if attempt < max_retries:
+                    time.sleep(retry_delay * (2 ** attempt))
+                    continue
+                report["failed"] += len(chunk)
+                report["errors"].append(f"chunk {report['chunks']} ({len(chunk)} lignes) : {e}")
+
+    return report
+
+
+def upsert_frame(
+    supabase,
+    table: str,
+    frame: pd.DataFrame,
+    columns: Sequence[str],
+    **kwargs,
+) -> Dict:
+    """
+    UPSERT d'un DataFrame entier (colonnes explicites, lignes sans asset_id ignorées)
+    """
+    if frame is None or frame.empty:
+        return bulk_upsert(supabase, table, [], **kwargs)
+    frame = frame.dropna(subset=["asset_id"])
+    return bulk_upsert(supabase, table, frame_to_rows(frame, columns), **kwargs)
+
+
+def format_report(report: Dict) -> str:
+    line = f"{report['table']} : {report['written']} lignes écrites, {report['failed']} en échec ({report['chunks']} chunks)"
+    for error in report["errors"]:
+        line += f"\n   ❌ {error}"
+    return line
@@ -6,11 +6,16 @@ Ingestion des weekly close depuis Yahoo Finance
 - Récupère les 3 dernières semaines
 - UPSERT dans market_daily_close
 - Nettoie les données > 4 semaines
+- Calcule les top/flop par zone (1 requête, vectorisé) → market_top_flop
 """
 
-import yfinance as yf
 from datetime import datetime, timedelta
+
+import pandas as pd
+
 from db.supabase_client import get_supabase
+from services.marketbrewery.yahoo_batch import download_history
+from services.marketbrewery.bulk_upsert import bulk_upsert, upsert_frame, format_report
 from services.marketbrewery.listes_market import (
     US_TOP_200,
     FR_SBF_120,
@@ -21,6 +26,8 @@ from services.marketbrewery.listes_market import (
     EU_FX_PAIRS
 )
 
+MARKET_DAILY_CLOSE_COLUMNS = ["asset_id", "date", "open", "high", "low", "close", "volume"]
+
 
 def get_all_symbols():
     """Retourne tous les symboles à ingérer"""
@@ -66,63 +73,35 @@ def get_asset_meta_mapping(supabase):
         return {}
 
 
-def fetch_yahoo_data(symbol, weeks=3):
+def fetch_yahoo_batch(symbols, weeks=3):
     """
-    Récupère les N dernières weekly close depuis Yahoo Finance
-    Retourne une liste de dict {date, open, high, low, close, volume}
+    Récupère les N dernières weekly close de tous les symboles en batch
+    Retourne un DataFrame long {symbol, date, open, high, low, close, volume}
     """
-    try:
-        ticker = yf.Ticker(symbol)
-        
-        # Récupérer les données weekly directement
-        hist = ticker.history(period=f"{weeks}wk", interval="1wk")
-        
-        if hist.empty:
-            return []
-        
-        # Filtrer seulement les lignes avec des données complètes
-        hist = hist.dropna()
-        
-        results = []
-        for date, row in hist.iterrows():
-            results.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "open": float(row["Open"]),
-                "high": float(row["High"]),
-                "low": float(row["Low"]),
-                "close": float(row["Close"]),
-                "volume": int(row["Volume"])
-            })
-        
-        return results
-        
-    except Exception as e:
-        print(f"⚠️  Erreur Yahoo Finance pour {symbol} : {e}")
-        return []
+    print(f"📥 Téléchargement Yahoo Finance ({len(symbols)} symboles)...")
+    frame = download_history(symbols, period=f"{weeks}wk", interval="1wk")
+
+    # Filtrer seulement les lignes avec des données complètes
+    frame = frame.dropna(subset=["open", "high", "low", "close", "volume"])
+    print(f"✅ {frame['symbol'].nunique()} symboles reçus")
+    return frame
 
 
-def upsert_market_data(supabase, asset_id, data_points):
+def upsert_market_data(supabase, frame, asset_mapping):
     """
-    UPSERT des données dans market_daily_close
+    UPSERT groupé du DataFrame dans market_daily_close
     Clé unique : (asset_id, date)
     """
-    if not data_points:
-        return
-    
-    for point in data_points:
-        try:
-            supabase.table("market_daily_close").upsert({
-                "asset_id": asset_id,
-                "date": point["date"],
-                "open": point["open"],
-                "high": point["high"],
-                "low": point["low"],
-                "close": point["close"],
-                "volume": point["volume"]
-            }).execute()
-            
-        except Exception as e:
-            print(f"❌ Erreur UPSERT pour asset_id={asset_id}, date={point['date']} : {e}")
+    if frame.empty:
+        return bulk_upsert(supabase, "market_daily_close", [])
+
+    frame = frame.assign(
+        asset_id=frame["symbol"].map(asset_mapping),
+        volume=frame["volume"].astype("int64"),
+    )
+    report = upsert_frame(supabase, "market_daily_close", frame, MARKET_DAILY_CLOSE_COLUMNS)
+    print(f"\n📤 UPSERT {format_report(report)}")
+    return report
 
 
 def clean_old_data(supabase):
@@ -158,16 +137,102 @@ def clean_old_top_flop(supabase, days=30):
         print(f"❌ Erreur nettoyage top/flop : {e}")
 
 
+def load_recent_closes(supabase, weeks=4, page_size=1000):
+    """
+    Charge les closes récents de tous les assets en une requête par plage
+    (paginée par blocs de page_size, limite PostgREST)
+    Retourne un DataFrame {asset_id, date, close}
+    """
+    cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime("%Y-%m-%d")
+    rows = []
+    start = 0
+    while True:
+        response = supabase.table("market_daily_close")\
+            .select("asset_id, date, close")\
+            .gte("date", cutoff_date)\
+            .order("asset_id")\
+            .order("date", desc=True)\
+            .range(start, start + page_size - 1)\
+            .execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            break
+        start += page_size
+    return pd.DataFrame(rows, columns=["asset_id", "date", "close"])
+
+
+def compute_performances(closes):
+    """
+    Variation entre les 2 derniers closes de chaque asset (vectorisé)
+    Retourne un DataFrame indexé par asset_id {close, close_prev, pct_change, date}
+    """
+    closes = closes.assign(close=pd.to_numeric(closes["close"], errors="coerce"))
+    closes = closes.dropna(subset=["close"])
+    if closes.empty:
+        return pd.DataFrame(columns=["close", "close_prev", "pct_change", "date"])
+
+    closes = closes.sort_values(["asset_id", "date"], ascending=[True, False])
+    position = closes.groupby("asset_id").cumcount()
+    current = closes[position == 0].set_index("asset_id")
+    previous = closes[position == 1].set_index("asset_id")
+
+    perf = current[["close", "date"]].join(previous["close"].rename("close_prev"), how="inner")
+    perf = perf[perf["close_prev"] != 0]
+    perf["pct_change"] = ((perf["close"] - perf["close_prev"]) / perf["close_prev"]) * 100
+    return perf
+
+
+def rank_top_flop(perf, symbols, asset_mapping, limit=10):
+    """
+    Classe les symboles d'une zone : top N puis flop N (sans doublons avec le top)
+    """
+    zone = pd.DataFrame({"symbol": [symbol for symbol in symbols if symbol in asset_mapping]})
+    zone["asset_id"] = zone["symbol"].map(asset_mapping)
+    zone = zone.join(perf, on="asset_id", how="inner")
+
+    top = zone.sort_values("pct_change", ascending=False, kind="mergesort").head(limit)
+    flop = zone[~zone["symbol"].isin(top["symbol"])]
+    flop = flop.sort_values("pct_change", ascending=True, kind="mergesort").head(limit)
+    return top, flop
+
+
+def swap_top_flop(supabase, rows):
+    """
+    Remplace le contenu de market_top_flop sans passer par une table vide :
+    insert du nouveau jeu en une requête, puis suppression des anciennes lignes
+    """
+    try:
+        response = supabase.table("market_top_flop").select("id").execute()
+        old_ids = [row["id"] for row in (response.data or [])]
+    except Exception as e:
+        print(f"❌ Erreur lecture market_top_flop : {e}")
+        return False
+
+    try:
+        supabase.table("market_top_flop").insert(rows).execute()
+    except Exception as e:
+        # L'ancien classement reste en place
+        print(f"❌ Erreur insert market_top_flop : {e}")
+        return False
+
+    for start in range(0, len(old_ids), 200):
+        try:
+            supabase.table("market_top_flop")\
+                .delete()\
+                .in_("id", old_ids[start:start + 200])\
+                .execute()
+        except Exception as e:
+            print(f"❌ Erreur suppression ancien market_top_flop : {e}")
+    return True
+
+
 def calculate_and_store_top_flop(supabase, asset_mapping):
     """
     Calcule les top/flop pour chaque zone et les stocke dans market_top_flop
     """
     print("\n📊 Calcul des top/flop par zone...")
     
-    from services.marketbrewery.listes_market import (
-        US_TOP_200, FR_SBF_120, EU_TOP_200, CRYPTO_TOP_30
-    )
-    
     zones = {
         "US": US_TOP_200,
         "FR": FR_SBF_120,
@@ -176,107 +241,42 @@ def calculate_and_store_top_flop(supabase, asset_mapping):
     }
     
     refresh_date = datetime.now().strftime("%Y-%m-%d")
-    # Reset complet pour éviter toute accumulation
+    
     try:
-        supabase.table("market_top_flop").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
+        closes = load_recent_closes(supabase)
     except Exception as e:
-        print(f"❌ Erreur reset market_top_flop : {e}")
+        print(f"❌ Erreur chargement des closes : {e}")
+        return
     
+    perf = compute_performances(closes)
     asset_meta = get_asset_meta_mapping(supabase)
-
+    
+    rows = []
     for zone_name, symbols in zones.items():
-        print(f"\n📍 Zone : {zone_name}")
-        
-        performances = []
-        
-        for symbol in symbols:
-            if symbol not in asset_mapping:
-                continue
-            
-            asset_id = asset_mapping[symbol]
-            
-            try:
-                # Récupérer les 2 dernières semaines
-                data_response = supabase.table("market_daily_close")\
-                    .select("date, close")\
-                    .eq("asset_id", asset_id)\
-                    .order("date", desc=True)\
-                    .limit(2)\
-                    .execute()
-                
-                if len(data_response.data) < 2:
-                    continue
-                
-                close_current = data_response.data[0]["close"]
-                close_previous = data_response.data[1]["close"]
-                date_ref = data_response.data[0]["date"]
-                
-                pct_change = ((close_current - close_previous) / close_previous) * 100
-                
-                # Récupérer le nom de l'asset depuis la table assets
-                asset_name = asset_meta.get(asset_id, "") or symbol
-                
-                performances.append({
-                    "symbol": symbol,
-                    "name": asset_name,
-                    "pct_change": pct_change,
-                    "close": close_current,
-                    "date": date_ref
-                })
-                
-            except Exception as e:
-                continue
-        
-        # Trier par performance
-        performances.sort(key=lambda x: x["pct_change"], reverse=True)
+        top, flop = rank_top_flop(perf, symbols, asset_mapping)
         
-        # Top 10 : les N meilleures performances
-        top_10 = performances[:10]
-        top_symbols = {perf["symbol"] for perf in top_10}
-        for rank, perf in enumerate(top_10, start=1):
-            try:
-                supabase.table("market_top_flop").insert({
+        for perf_type, ranked in (("top", top), ("flop", flop)):
+            for rank, row in enumerate(ranked.itertuples(index=False), start=1):
+                rows.append({
                     "zone": zone_name,
-                    "type": "top",
+                    "type": perf_type,
                     "rank": rank,
-                    "symbol": perf["symbol"],
-                    "asset_name": perf["name"],
-                    "pct_change": perf["pct_change"],
-                    "close_value": perf["close"],
-                    "date_ref": perf["date"],
+                    "symbol": row.symbol,
+                    "asset_name": asset_meta.get(row.asset_id, "") or row.symbol,
+                    "pct_change": float(row.pct_change),
+                    "close_value": float(row.close),
+                    "date_ref": row.date,
                     "refresh_date": refresh_date
-                }).execute()
-            except Exception as e:
-                print(f"❌ Erreur insert top {zone_name} : {e}")
-        
-        # Flop 10 : les N pires performances, sans doublons avec le top
-        flop_candidates = sorted(performances, key=lambda x: x["pct_change"])
-        flop_10 = []
-        for perf in flop_candidates:
-            if perf["symbol"] in top_symbols:
-                continue
-            flop_10.append(perf)
-            if len(flop_10) >= 10:
-                break
-        for rank, perf in enumerate(flop_10, start=1):
-            try:
-                supabase.table("market_top_flop").insert({
-                    "zone": zone_name,
-                    "type": "flop",
-                    "rank": rank,
-                    "symbol": perf["symbol"],
-                    "asset_name": perf["name"],
-                    "pct_change": perf["pct_change"],
-                    "close_value": perf["close"],
-                    "date_ref": perf["date"],
-                    "refresh_date": refresh_date
-                }).execute()
-            except Exception as e:
-                print(f"❌ Erreur insert flop {zone_name} : {e}")
+                })
         
-        print(f"✅ Top/Flop {zone_name} stockés")
+        print(f"📍 Zone {zone_name} : {len(top)} top / {len(flop)} flop")
+    
+    if not rows:
+        print("⚠️  Aucune performance calculée (market_top_flop inchangé)")
+        return
     
-    print("\n✅ Tous les top/flop calculés et stockés")
+    if swap_top_flop(supabase, rows):
+        print("\n✅ Tous les top/flop calculés et stockés")
 
 
 def refresh_market_daily_close():
@@ -302,7 +302,20 @@ def refresh_market_daily_close():
     total_processed = 0
     total_success = 0
     
-    # 3️⃣ Pour chaque zone, ingérer les données
+    # 3️⃣ Télécharger tout l'univers en batch (chunks multi-tickers)
+    tracked = [
+        symbol
+        for symbols in all_symbols.values()
+        for symbol in symbols
+        if symbol in asset_mapping
+    ]
+    frame = fetch_yahoo_batch(tracked)
+    received = set(frame["symbol"].unique())
+    
+    # 4️⃣ UPSERT groupé de tout le DataFrame
+    report = upsert_market_data(supabase, frame, asset_mapping)
+    
+    # 5️⃣ Résumé par zone
     for zone, symbols in all_symbols.items():
         print(f"\n📍 Zone : {zone} ({len(symbols)} symboles)")
         print("-" * 60)
@@ -313,29 +326,23 @@ def refresh_market_daily_close():
                 print(f"⚠️  {symbol} : non trouvé dans assets (skip)")
                 continue
             
-            asset_id = asset_mapping[symbol]
-            
-            # Récupérer les données Yahoo
-            data = fetch_yahoo_data(symbol)
-            
-            if data:
-                upsert_market_data(supabase, asset_id, data)
-                print(f"✅ {symbol} : {len(data)} jours ingérés")
+            if symbol in received:
                 total_success += 1
             else:
                 print(f"⚠️  {symbol} : aucune donnée")
             
             total_processed += 1
     
-    # 4️⃣ Nettoyage
+    # 6️⃣ Nettoyage
     clean_old_data(supabase)
     
-    # 5️⃣ Calcul et stockage des top/flop
+    # 7️⃣ Calcul et stockage des top/flop
     calculate_and_store_top_flop(supabase, asset_mapping)
     
-    # 6️⃣ Résumé
+    # 8️⃣ Résumé
     print("\n" + "="*60)
     print(f"✅ TERMINÉ : {total_success}/{total_processed} symboles ingérés")
+    print(f"   {report['written']} lignes écrites, {report['failed']} en échec")
     print("="*60 + "\n")
 
 
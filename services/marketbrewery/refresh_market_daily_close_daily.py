@@ -9,9 +9,10 @@ Ingestion des closes journaliers depuis Yahoo Finance
 """
 
 from datetime import datetime, timedelta
-import yfinance as yf
 
 from db.supabase_client import get_supabase
+from services.marketbrewery.bulk_upsert import bulk_upsert, format_report
+from services.marketbrewery.yahoo_batch import download_history
 from services.marketbrewery.listes_market import (
     EU_TOP_200,
     FR_SBF_120,
@@ -46,39 +47,29 @@ def _fetch_symbols(
     return [row["symbol"] for row in (response.data or []) if row.get("symbol")]
 
 
-def _fetch_daily_closes(symbol, days=5):
+def _fetch_daily_closes(symbols, days=5):
     """
-    Récupère les N derniers jours (daily) depuis Yahoo Finance
-    Retourne une liste de dict {date, close}
+    Récupère les N derniers jours (daily) de tous les symboles en batch.
+    Retourne un dict symbol → liste de dict {date, close}.
     """
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=f"{days}d", interval="1d")
-        if hist.empty:
-            return []
-        hist = hist[["Close"]].dropna()
-        results = []
-        for date, row in hist.iterrows():
-            results.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "close": float(row["Close"]),
-            })
-        return results
+        frame = download_history(symbols, period=f"{days}d", interval="1d")
     except Exception:
-        return []
+        return {}
+    return {
+        symbol: [
+            {"date": row.date, "close": float(row.close)}
+            for row in group.itertuples(index=False)
+        ]
+        for symbol, group in frame.groupby("symbol", sort=False)
+    }
 
 
-def _upsert_close_data(supabase, asset_id, point):
+def _upsert_close_data(supabase, rows):
     """
-    UPSERT dans market_daily_close_daily (clé unique : asset_id, date)
+    UPSERT groupé dans market_daily_close_daily (clé unique : asset_id, date)
     """
-    supabase.table("market_daily_close_daily").upsert({
-        "asset_id": asset_id,
-        "date": point["date"],
-        "close_value": point["close_value"],
-        "close_prev_value": point["close_prev_value"],
-        "pct_change": point["pct_change"],
-    }, on_conflict="asset_id,date").execute()
+    return bulk_upsert(supabase, "market_daily_close_daily", rows, on_conflict="asset_id,date")
 
 
 def _clean_old_close_data(supabase, days=10):
@@ -113,12 +104,14 @@ def refresh_market_daily_close_daily():
             EU_TOP_200 + FR_SBF_120 + EU_INDICES + EU_FX_PAIRS + COMMODITIES_MAJOR + CRYPTO_MAJOR + EU_BONDS_10Y
         ))
 
+    symbols = [symbol for symbol in symbols if asset_mapping.get(symbol)]
+    closes_by_symbol = _fetch_daily_closes(symbols, days=5)
+
+    rows = []
     for symbol in symbols:
-        asset_id = asset_mapping.get(symbol)
-        if not asset_id:
-            continue
+        asset_id = asset_mapping[symbol]
 
-        daily = _fetch_daily_closes(symbol, days=5)
+        daily = closes_by_symbol.get(symbol, [])
         if len(daily) < 2:
             continue
 
@@ -134,6 +127,11 @@ def refresh_market_daily_close_daily():
             "close_prev_value": close_prev,
             "pct_change": pct_change,
         }
-        _upsert_close_data(supabase, asset_id, point)
+        rows.append({"asset_id": asset_id, **point})
+
+    report = _upsert_close_data(supabase, rows)
 
     _clean_old_close_data(supabase, days=10)
+    if report["failed"]:
+        raise RuntimeError(f"UPSERT partiel {format_report(report)}")
+    return report
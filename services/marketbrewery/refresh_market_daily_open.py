@@ -12,6 +12,7 @@ from datetime import datetime, timedelta, timezone, time as dtime
 import yfinance as yf
 
 from db.supabase_client import get_supabase
+from services.marketbrewery.bulk_upsert import bulk_upsert, format_report
 from services.marketbrewery.listes_market import (
     EU_TOP_200,
     FR_SBF_120,
@@ -101,17 +102,11 @@ def _fetch_intraday_open(symbol: str, target_date: str) -> float | None:
         return None
 
 
-def _upsert_open_data(supabase, asset_id, point):
+def _upsert_open_data(supabase, rows):
     """
-    UPSERT dans market_daily_open (clé unique : asset_id, date)
+    UPSERT groupé dans market_daily_open (clé unique : asset_id, date)
     """
-    supabase.table("market_daily_open").upsert({
-        "asset_id": asset_id,
-        "date": point["date"],
-        "open_value": point["open_value"],
-        "close_prev_value": point["close_prev_value"],
-        "pct_change": point["pct_change"],
-    }, on_conflict="asset_id,date").execute()
+    return bulk_upsert(supabase, "market_daily_open", rows, on_conflict="asset_id,date")
 
 
 def _clean_old_open_data(supabase, days=10):
@@ -134,6 +129,7 @@ def refresh_market_daily_open():
 
     target_date = _get_today_paris_date()
 
+    rows = []
     for symbol in symbols:
         asset_id = asset_mapping.get(symbol)
         if not asset_id:
@@ -168,6 +164,11 @@ def refresh_market_daily_open():
             "close_prev_value": close_prev,
             "pct_change": pct_change,
         }
-        _upsert_open_data(supabase, asset_id, point)
+        rows.append({"asset_id": asset_id, **point})
+
+    report = _upsert_open_data(supabase, rows)
 
     _clean_old_open_data(supabase, days=10)
+    if report["failed"]:
+        raise RuntimeError(f"UPSERT partiel {format_report(report)}")
+    return report
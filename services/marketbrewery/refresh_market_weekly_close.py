@@ -9,9 +9,10 @@ Ingestion des weekly close depuis Yahoo Finance
 """
 
 from datetime import datetime, timedelta
-import yfinance as yf
 
 from db.supabase_client import get_supabase
+from services.marketbrewery.bulk_upsert import bulk_upsert, format_report
+from services.marketbrewery.yahoo_batch import download_history
 from services.marketbrewery.listes_market import (
     US_TOP_200,
     FR_SBF_120,
@@ -32,36 +33,29 @@ def _get_asset_id_mapping(supabase):
         return {}
 
 
-def _fetch_weekly_closes(symbol, weeks=8):
+def _fetch_weekly_closes(symbols, weeks=8):
     """
-    Récupère les N dernières semaines (weekly) depuis Yahoo Finance.
-    Retourne une liste de dict {date, close}.
+    Récupère les N dernières semaines (weekly) de tous les symboles en batch.
+    Retourne un dict symbol → liste de dict {date, close}.
     """
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=f"{weeks}wk", interval="1wk")
-        if hist.empty:
-            return []
-        hist = hist[["Close"]].dropna()
-        results = []
-        for date, row in hist.iterrows():
-            results.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "close": float(row["Close"]),
-            })
-        return results
+        frame = download_history(symbols, period=f"{weeks}wk", interval="1wk")
     except Exception:
-        return []
+        return {}
+    return {
+        symbol: [
+            {"date": row.date, "close": float(row.close)}
+            for row in group.itertuples(index=False)
+        ]
+        for symbol, group in frame.groupby("symbol", sort=False)
+    }
 
 
-def _upsert_weekly_close(supabase, asset_id, point):
-    supabase.table("market_weekly_close").upsert({
-        "asset_id": asset_id,
-        "date": point["date"],
-        "close_value": point["close_value"],
-        "close_prev_value": point["close_prev_value"],
-        "pct_change": point["pct_change"],
-    }, on_conflict="asset_id,date").execute()
+def _upsert_weekly_close(supabase, rows):
+    """
+    UPSERT groupé dans market_weekly_close (clé unique : asset_id, date)
+    """
+    return bulk_upsert(supabase, "market_weekly_close", rows, on_conflict="asset_id,date")
 
 
 def _clean_old_weekly_close(supabase, weeks=12):
@@ -86,12 +80,14 @@ def refresh_market_weekly_close():
         + EU_BONDS_10Y
     ))
 
+    symbols = [symbol for symbol in symbols if asset_mapping.get(symbol)]
+    closes_by_symbol = _fetch_weekly_closes(symbols, weeks=8)
+
+    rows = []
     for symbol in symbols:
-        asset_id = asset_mapping.get(symbol)
-        if not asset_id:
-            continue
+        asset_id = asset_mapping[symbol]
 
-        weekly = _fetch_weekly_closes(symbol, weeks=8)
+        weekly = closes_by_symbol.get(symbol, [])
         if len(weekly) < 2:
             continue
 
@@ -107,6 +103,11 @@ def refresh_market_weekly_close():
             "close_prev_value": close_prev,
             "pct_change": pct_change,
         }
-        _upsert_weekly_close(supabase, asset_id, point)
+        rows.append({"asset_id": asset_id, **point})
+
+    report = _upsert_weekly_close(supabase, rows)
 
     _clean_old_weekly_close(supabase, weeks=12)
+    if report["failed"]:
+        raise RuntimeError(f"UPSERT partiel {format_report(report)}")
+    return report
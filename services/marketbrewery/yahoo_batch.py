@@ -0,0 +1,145 @@
+"""
+===========================================
+📥 YAHOO BATCH DOWNLOAD
+===========================================
+Téléchargement groupé des historiques Yahoo Finance
+- Découpe l'univers de symboles en chunks multi-tickers (yf.download)
+- Parallélise les requêtes avec un nombre de workers borné
+- Relance une fois les symboles manquants (rate limit / timeout Yahoo)
+- Retourne un DataFrame "long" : symbol, date, open, high, low, close, volume
+"""
+
+import threading
+import time
+from typing import Iterable, List
+
+import pandas as pd
+import yfinance as yf
+
+
+DEFAULT_CHUNK_SIZE = 150
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RETRY_DELAY = 2.0
+
+HISTORY_COLUMNS = ["symbol", "date", "open", "high", "low", "close", "volume"]
+
+_FIELD_MAP = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+}
+
+# yf.download stocke ses résultats dans un état global du module yfinance :
+# deux appels simultanés se marchent dessus. On sérialise donc les chunks et
+# on délègue la parallélisation à yfinance (threads=max_workers) dans chaque chunk.
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def chunk_symbols(symbols: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[List[str]]:
+    """
+    Dédoublonne (ordre conservé) et découpe les symboles en chunks
+    """
+    unique = list(dict.fromkeys(symbol for symbol in symbols if symbol))
+    size = max(1, int(chunk_size))
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+
+def _empty_history() -> pd.DataFrame:
+    return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+
+def _to_long_frame(raw: pd.DataFrame, symbols: List[str]) -> pd.DataFrame:
+    """
+    Convertit la sortie de yf.download (colonnes ticker × champ) en format long
+    """
+    if raw is None or raw.empty:
+        return _empty_history()
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Un seul ticker sans multi-index : on rétablit le niveau "ticker"
+        raw = pd.concat({symbols[0]: raw}, axis=1)
+
+    frames = []
+    for symbol in raw.columns.get_level_values(0).unique():
+        sub = raw[symbol]
+        fields = [field for field in _FIELD_MAP if field in sub.columns]
+        sub = sub[fields].rename(columns=_FIELD_MAP).dropna(subset=["close"])
+        if sub.empty:
+            continue
+        sub = sub.reset_index()
+        sub = sub.rename(columns={sub.columns[0]: "date"})
+        sub.insert(0, "symbol", symbol)
+        frames.append(sub)
+
+    if not frames:
+        return _empty_history()
+
+    frame = pd.concat(frames, ignore_index=True)
+    frame = frame.reindex(columns=HISTORY_COLUMNS)
+    frame["date"] = pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d")
+    return frame
+
+
+def _download_chunk(symbols: List[str], period: str, interval: str, max_workers: int) -> pd.DataFrame:
+    with _DOWNLOAD_LOCK:
+        raw = yf.download(
+            tickers=symbols,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            actions=False,
+            threads=max(1, min(int(max_workers), len(symbols))),
+            progress=False,
+        )
+    return _to_long_frame(raw, symbols)
+
+
+def download_history(
+    symbols: Iterable[str],
+    *,
+    period: str,
+    interval: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    retry_missing: bool = True,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+) -> pd.DataFrame:
+    """
+    Télécharge l'historique de tous les symboles en requêtes multi-tickers.
+    Retourne un DataFrame long trié par (symbol, date).
+    """
+    chunks = chunk_symbols(symbols, chunk_size)
+    if not chunks:
+        return _empty_history()
+
+    frames = []
+    for index, chunk in enumerate(chunks, start=1):
+        try:
+            frame = _download_chunk(chunk, period, interval, max_workers)
+        except Exception as e:
+            print(f"⚠️  Erreur Yahoo Finance (chunk {index}/{len(chunks)}) : {e}")
+            frame = _empty_history()
+
+        if retry_missing:
+            received = set(frame["symbol"].unique())
+            missing = [symbol for symbol in chunk if symbol not in received]
+            if missing:
+                time.sleep(retry_delay)
+                try:
+                    retried = _download_chunk(missing, period, interval, max_workers)
+                    frame = pd.concat([frame, retried], ignore_index=True)
+                except Exception as e:
+                    print(f"⚠️  Erreur Yahoo Finance (retry chunk {index}/{len(chunks)}) : {e}")
+
+        frames.append(frame)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return _empty_history()
+
+    result = pd.concat(frames, ignore_index=True)
+    result = result.drop_duplicates(subset=["symbol", "date"], keep="last")
+    return result.sort_values(["symbol", "date"]).reset_index(drop=True)
@@ -14,8 +14,14 @@ from openai import OpenAI
 from playwright.sync_api import sync_playwright
 
 from services.raw_storage.raw_news_service import enrich_raw_items, insert_raw_news
-from services.hand_brewery.firecrawl_client import fetch_url_text
 from services.news_brewery.rss_utils import fetch_dom_items, fetch_rss_items, merge_article_items
+from services.news_brewery.job_runner import (
+    DEFAULT_FIRECRAWL_CONCURRENCY,
+    DEFAULT_LLM_CONCURRENCY,
+    process_articles,
+)
+from services.utils.json_items import is_valid_items, secure_items
+from services.utils.llm_cache import cached_chat_completion, is_text_reply
 from prompts.news_brewery.structure import PROMPT_STRUCTURE
 from prompts.news_brewery.deduplicate import PROMPT_DEDUPLICATE
 from prompts.news_brewery.jsonfy import PROMPT_JSONFY
@@ -75,6 +81,9 @@ class JobConfig:
     use_firecrawl: bool
     # Pre-selected URLs from the UI (override RSS/DOM).
     urls_override: Optional[List[Dict[str, str]]]
+    # Concurrency per stage in RSS mode (1 / 1 = sequential).
+    firecrawl_concurrency: int = DEFAULT_FIRECRAWL_CONCURRENCY
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY
 
 
 class BfmBourseJob:
@@ -254,7 +263,8 @@ class BfmBourseJob:
 
     def _run_text_prompt(self, prompt: str, content: str, temperature: float = 0.2) -> str:
         # Shared helper for all text prompts.
-        response = client.chat.completions.create(
+        return cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": prompt},
@@ -262,8 +272,8 @@ class BfmBourseJob:
             ],
             temperature=temperature,
             timeout=REQUEST_TIMEOUT,
+            validate=is_text_reply,
         )
-        return response.choices[0].message.content or ""
 
     def _is_captcha_or_wall(self, html: str) -> bool:
         # Very simple wall detection (string match).
@@ -443,7 +453,8 @@ class BfmBourseJob:
         if not text.strip():
             return {"status": "error", "message": "Texte vide", "items": []}
         try:
-            response_jsonfy = client.chat.completions.create(
+            raw_json = cached_chat_completion(
+                client,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": PROMPT_JSONFY},
@@ -451,22 +462,26 @@ class BfmBourseJob:
                 ],
                 temperature=0,
                 response_format={"type": "json_object"},
+                validate=is_valid_items,
                 timeout=REQUEST_TIMEOUT,
             )
-            raw_json = response_jsonfy.choices[0].message.content or ""
-            response_secure = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": PROMPT_JSON_SECURE},
-                    {"role": "user", "content": raw_json},
-                ],
-                temperature=0,
-                response_format={"type": "json_object"},
-                timeout=REQUEST_TIMEOUT,
+            items = secure_items(
+                raw_json,
+                # Escalade LLM seulement si la validation locale échoue
+                lambda content: cached_chat_completion(
+                    client,
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": PROMPT_JSON_SECURE},
+                        {"role": "user", "content": content},
+                    ],
+                    temperature=0,
+                    response_format={"type": "json_object"},
+                    validate=is_valid_items,
+                    timeout=REQUEST_TIMEOUT,
+                ),
             )
-            secure_json = response_secure.choices[0].message.content or ""
-            data = json.loads(secure_json)
-            return {"status": "success", "items": data.get("items", [])}
+            return {"status": "success", "items": items}
         except Exception as exc:
             return {"status": "error", "message": str(exc), "items": []}
 
@@ -515,51 +530,16 @@ class BfmBourseJob:
                 self.total = len(articles)
                 self._log(f"🔎 {len(articles)} URL(s) détectée(s)")
 
-                for idx, article in enumerate(articles, start=1):
-                    if self._stop_event.is_set():
-                        break
-                    self._wait_if_paused()
-                    if self._stop_event.is_set():
-                        break
-                    self.current_index = idx
-
-                    # Global timeout guard.
-                    if time.time() - start_time > config.global_timeout_minutes * 60:
-                        self.state = "failed"
-                        self.errors.append("Timeout global atteint")
-                        break
-
-                    url = article.get("url", "")
-                    self._log(f"➡️ Article {idx}/{len(articles)}")
-
-                    if not config.use_firecrawl:
-                        self.errors.append("Firecrawl désactivé, impossible de récupérer l'article")
-                        self.skipped += 1
-                        continue
-
-                    try:
-                        # Fetch article text with Firecrawl (retourne déjà du markdown propre).
-                        raw_text = fetch_url_text(url)
-                    except Exception as exc:
-                        self.errors.append(f"Firecrawl error: {exc}")
-                        self.skipped += 1
-                        continue
-
-                    # AI pipeline: structure (fait reformulation anti-plagiat + structuration).
-                    structured = self._run_text_prompt(PROMPT_STRUCTURE, raw_text, temperature=0.2)
-                    if not structured.strip():
-                        self.errors.append("Structure vide")
-                        self.skipped += 1
-                        continue
-
-                    # Append to buffer file.
-                    with open(buffer_path, "a", encoding="utf-8") as f:
-                        f.write(self._format_buffer_block(article, structured))
-                        f.write("\n\n")
-
-                    self.processed += 1
-                    self.consecutive_errors = 0
-                    self._log(f"✅ Article {idx} terminé")
+                process_articles(
+                    self,
+                    articles,
+                    buffer_path=buffer_path,
+                    start_time=start_time,
+                    global_timeout_minutes=config.global_timeout_minutes,
+                    use_firecrawl=config.use_firecrawl,
+                    firecrawl_concurrency=config.firecrawl_concurrency,
+                    llm_concurrency=config.llm_concurrency,
+                )
 
             except Exception as exc:
                 self.state = "failed"
@@ -0,0 +1,160 @@
+"""
+===========================================
+🏃 NEWS JOB RUNNER
+===========================================
+Boucle article commune aux jobs par source (BFM, BeInCrypto, BourseDirect,
+Boursier…) : Firecrawl → structure → ajout au buffer /tmp.
+- Firecrawl et structure tournent en parallèle (workers par étage)
+- Le buffer est écrit dans l'ordre des articles (commit ordonné)
+- Pause / reprise / stop / timeout global conservés
+- firecrawl_concurrency = llm_concurrency = 1 → comportement séquentiel
+Valeurs par défaut : cf. docs/specs/firecrawl-batching-parallelization.md
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict, List, Optional
+
+from services.hand_brewery.firecrawl_client import fetch_url_text
+from prompts.news_brewery.structure import PROMPT_STRUCTURE
+
+
+DEFAULT_FIRECRAWL_CONCURRENCY = 3
+DEFAULT_LLM_CONCURRENCY = 3
+POLL_SEC = 0.5
+
+_TIMEOUT = "timeout"
+_CANCELLED = "cancelled"
+
+
+def process_articles(
+    job,
+    articles: List[Dict[str, str]],
+    *,
+    buffer_path: str,
+    start_time: float,
+    global_timeout_minutes: int,
+    use_firecrawl: bool,
+    firecrawl_concurrency: int = DEFAULT_FIRECRAWL_CONCURRENCY,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+) -> None:
+    """
+    Traite `articles` pour `job` (compteurs, logs, erreurs, buffer).
+    Le job doit exposer _stop_event, _wait_if_paused, _log, _run_text_prompt,
+    _format_buffer_block et les compteurs processed / skipped / current_index.
+    """
+    total = len(articles)
+    deadline = start_time + global_timeout_minutes * 60
+
+    def _timed_out() -> bool:
+        return time.time() > deadline
+
+    def _stop_before_next() -> bool:
+        # Stop / pause / timeout global vérifiés avant chaque article consommé
+        if job._stop_event.is_set():
+            return True
+        job._wait_if_paused()
+        if job._stop_event.is_set():
+            return True
+        if _timed_out():
+            job.state = "failed"
+            job.errors.append("Timeout global atteint")
+            return True
+        return False
+
+    if not use_firecrawl:
+        for idx in range(1, total + 1):
+            if _stop_before_next():
+                break
+            job.current_index = idx
+            job.errors.append("Firecrawl désactivé, impossible de récupérer l'article")
+            job.skipped += 1
+        return
+
+    abort = threading.Event()
+    fetch_workers = max(1, int(firecrawl_concurrency or 1))
+    llm_workers = max(1, int(llm_concurrency or 1))
+    fetch_executor = ThreadPoolExecutor(max_workers=fetch_workers)
+    llm_executor = ThreadPoolExecutor(max_workers=llm_workers)
+
+    def _halted() -> bool:
+        return abort.is_set() or job._stop_event.is_set()
+
+    def _structure(raw_text: str) -> Dict[str, object]:
+        job._wait_if_paused()
+        if _halted():
+            return {"status": _CANCELLED}
+        # AI pipeline: structure (fait reformulation anti-plagiat + structuration).
+        structured = job._run_text_prompt(PROMPT_STRUCTURE, raw_text, temperature=0.2)
+        if not structured.strip():
+            return {"status": "error", "error": "Structure vide"}
+        return {"status": "ok", "structured": structured}
+
+    def _fetch(idx: int, article: Dict[str, str]) -> object:
+        job._wait_if_paused()
+        if _halted():
+            return {"status": _CANCELLED}
+        if _timed_out():
+            return {"status": _TIMEOUT}
+        job._log(f"➡️ Article {idx}/{total}")
+        try:
+            # Fetch article text with Firecrawl (retourne déjà du markdown propre).
+            raw_text = fetch_url_text(article.get("url", ""))
+        except Exception as exc:
+            return {"status": "error", "error": f"Firecrawl error: {exc}"}
+        if _halted():
+            return {"status": _CANCELLED}
+        # Le structure démarre dès que le scrape revient (sans attendre les autres articles)
+        return llm_executor.submit(_structure, raw_text)
+
+    def _wait(future: Future) -> Optional[object]:
+        while True:
+            if _halted():
+                return None
+            if _timed_out():
+                return {"status": _TIMEOUT}
+            try:
+                return future.result(timeout=POLL_SEC)
+            except FutureTimeout:
+                continue
+
+    try:
+        futures = [fetch_executor.submit(_fetch, idx, article) for idx, article in enumerate(articles, start=1)]
+
+        # Commit ordonné : l'article idx n'est écrit qu'après idx-1, les suivants
+        # continuent pendant ce temps dans les pools.
+        for idx, (article, future) in enumerate(zip(articles, futures), start=1):
+            if _stop_before_next():
+                break
+            result = _wait(future)
+            if isinstance(result, Future):
+                result = _wait(result)
+            if result is None or _halted():
+                break
+            job.current_index = idx
+
+            status = result.get("status")
+            if status == _TIMEOUT:
+                job.state = "failed"
+                job.errors.append("Timeout global atteint")
+                break
+            if status == _CANCELLED:
+                break
+            if status != "ok":
+                job.errors.append(str(result.get("error", "")))
+                job.skipped += 1
+                continue
+
+            with open(buffer_path, "a", encoding="utf-8") as f:
+                f.write(job._format_buffer_block(article, str(result.get("structured", ""))))
+                f.write("\n\n")
+
+            job.processed += 1
+            job.consecutive_errors = 0
+            job._log(f"✅ Article {idx} terminé")
+    finally:
+        abort.set()
+        fetch_executor.shutdown(wait=False, cancel_futures=True)
+        llm_executor.shutdown(wait=False, cancel_futures=True)
@@ -1,17 +1,21 @@
 import json
+import queue
 import time
 import threading
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import random
 
 import streamlit as st
 from openai import OpenAI
 
 from services.raw_storage.raw_news_service import enrich_raw_items, insert_raw_news
+from services.hand_brewery.firecrawl_async import get_firecrawl_stats
 from services.hand_brewery.firecrawl_client import fetch_url_text
+from services.hand_brewery.scrape_store import filter_unprocessed, get_scrape_store, mark_urls_processed
+from services.utils.json_items import get_json_items_stats, is_valid_items, secure_items
+from services.utils.llm_cache import cached_chat_completion, get_llm_cache, is_text_reply
 from prompts.news_brewery.deduplicate import PROMPT_DEDUPLICATE
 from prompts.news_brewery.jsonfy import PROMPT_JSONFY
 from prompts.news_brewery.json_secure import PROMPT_JSON_SECURE
@@ -20,6 +24,9 @@ from prompts.news_brewery.structure import PROMPT_STRUCTURE
 
 REQUEST_TIMEOUT = 60
 LLM_MAX_RETRIES = 3
+QUEUE_POLL_SEC = 0.5
+JSON_FLUSH_IDLE_SEC = 5.0
+_PIPELINE_DONE = object()
 _THREAD_LOCAL = threading.local()
 
 
@@ -44,6 +51,8 @@ class MegaJobConfig:
     batch_size: int = 5
     firecrawl_concurrency: int = 3
     llm_concurrency: int = 2
+    json_concurrency: int = 1
+    queue_size: int = 0  # 0 = auto (2x le plus gros étage)
 
 
 class MegaJob:
@@ -59,6 +68,7 @@ class MegaJob:
         self.current_index = 0
         self.processed = 0
         self.skipped = 0
+        self.already_processed = 0
         self.errors: List[str] = []
         self.status_log: List[str] = []
         self.last_log: str = ""
@@ -71,6 +81,13 @@ class MegaJob:
         self._thread: Optional[threading.Thread] = None
         self._urls_to_scrape: List[Dict[str, str]] = []
 
+        # Pipeline (métriques par étage)
+        self._pipeline: Dict[str, Dict[str, object]] = {}
+        self._pipeline_started: Optional[float] = None
+        self._pipeline_finished: Optional[float] = None
+        self._json_batches = 0
+        self._total_inserted = 0
+
     def set_config(self, config: MegaJobConfig) -> None:
         self._config = config
 
@@ -82,8 +99,12 @@ class MegaJob:
         if self.state == "running":
             return
         
-        self._urls_to_scrape = urls
-        self.total = len(urls)
+        # URLs déjà traitées avec succès lors d'un run précédent (fenêtres 20h / 6h qui se recouvrent)
+        pending = filter_unprocessed(urls)
+        self.already_processed = len(urls) - len(pending)
+
+        self._urls_to_scrape = pending
+        self.total = len(pending)
         self.current_index = 0
         self.processed = 0
         self.skipped = 0
@@ -94,9 +115,16 @@ class MegaJob:
         self.json_items = []
         self.json_preview_text = ""
         self.llm_retries = 0
+        self._pipeline = {}
+        self._pipeline_started = None
+        self._pipeline_finished = None
+        self._json_batches = 0
+        self._total_inserted = 0
         self.state = "running"
         self.started_at = time.time()
         self._stop_event.clear()
+        if self.already_processed:
+            self._log(f"⏭️ {self.already_processed} URL(s) déjà traitée(s) lors d'un run précédent - ignorée(s)")
         
         self._thread = threading.Thread(target=self._run_auto_scraping, daemon=True)
         self._thread.start()
@@ -114,14 +142,38 @@ class MegaJob:
             "current_index": self.current_index,
             "processed": self.processed,
             "skipped": self.skipped,
+            "already_processed": self.already_processed,
             "errors": self.errors,
             "status_log": self.status_log,
             "last_log": self.last_log,
             "buffer_text": self.buffer_text,
             "json_preview_text": self.json_preview_text,
             "json_items": self.json_items,
+            "llm_cache": self._llm_cache_stats(),
+            "scrape_cache": self._scrape_cache_stats(),
+            "firecrawl": get_firecrawl_stats(),
+            "pipeline": self._pipeline_stats(),
+            "json_validation": get_json_items_stats(),
         }
 
+    def _scrape_cache_stats(self) -> Dict[str, object]:
+        store = get_scrape_store()
+        if store is None:
+            return {}
+        try:
+            return store.stats()
+        except Exception:
+            return {}
+
+    def _llm_cache_stats(self) -> Dict[str, object]:
+        cache = get_llm_cache()
+        if cache is None:
+            return {}
+        try:
+            return cache.stats()
+        except Exception:
+            return {}
+
     def _log(self, message: str) -> None:
         self.last_log = message
         self.status_log.append(message)
@@ -149,7 +201,8 @@ class MegaJob:
         for attempt in range(LLM_MAX_RETRIES + 1):
             try:
                 client = _get_openai_client()
-                response = client.chat.completions.create(
+                return cached_chat_completion(
+                    client,
                     model="gpt-4o-mini",
                     messages=[
                         {"role": "system", "content": prompt},
@@ -157,8 +210,8 @@ class MegaJob:
                     ],
                     temperature=temperature,
                     timeout=REQUEST_TIMEOUT,
+                    validate=is_text_reply,
                 )
-                return response.choices[0].message.content or ""
             except Exception as e:
                 last_exc = e
                 msg = str(e)
@@ -173,231 +226,309 @@ class MegaJob:
         raise last_exc if last_exc else RuntimeError("LLM error")
     
     def _run_auto_scraping(self) -> None:
-        """Boucle principale de scraping automatisé avec batches."""
-        batch_size = int(getattr(self._config, "batch_size", 5) or 5) if self._config else 5
+        """
+        Pipeline continu à files bornées :
+        fetch (Firecrawl) → structure (LLM) → JSON (micro-batchs) → insertion DB.
+        Chaque étage a ses propres workers ; une file pleine bloque l'étage amont
+        (backpressure) au lieu d'attendre la fin d'un batch complet.
+        """
+        cfg = self._config
+        batch_size = int(getattr(cfg, "batch_size", 5) or 5) if cfg else 5
         batch_size = max(1, min(batch_size, 50))
-        firecrawl_workers = int(getattr(self._config, "firecrawl_concurrency", 3) or 3) if self._config else 3
+        firecrawl_workers = int(getattr(cfg, "firecrawl_concurrency", 3) or 3) if cfg else 3
         firecrawl_workers = max(1, min(firecrawl_workers, 10))
-        llm_workers = int(getattr(self._config, "llm_concurrency", 2) or 2) if self._config else 2
+        llm_workers = int(getattr(cfg, "llm_concurrency", 2) or 2) if cfg else 2
         llm_workers = max(1, min(llm_workers, 6))
+        json_workers = int(getattr(cfg, "json_concurrency", 1) or 1) if cfg else 1
+        json_workers = max(1, min(json_workers, 4))
+        queue_size = int(getattr(cfg, "queue_size", 0) or 0) if cfg else 0
+        if queue_size <= 0:
+            queue_size = 2 * max(firecrawl_workers, llm_workers, batch_size)
+        dry_run = bool(cfg and cfg.dry_run)
+
+        fetch_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        structure_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        json_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        db_q: "queue.Queue" = queue.Queue(maxsize=max(2, json_workers * 2))
+
+        self._pipeline = {}
+        self._pipeline_started = time.time()
+        self._add_stage("fetch", firecrawl_workers, fetch_q)
+        self._add_stage("structure", llm_workers, structure_q)
+        self._add_stage("json", json_workers, json_q)
+        self._add_stage("db", 1, db_q)
+        self._total_inserted = 0
 
-        total_batches = (self.total + batch_size - 1) // batch_size
-        total_inserted = 0
-        
         self._log(
-            f"🚀 Démarrage Mega Job - {self.total} URLs en {total_batches} batch(s) "
-            f"de {batch_size} (Firecrawl x{firecrawl_workers}, Structure x{llm_workers})"
+            f"🚀 Démarrage Mega Job - {self.total} URLs en flux continu "
+            f"(Firecrawl x{firecrawl_workers}, Structure x{llm_workers}, JSON x{json_workers} "
+            f"par lots de {batch_size}, file {queue_size})"
         )
-        
-        # Diviser en batches
-        for batch_num in range(total_batches):
-            if self._stop_event.is_set():
-                break
-            
-            t_batch_start = time.time()
-            llm_retries_start = self.llm_retries
-
-            start_idx = batch_num * batch_size
-            end_idx = min(start_idx + batch_size, self.total)
-            batch_urls = self._urls_to_scrape[start_idx:end_idx]
-            batch_n = len(batch_urls)
-            
-            self._log(f"📦 Batch {batch_num + 1}/{total_batches} - {batch_n} URLs")
-            
-            # Buffer pour ce batch
-            batch_buffer = ""
-            batch_processed = 0
-
-            # Étape 1+2: pipeline Firecrawl -> Structure (overlap intra-batch)
-            def _fetch_one(idx_in_batch: int, item: Dict[str, str]) -> Dict[str, object]:
-                url = item.get("url", "") or ""
-                source_label = item.get("source_label", "Unknown") or "Unknown"
-                global_idx = start_idx + idx_in_batch
-                try:
-                    raw_text = fetch_url_text(url)
-                    return {
-                        "ok": True,
-                        "global_idx": global_idx,
-                        "idx_in_batch": idx_in_batch,
-                        "source_label": source_label,
-                        "url": url,
-                        "raw_text": raw_text,
-                    }
-                except Exception as e:
-                    return {
-                        "ok": False,
-                        "global_idx": global_idx,
-                        "idx_in_batch": idx_in_batch,
-                        "source_label": source_label,
-                        "url": url,
-                        "error": str(e),
-                    }
-
-            def _structure_one(r: Dict[str, object]) -> Dict[str, object]:
-                global_idx = int(r.get("global_idx", 0))
-                idx_in_batch = int(r.get("idx_in_batch", 0))
-                url = str(r.get("url", ""))
-                source_label = str(r.get("source_label", "Unknown"))
-                if not r.get("ok"):
-                    return {
-                        "ok": False,
-                        "global_idx": global_idx,
-                        "idx_in_batch": idx_in_batch,
-                        "url": url,
-                        "source_label": source_label,
-                        "error": f"Firecrawl error: {str(r.get('error', ''))}",
-                    }
-                raw_text = str(r.get("raw_text", "") or "")
-                if not raw_text.strip():
-                    return {
-                        "ok": False,
-                        "global_idx": global_idx,
-                        "idx_in_batch": idx_in_batch,
-                        "url": url,
-                        "source_label": source_label,
-                        "error": "Firecrawl vide",
-                    }
-                structured = self._run_text_prompt(PROMPT_STRUCTURE, raw_text, temperature=0.2)
-                return {
-                    "ok": bool(structured.strip()),
-                    "global_idx": global_idx,
-                    "idx_in_batch": idx_in_batch,
-                    "url": url,
-                    "source_label": source_label,
-                    "structured": structured,
-                    "error": "" if structured.strip() else "Structure vide",
-                }
 
-            self._log(f"  🔥 Firecrawl x{firecrawl_workers} + 📋 Structure x{llm_workers} (pipeline)…")
-            structured_results: List[Dict[str, object]] = []
-            completed_in_batch = 0
-            t_pipeline_start = time.time()
-            last_fetch_done = t_pipeline_start
-            last_struct_done = t_pipeline_start
-            with ThreadPoolExecutor(max_workers=firecrawl_workers) as fetch_executor, ThreadPoolExecutor(
-                max_workers=llm_workers
-            ) as llm_executor:
-                fetch_futures = {
-                    fetch_executor.submit(_fetch_one, i, item): i
-                    for i, item in enumerate(batch_urls, start=1)
-                }
-                structure_futures = {}
-
-                # Dès qu'un scrape revient, on lance sa structuration (overlap).
-                for ff in as_completed(fetch_futures):
-                    if self._stop_event.is_set():
-                        break
-                    r = ff.result()
-                    last_fetch_done = time.time()
-                    sf = llm_executor.submit(_structure_one, r)
-                    structure_futures[sf] = r
-
-                # Collecter les résultats STRUCTURE au fil de l'eau.
-                for sf in as_completed(structure_futures):
-                    if self._stop_event.is_set():
-                        break
-                    structured_results.append(sf.result())
-                    completed_in_batch += 1
-                    self.current_index = min(start_idx + completed_in_batch, self.total)
-                    last_struct_done = time.time()
-
-            if self._stop_event.is_set():
-                self.state = "stopped"
-                self._log("⏹️ Arrêté par l'utilisateur")
-                return
+        def _feed() -> None:
+            for global_idx, item in enumerate(self._urls_to_scrape, start=1):
+                if not self._queue_put(fetch_q, (global_idx, item)):
+                    return
+            self._close_stage_input(fetch_q, firecrawl_workers)
 
-            structured_results.sort(key=lambda r: int(r.get("idx_in_batch", 0)))
-            for r in structured_results:
-                global_idx = int(r.get("global_idx", 0))
-                idx_in_batch = int(r.get("idx_in_batch", 0))
-                source_label = str(r.get("source_label", "Unknown"))
-                url = str(r.get("url", ""))
-
-                self._log(
-                    f"  📄 [{global_idx}/{self.total}] (Batch {batch_num + 1} - {idx_in_batch}/{batch_n}) {source_label}"
-                )
+        def _fetch_one(job: tuple) -> Dict[str, object]:
+            global_idx, item = job
+            url = item.get("url", "") or ""
+            source_label = item.get("source_label", "Unknown") or "Unknown"
+            try:
+                raw_text = fetch_url_text(url)
+                return {"ok": True, "global_idx": global_idx, "source_label": source_label, "url": url, "raw_text": raw_text}
+            except Exception as e:
+                return {"ok": False, "global_idx": global_idx, "source_label": source_label, "url": url, "error": str(e)}
+
+        def _structure_one(r: Dict[str, object]) -> Optional[Dict[str, object]]:
+            result = dict(r)
+            if not r.get("ok"):
+                result["error"] = f"Firecrawl error: {str(r.get('error', ''))}"
+            elif not str(r.get("raw_text", "") or "").strip():
+                result.update({"ok": False, "error": "Firecrawl vide"})
+            else:
+                try:
+                    structured = self._run_text_prompt(PROMPT_STRUCTURE, str(r.get("raw_text")), temperature=0.2)
+                    result.update({
+                        "ok": bool(structured.strip()),
+                        "structured": structured,
+                        "error": "" if structured.strip() else "Structure vide",
+                    })
+                except Exception as e:
+                    result.update({"ok": False, "error": f"Structure error: {e}"})
+            result.pop("raw_text", None)
+            return self._record_structured(result)
+
+        def _insert_batch(batch: Dict[str, object]) -> Optional[Dict[str, object]]:
+            items = batch.get("items", [])
+            urls = batch.get("urls", [])
+            if dry_run:
+                self._log(f"✅ Lot JSON #{batch.get('batch_no')} - {len(items)} items OK (DRY RUN)")
+                return batch
+            db_result = self._insert_items(items)
+            if db_result.get("status") == "success":
+                inserted = db_result.get("inserted", 0)
+                with self._metrics_lock:
+                    self._total_inserted += inserted
+                mark_urls_processed(urls)
+                self._log(f"✅ Lot JSON #{batch.get('batch_no')} - {inserted} items insérés en DB")
+                return batch
+            with self._metrics_lock:
+                self.errors.append(f"Lot JSON #{batch.get('batch_no')} - Erreur DB: {db_result.get('message')}")
+            self._log(f"❌ Lot JSON #{batch.get('batch_no')} - Erreur DB")
+            return None
+
+        threads = [threading.Thread(target=_feed, daemon=True)]
+        threads += [
+            threading.Thread(target=self._stage_worker, args=("fetch", fetch_q, structure_q, llm_workers, _fetch_one), daemon=True)
+            for _ in range(firecrawl_workers)
+        ]
+        threads += [
+            threading.Thread(target=self._stage_worker, args=("structure", structure_q, json_q, json_workers, _structure_one), daemon=True)
+            for _ in range(llm_workers)
+        ]
+        threads += [
+            threading.Thread(target=self._json_worker, args=(json_q, db_q, batch_size), daemon=True)
+            for _ in range(json_workers)
+        ]
+        threads.append(
+            threading.Thread(target=self._stage_worker, args=("db", db_q, None, 0, _insert_batch), daemon=True)
+        )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._pipeline_finished = time.time()
 
-                if not r.get("ok"):
-                    self.errors.append(f"[{global_idx}] {str(r.get('error', ''))[:120]}: {url[:60]}")
-                    self.skipped += 1
-                    continue
+        if self._stop_event.is_set():
+            self.state = "stopped"
+            self._log("⏹️ Arrêté par l'utilisateur")
+            return
 
-                structured = str(r.get("structured", "") or "")
-                batch_buffer += structured + "\n\n"
-                batch_processed += 1
-                self.processed += 1
-                self._log(f"    ✅ [{global_idx}/{self.total}] OK - Ajouté au buffer batch")
-            
-            # Finalisation du batch
-            if self._stop_event.is_set():
-                self.state = "stopped"
-                self._log("⏹️ Arrêté par l'utilisateur")
-                return
-            
-            if batch_processed == 0:
-                self._log(f"⚠️ Batch {batch_num + 1}/{total_batches} - Aucun article traité")
-                continue
-            
-            # JSON du batch
-            self._log(f"🔄 Batch {batch_num + 1}/{total_batches} - Génération JSON ({batch_processed} articles)...")
-            t_json_start = time.time()
-            self.buffer_text = batch_buffer  # Utiliser le buffer du batch
-            json_result = self.finalize_buffer()
-            t_json_end = time.time()
-            if json_result.get("status") != "success":
-                self.errors.append(f"Batch {batch_num + 1} - Erreur JSON: {json_result.get('message')}")
-                self._log(f"❌ Batch {batch_num + 1} - Erreur JSON")
-                continue
-            
-            # DB du batch
-            if not self._config or not self._config.dry_run:
-                self._log(f"💾 Batch {batch_num + 1}/{total_batches} - Envoi en DB...")
-                t_db_start = time.time()
-                db_result = self.send_to_db()
-                t_db_end = time.time()
-                if db_result.get("status") == "success":
-                    inserted = db_result.get("inserted", 0)
-                    total_inserted += inserted
-                    self._log(f"✅ Batch {batch_num + 1}/{total_batches} - {inserted} items insérés en DB")
-                else:
-                    self.errors.append(f"Batch {batch_num + 1} - Erreur DB: {db_result.get('message')}")
-                    self._log(f"❌ Batch {batch_num + 1} - Erreur DB")
-            else:
-                t_db_start = time.time()
-                t_db_end = t_db_start
-                self._log(f"✅ Batch {batch_num + 1}/{total_batches} - OK (DRY RUN)")
-
-            # Metrics batch
-            t_batch_end = time.time()
-            pipeline_s = max(0.0, last_struct_done - t_pipeline_start)
-            fetch_s = max(0.0, last_fetch_done - t_pipeline_start)
-            json_s = max(0.0, t_json_end - t_json_start)
-            db_s = max(0.0, t_db_end - t_db_start)
-            batch_s = max(0.001, t_batch_end - t_batch_start)
-            llm_retries_delta = max(0, self.llm_retries - llm_retries_start)
+        for name, stage in self._pipeline_stats().items():
             self._log(
-                f"⏱️ Batch {batch_num + 1}/{total_batches} "
-                f"pipeline={pipeline_s:.1f}s (fetch~{fetch_s:.1f}s, struct~{pipeline_s:.1f}s) "
-                f"json={json_s:.1f}s db={db_s:.1f}s "
-                f"throughput={batch_processed / batch_s:.2f} item/s "
-                f"llm_retries=+{llm_retries_delta}"
+                f"⏱️ {name}: {stage['out']}/{stage['in']} en {stage['busy_s']:.1f}s cumulées "
+                f"(x{stage['workers']}, {stage['throughput']:.2f} item/s, erreurs={stage['errors']})"
             )
-            
-            # Reset buffer pour le prochain batch
-            self.buffer_text = ""
-            self.json_items = []
-            self.json_preview_text = ""
-        
+
         # Finalisation globale
-        if self.processed == 0:
+        if self.total == 0 and self.already_processed:
+            self.state = "completed"
+            self._log("✅ Mega Job terminé ! Aucune nouvelle URL à traiter")
+        elif self.processed == 0:
             self.state = "failed"
             self._log("❌ Aucun article traité avec succès")
         else:
             self.state = "completed"
-            self._log(f"✅ Mega Job terminé ! {self.processed} articles traités, {total_inserted} items insérés en DB")
+            self._log(f"✅ Mega Job terminé ! {self.processed} articles traités, {self._total_inserted} items insérés en DB")
             if self.skipped > 0:
                 self._log(f"⚠️ {self.skipped} articles ignorés (erreurs)")
 
+    # --- Pipeline : plomberie des étages -------------------------------------
+
+    def _add_stage(self, name: str, workers: int, inbox: "queue.Queue") -> None:
+        self._pipeline[name] = {
+            "workers": workers,
+            "alive": workers,
+            "in": 0,
+            "out": 0,
+            "errors": 0,
+            "busy_s": 0.0,
+            "queue": inbox,
+        }
+
+    def _pipeline_stats(self) -> Dict[str, Dict[str, object]]:
+        end = self._pipeline_finished or time.time()
+        elapsed = max(0.001, end - self._pipeline_started) if self._pipeline_started else 0.0
+        stats = {}
+        with self._metrics_lock:
+            for name, stage in self._pipeline.items():
+                stats[name] = {
+                    "workers": stage["workers"],
+                    "in": stage["in"],
+                    "out": stage["out"],
+                    "errors": stage["errors"],
+                    "queue_depth": stage["queue"].qsize(),
+                    "busy_s": round(stage["busy_s"], 2),
+                    "throughput": (stage["out"] / elapsed) if elapsed else 0.0,
+                }
+        return stats
+
+    def _queue_get(self, q: "queue.Queue", timeout: Optional[float] = None) -> object:
+        """
+        Attend un élément (indéfiniment si timeout=None, sinon None à l'expiration).
+        Retourne _PIPELINE_DONE si le job est stoppé.
+        """
+        while not self._stop_event.is_set():
+            try:
+                return q.get(timeout=QUEUE_POLL_SEC if timeout is None else timeout)
+            except queue.Empty:
+                if timeout is not None:
+                    return None
+        return _PIPELINE_DONE
+
+    def _queue_put(self, q: "queue.Queue", item: object) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                q.put(item, timeout=QUEUE_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _close_stage_input(self, q: "queue.Queue", consumers: int) -> None:
+        # Un marqueur de fin par worker consommateur
+        for _ in range(consumers):
+            if not self._queue_put(q, _PIPELINE_DONE):
+                return
+
+    def _worker_exit(self, name: str, outbox: Optional["queue.Queue"], consumers: int) -> None:
+        with self._metrics_lock:
+            self._pipeline[name]["alive"] -= 1
+            last = self._pipeline[name]["alive"] == 0
+        # Le dernier worker de l'étage ferme l'étage suivant
+        if last and outbox is not None:
+            self._close_stage_input(outbox, consumers)
+
+    def _stage_worker(self, name: str, inbox: "queue.Queue", outbox: Optional["queue.Queue"], consumers: int, fn) -> None:
+        try:
+            while True:
+                job = self._queue_get(inbox)
+                if job is _PIPELINE_DONE:
+                    break
+                t0 = time.time()
+                with self._metrics_lock:
+                    self._pipeline[name]["in"] += 1
+                try:
+                    out = fn(job)
+                except Exception:
+                    out = None
+                ok = out is not None and (not isinstance(out, dict) or out.get("ok", True))
+                with self._metrics_lock:
+                    stage = self._pipeline[name]
+                    stage["busy_s"] += time.time() - t0
+                    stage["out" if ok else "errors"] += 1
+                if outbox is not None and out is not None:
+                    if not self._queue_put(outbox, out):
+                        break
+        finally:
+            self._worker_exit(name, outbox, consumers)
+
+    def _json_worker(self, inbox: "queue.Queue", outbox: "queue.Queue", batch_size: int) -> None:
+        """
+        Accumule les articles structurés en micro-lots (batch_size, ou flush
+        après JSON_FLUSH_IDLE_SEC sans nouvel article) puis JSONfy le lot.
+        """
+        pending: List[Dict[str, object]] = []
+        first_at = 0.0
+        try:
+            while True:
+                wait = None if not pending else max(0.05, JSON_FLUSH_IDLE_SEC - (time.time() - first_at))
+                job = self._queue_get(inbox, timeout=wait)
+                done = job is _PIPELINE_DONE
+                if job is not None and not done:
+                    if not pending:
+                        first_at = time.time()
+                    pending.append(job)
+                expired = bool(pending) and time.time() - first_at >= JSON_FLUSH_IDLE_SEC
+                if pending and (done or expired or len(pending) >= batch_size):
+                    if self._stop_event.is_set():
+                        break
+                    batch = self._jsonfy_batch(pending)
+                    pending = []
+                    if batch is not None and not self._queue_put(outbox, batch):
+                        break
+                if done:
+                    break
+        finally:
+            self._worker_exit("json", outbox, 1)
+
+    def _jsonfy_batch(self, pending: List[Dict[str, object]]) -> Optional[Dict[str, object]]:
+        with self._metrics_lock:
+            self._json_batches += 1
+            batch_no = self._json_batches
+            self._pipeline["json"]["in"] += len(pending)
+        self._log(f"🔄 Lot JSON #{batch_no} - {len(pending)} articles...")
+        t0 = time.time()
+        text = "".join(str(r.get("structured", "")) + "\n\n" for r in pending)
+        json_result = self._jsonfy(text)
+        ok = json_result.get("status") == "success"
+        with self._metrics_lock:
+            stage = self._pipeline["json"]
+            stage["busy_s"] += time.time() - t0
+            stage["out" if ok else "errors"] += len(pending)
+            if not ok:
+                self.errors.append(f"Lot JSON #{batch_no} - Erreur JSON: {json_result.get('message')}")
+        if not ok:
+            self._log(f"❌ Lot JSON #{batch_no} - Erreur JSON")
+            return None
+        return {
+            "batch_no": batch_no,
+            "items": json_result.get("items", []),
+            "urls": [str(r.get("url", "")) for r in pending],
+        }
+
+    def _record_structured(self, r: Dict[str, object]) -> Optional[Dict[str, object]]:
+        """
+        Comptabilise un article sorti de l'étage structure.
+        Retourne l'article s'il doit continuer vers l'étage JSON.
+        """
+        global_idx = int(r.get("global_idx", 0))
+        url = str(r.get("url", ""))
+        with self._metrics_lock:
+            self.current_index = min(self.current_index + 1, self.total)
+            if r.get("ok"):
+                self.processed += 1
+            else:
+                self.skipped += 1
+                self.errors.append(f"[{global_idx}] {str(r.get('error', ''))[:120]}: {url[:60]}")
+        if r.get("ok"):
+            self._log(f"    ✅ [{global_idx}/{self.total}] {r.get('source_label', 'Unknown')} - structuré")
+            return r
+        self._log(f"    ⚠️ [{global_idx}/{self.total}] {r.get('source_label', 'Unknown')} - ignoré")
+        return None
+
     def _deduplicate_blocks(self, text: str) -> str:
         if not text.strip():
             return ""
@@ -408,7 +539,8 @@ class MegaJob:
             return {"status": "error", "message": "Texte vide", "items": []}
         try:
             client = _get_openai_client()
-            response_jsonfy = client.chat.completions.create(
+            raw_json = cached_chat_completion(
+                client,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": PROMPT_JSONFY},
@@ -416,23 +548,27 @@ class MegaJob:
                 ],
                 temperature=0,
                 response_format={"type": "json_object"},
+                validate=is_valid_items,
                 timeout=REQUEST_TIMEOUT,
             )
-            raw_json = response_jsonfy.choices[0].message.content or ""
             client = _get_openai_client()
-            response_secure = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": PROMPT_JSON_SECURE},
-                    {"role": "user", "content": raw_json},
-                ],
-                temperature=0,
-                response_format={"type": "json_object"},
-                timeout=REQUEST_TIMEOUT,
+            items = secure_items(
+                raw_json,
+                # Escalade LLM seulement si la validation locale échoue
+                lambda content: cached_chat_completion(
+                    client,
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": PROMPT_JSON_SECURE},
+                        {"role": "user", "content": content},
+                    ],
+                    temperature=0,
+                    response_format={"type": "json_object"},
+                    validate=is_valid_items,
+                    timeout=REQUEST_TIMEOUT,
+                ),
             )
-            secure_json = response_secure.choices[0].message.content or ""
-            data = json.loads(secure_json)
-            return {"status": "success", "items": data.get("items", [])}
+            return {"status": "success", "items": items}
         except Exception as exc:
             return {"status": "error", "message": str(exc), "items": []}
 
@@ -451,8 +587,13 @@ class MegaJob:
             return {"status": "error", "message": "Aucun item à insérer"}
         if self._config and self._config.dry_run:
             return {"status": "error", "message": "DRY RUN actif"}
+        return self._insert_items(self.json_items)
+
+    def _insert_items(self, items: List[Dict[str, object]]) -> Dict[str, object]:
+        if not items:
+            return {"status": "success", "inserted": 0}
         enriched = enrich_raw_items(
-            self.json_items,
+            items,
             flow="news_brewery",
             source_type="news",
             source_name=self._config.source_name if self._config else "Mega Job",
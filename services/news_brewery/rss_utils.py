@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from html import unescape
-from typing import Dict, List
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 import gzip
+import threading
 try:
     import brotli  # type: ignore
 except Exception:
@@ -19,6 +22,104 @@ except Exception:
 import feedparser
 
 
+_BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9,fr;q=0.8",
+    "Accept-Encoding": "gzip, br" if brotli else "gzip",
+}
+
+# Validateurs HTTP par URL (ETag / Last-Modified) + dernier corps reçu
+# (+ entrées RSS / items de pages liste déjà extraits) : un 304 évite
+# téléchargement ET parsing.
+_CONDITIONAL_CACHE: Dict[str, Dict[str, object]] = {}
+_CONDITIONAL_LOCK = threading.Lock()
+_CONDITIONAL_STATS = {"fetched": 0, "not_modified": 0, "errors": 0}
+
+
+def _decode_body(raw: bytes, content_encoding: str) -> bytes:
+    encoding = (content_encoding or "").lower()
+    if "gzip" in encoding:
+        return gzip.decompress(raw)
+    if "br" in encoding and brotli:
+        return brotli.decompress(raw)
+    return raw
+
+
+def _conditional_get(url: str, accept: str, timeout: int = 20) -> Tuple[Optional[bytes], bool]:
+    """
+    GET conditionnel (If-None-Match / If-Modified-Since), gzip/brotli acceptés.
+    Retourne (corps décompressé, not_modified). (None, False) en cas d'erreur.
+    """
+    with _CONDITIONAL_LOCK:
+        cached = dict(_CONDITIONAL_CACHE.get(url) or {})
+    headers = dict(_BROWSER_HEADERS, Accept=accept)
+    if cached.get("etag"):
+        headers["If-None-Match"] = str(cached["etag"])
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = str(cached["last_modified"])
+
+    try:
+        with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+            body = _decode_body(resp.read(), resp.headers.get("Content-Encoding") or "")
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except HTTPError as exc:
+        if exc.code == 304 and cached.get("body") is not None:
+            with _CONDITIONAL_LOCK:
+                _CONDITIONAL_STATS["not_modified"] += 1
+            return cached["body"], True
+        with _CONDITIONAL_LOCK:
+            _CONDITIONAL_STATS["errors"] += 1
+        return None, False
+    except Exception:
+        with _CONDITIONAL_LOCK:
+            _CONDITIONAL_STATS["errors"] += 1
+        return None, False
+
+    with _CONDITIONAL_LOCK:
+        _CONDITIONAL_STATS["fetched"] += 1
+        if etag or last_modified:
+            _CONDITIONAL_CACHE[url] = {"etag": etag, "last_modified": last_modified, "body": body}
+        else:
+            _CONDITIONAL_CACHE.pop(url, None)
+    return body, False
+
+
+def get_conditional_fetch_stats() -> Dict[str, int]:
+    with _CONDITIONAL_LOCK:
+        return dict(_CONDITIONAL_STATS)
+
+
+def _feed_entries(feed_url: str) -> List[Dict[str, str]]:
+    # Entrées RSS normalisées ; sur 304 on réutilise celles du dernier parsing.
+    body, not_modified = _conditional_get(
+        feed_url,
+        accept="application/rss+xml,application/atom+xml,application/xml;q=0.9,*/*;q=0.8",
+    )
+    if not_modified:
+        with _CONDITIONAL_LOCK:
+            entries = (_CONDITIONAL_CACHE.get(feed_url) or {}).get("entries")
+        if entries is not None:
+            return entries
+
+    # Repli : feedparser gère lui-même le téléchargement si notre GET a échoué
+    parsed = feedparser.parse(body if body is not None else feed_url)
+    entries = [
+        {
+            "link": entry.get("link") or "",
+            "title": entry.get("title") or "",
+            "published": entry.get("published") or entry.get("updated") or "",
+        }
+        for entry in parsed.entries
+    ]
+    with _CONDITIONAL_LOCK:
+        if feed_url in _CONDITIONAL_CACHE:
+            _CONDITIONAL_CACHE[feed_url]["entries"] = entries
+    return entries
+
+
 def fetch_rss_items(
     feed_url: str,
     max_items: int,
@@ -27,11 +128,10 @@ def fetch_rss_items(
     ignore_time_filter: bool = False,
 ) -> List[Dict[str, str]]:
     # Parse RSS feed and return a list of URL + title + timestamp.
-    parsed = feedparser.parse(feed_url)
     items: List[Dict[str, str]] = []
     now = datetime.now(timezone.utc)
 
-    for entry in parsed.entries:
+    for entry in _feed_entries(feed_url):
         url = entry.get("link") or ""
         title = entry.get("title") or ""
         published = entry.get("published") or entry.get("updated") or ""
@@ -68,15 +168,103 @@ def fetch_rss_items(
     return items
 
 
-def _parse_time_label(text: str) -> datetime | None:
+# ---------------------------------------------------------------------------
+# Extraction DOM : motifs précompilés (un par source), items bruts extraits
+# en une passe (finditer) et mis en cache avec la page, puis boucle commune
+# (fenêtre temporelle, arrêt dès max_items atteint).
+# ---------------------------------------------------------------------------
+
+_MONTHS = {
+    "janvier": 1,
+    "février": 2,
+    "fevrier": 2,
+    "mars": 3,
+    "avril": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7,
+    "août": 8,
+    "aout": 8,
+    "septembre": 9,
+    "octobre": 10,
+    "novembre": 11,
+    "décembre": 12,
+    "decembre": 12,
+}
+
+_CLOCK_LABEL_RE = re.compile(r"\b(\d{1,2})h(\d{2})\b")
+_DATE_LABEL_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{2,4})\b")
+_MONTH_LABEL_RE = re.compile(
+    r"\b(\d{1,2})\s+(janvier|février|fevrier|mars|avril|mai|juin|juillet|août|aout|septembre|octobre|novembre|décembre|decembre)\s*(\d{4})?\b",
+    re.IGNORECASE,
+)
+_RELATIVE_TIME_RE = re.compile(r"il y a\s+(\d+)\s+(minute|minutes|heure|heures|jour|jours)", re.I)
+_CLOCK_RE = re.compile(r"(\d{1,2}):(\d{2})")
+_TAG_RE = re.compile(r"<.*?>")
+_ONE_HOUR = timedelta(hours=1)
+_ONE_DAY = timedelta(days=1)
+
+_BFM_WRAPPER_RE = re.compile(r'<div class="wrapper-news-list">(.*?)<div class="pagination">', re.S)
+_BFM_ITEM_RE = re.compile(
+    r'<div class="item">.*?<div class="meta-date">\s*(?P<label>[^<]+)\s*</div>.*?'
+    r'<a\s+[^>]*href="(?P<href>[^"]+)"[^>]*>(?P<title>.*?)</a>',
+    re.S,
+)
+
+_BEIN_BLOCK_RE = re.compile(r"Les dernières nouvelles.*?<div class=\"ant-card-body\">(.*?)</div>\s*</div>", re.S)
+_BEIN_ITEM_RE = re.compile(
+    r'<a[^>]+class="ArticleCardSmall[^"]*"[^>]+href="(?P<href>[^"]+)"[^>]*>.*?'
+    r'<time[^>]+datetime="(?P<dt>[^"]+)"[^>]*>(?P<label>.*?)</time>.*?'
+    r'<div[^>]+data-testid="main-element"[^>]*>(?P<title>.*?)</div>',
+    re.S,
+)
+_ANCHOR_RE = re.compile(r'<a[^>]+href="(?P<href>[^"]+)"[^>]*>(?P<title>.*?)</a>', re.S)
+_BEIN_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\((https?://fr\.beincrypto\.com/[^)]+)\)")
+
+_BOURSEDIRECT_ITEM_RE = re.compile(
+    r'<div class="timeline-item[^"]*">.*?'
+    r'<div class="timeline-date-left[^"]*">(?P<time>[^<]+)</div>.*?'
+    r'<span class="publishDay">(?P<day>\d{1,2})</span>.*?'
+    r'<span class="text-muted">(?P<month_year>[^<]+)</span>.*?'
+    r'<a href="(?P<href>[^"]+)">.*?'
+    r'<h2 class="timeline-title[^"]*">(?P<title>.*?)</h2>',
+    re.S,
+)
+
+_BOURSIER_LISTING_RE = re.compile(
+    r'<div[^>]*id="listing"[^>]*>.*?<div[^>]*class="items"[^>]*>(.*?)</div>\s*<nav class="pagination"',
+    re.S,
+)
+_BOURSIER_ECONOMIE_ITEM_RE = re.compile(
+    r'<article[^>]*class="[^"]*item[^"]*"[^>]*>.*?'
+    r'<h2[^>]*>\s*<a[^>]+href="(?P<href>[^"]+)"[^>]*>(?P<title>.*?)</a>\s*</h2>.*?'
+    r'<time[^>]+class="date"[^>]+datetime="(?P<dt>[^"]+)"[^>]*>(?P<label>[^<]*)</time>',
+    re.S,
+)
+_BOURSIER_ITEM_RE = re.compile(
+    r'<div class="item[^"]*">.*?'
+    r'<time[^>]+class="date"[^>]+datetime="(?P<dt>[^"]+)".*?>(?P<label>[^<]*)</time>.*?'
+    r'<a href="(?P<href>[^"]+)".*?>(?P<title>.*?)</a>',
+    re.S,
+)
+_BOURSIER_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\((https?://www\.boursier\.com/[^)]+)\)")
+
+
+@lru_cache(maxsize=16)
+def _canonical_re(required_path: str) -> "re.Pattern[str]":
+    return re.compile(
+        rf'<link[^>]+rel="canonical"[^>]+href="[^"]*{re.escape(required_path)}[^"]*"',
+        re.I,
+    )
+
+
+def _parse_time_label(text: str, now: datetime | None = None) -> datetime | None:
     # Parse timestamps like "11h44" or "12/01/2026" or "12 janvier 2026".
-    time_match = re.search(r"\b(\d{1,2})h(\d{2})\b", text)
+    time_match = _CLOCK_LABEL_RE.search(text)
     if time_match:
-        hour = int(time_match.group(1))
-        minute = int(time_match.group(2))
-        now = datetime.now()
-        return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-    date_match = re.search(r"\b(\d{1,2})/(\d{1,2})/(\d{2,4})\b", text)
+        now = now or datetime.now()
+        return now.replace(hour=int(time_match.group(1)), minute=int(time_match.group(2)), second=0, microsecond=0)
+    date_match = _DATE_LABEL_RE.search(text)
     if date_match:
         day = int(date_match.group(1))
         month = int(date_match.group(2))
@@ -84,46 +272,23 @@ def _parse_time_label(text: str) -> datetime | None:
         if year < 100:
             year += 2000
         return datetime(year, month, day)
-    month_match = re.search(
-        r"\b(\d{1,2})\s+(janvier|février|fevrier|mars|avril|mai|juin|juillet|août|aout|septembre|octobre|novembre|décembre|decembre)\s*(\d{4})?\b",
-        text,
-        re.IGNORECASE,
-    )
+    month_match = _MONTH_LABEL_RE.search(text)
     if month_match:
-        day = int(month_match.group(1))
-        month_name = month_match.group(2).lower()
-        year = int(month_match.group(3)) if month_match.group(3) else datetime.now().year
-        months = {
-            "janvier": 1,
-            "février": 2,
-            "fevrier": 2,
-            "mars": 3,
-            "avril": 4,
-            "mai": 5,
-            "juin": 6,
-            "juillet": 7,
-            "août": 8,
-            "aout": 8,
-            "septembre": 9,
-            "octobre": 10,
-            "novembre": 11,
-            "décembre": 12,
-            "decembre": 12,
-        }
-        month = months.get(month_name)
+        month = _MONTHS.get(month_match.group(2).lower())
         if month:
-            return datetime(year, month, day)
+            year = int(month_match.group(3)) if month_match.group(3) else (now or datetime.now()).year
+            return datetime(year, month, int(month_match.group(1)))
     return None
 
 
-def _within_window(label_dt: datetime | None, mode: str, hours_window: int) -> bool:
+def _within_window(label_dt: datetime | None, mode: str, hours_window: int, now: datetime | None = None) -> bool:
     # Filter by time window ("today" or "last_hours").
     if label_dt is None:
         return True
-    now = datetime.now()
+    now = now or datetime.now()
     # If the hour appears "in the future", assume it belongs to yesterday.
-    if label_dt - now > timedelta(hours=1):
-        label_dt = label_dt - timedelta(days=1)
+    if label_dt - now > _ONE_HOUR:
+        label_dt = label_dt - _ONE_DAY
     if mode == "today":
         return label_dt.date() == now.date()
     if mode == "last_hours":
@@ -131,58 +296,82 @@ def _within_window(label_dt: datetime | None, mode: str, hours_window: int) -> b
     return True
 
 
-def _fetch_html_text(page_url: str) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9,fr;q=0.8",
-        "Accept-Encoding": "identity",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-    }
-    try:
-        req = Request(page_url, headers=headers)
-        with urlopen(req, timeout=20) as resp:
-            raw = resp.read()
-            encoding = (resp.headers.get("Content-Encoding") or "").lower()
-            if "gzip" in encoding:
-                raw = gzip.decompress(raw)
-            elif "br" in encoding and brotli:
-                raw = brotli.decompress(raw)
-            return raw.decode("utf-8", errors="ignore")
-    except Exception:
-        return ""
+def _fetch_html_page(page_url: str) -> Tuple[str, bool]:
+    # GET conditionnel : sur 304 on renvoie la dernière page reçue (not_modified=True).
+    body, not_modified = _conditional_get(
+        page_url,
+        accept="text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    )
+    if body is None:
+        return "", False
+    return body.decode("utf-8", errors="ignore"), not_modified
+
+
+ListingRecord = Tuple[str, str, Mapping[str, Optional[str]]]
+
+
+def _listing_records(
+    page_url: str | None,
+    not_modified: bool,
+    pattern: "re.Pattern[str]",
+    content: Callable[[], str],
+    base_url: str,
+) -> Iterator[ListingRecord]:
+    """
+    Items bruts d'une page liste, extraits à la demande (finditer) :
+    (url absolue, titre HTML, groupes nommés du motif), indépendants de la
+    fenêtre temporelle. Le consommateur s'arrête dès max_items atteint.
+    Page entièrement parcourue → items mis en cache avec les validateurs :
+    sur 304 on les réutilise (comme les entrées RSS), sans découpe ni regex.
+    page_url None = contenu hors GET conditionnel (Firecrawl), pas de cache.
+    """
+    slot = pattern.pattern
+    if page_url and not_modified:
+        with _CONDITIONAL_LOCK:
+            cached = ((_CONDITIONAL_CACHE.get(page_url) or {}).get("listings") or {}).get(slot)
+        if cached is not None:
+            yield from cached
+            return
+
+    records: List[ListingRecord] = []
+    for match in pattern.finditer(content()):
+        record = (_absolute_url(match["href"], base_url), match["title"], match)
+        records.append(record)
+        yield record
+    if page_url:
+        # Groupes copiés : le cache ne garde pas de référence au contenu de la page
+        records = [(url, title, match.groupdict()) for url, title, match in records]
+        with _CONDITIONAL_LOCK:
+            if page_url in _CONDITIONAL_CACHE:
+                _CONDITIONAL_CACHE[page_url].setdefault("listings", {})[slot] = records
 
 
 def _has_required_path(html_text: str, required_path: str) -> bool:
     if required_path in html_text:
         return True
-    return re.search(
-        rf'<link[^>]+rel="canonical"[^>]+href="[^"]*{re.escape(required_path)}[^"]*"',
-        html_text,
-        re.I,
-    ) is not None
+    return _canonical_re(required_path).search(html_text) is not None
 
 
 def _slice_boursier_listing(html_text: str, required_path: str | None = None) -> str:
     # Restrict to the listing block to avoid cross-section contamination.
     if required_path and not _has_required_path(html_text, required_path):
         return ""
-    match = re.search(
-        r'<div[^>]*id="listing"[^>]*>.*?<div[^>]*class="items"[^>]*>(.*?)</div>\s*<nav class="pagination"',
-        html_text,
-        re.S,
-    )
+    match = _BOURSIER_LISTING_RE.search(html_text)
     if match:
         return match.group(1)
     return html_text
 
 
-def _fetch_boursier_html(page_url: str, required_path: str | None, use_firecrawl_fallback: bool) -> str:
-    html_text = _fetch_html_text(page_url)
+def _fetch_boursier_html(
+    page_url: str,
+    required_path: str | None,
+    use_firecrawl_fallback: bool,
+) -> Tuple[str, str | None, bool]:
+    # (html, url du GET conditionnel d'origine ou None si Firecrawl, not_modified)
+    html_text, not_modified = _fetch_html_page(page_url)
+    source_url: str | None = page_url
     if not html_text and use_firecrawl_fallback and fetch_url_html:
+        source_url = None
         try:
             html_text = fetch_url_html(page_url) or ""
         except Exception:
@@ -190,56 +379,63 @@ def _fetch_boursier_html(page_url: str, required_path: str | None, use_firecrawl
     if required_path and required_path not in html_text:
         alt_url = page_url.rstrip("/") if page_url.endswith("/") else f"{page_url}/"
         if alt_url != page_url:
-            alt_html = _fetch_html_text(alt_url)
+            alt_html, alt_not_modified = _fetch_html_page(alt_url)
+            alt_source: str | None = alt_url
             if not alt_html and use_firecrawl_fallback and fetch_url_html:
+                alt_source = None
                 try:
                     alt_html = fetch_url_html(alt_url) or ""
                 except Exception:
                     alt_html = ""
             if required_path in alt_html:
-                html_text = alt_html
-    return html_text
+                return alt_html, alt_source, alt_not_modified
+    return html_text, source_url, not_modified
 
-def fetch_dom_items(
-    page_url: str,
+
+def _clean_title(title_html: str) -> str:
+    # Strip HTML tags from the title.
+    if "<" in title_html:
+        title_html = _TAG_RE.sub("", title_html)
+    return unescape(title_html).strip()
+
+
+def _absolute_url(href: str, base_url: str) -> str:
+    url = href.strip()
+    if url.startswith("/"):
+        url = f"{base_url}{url}"
+    return url
+
+
+def _extract_listing(
+    records: Iterable[ListingRecord],
+    parse_dt: Callable[[Mapping[str, Optional[str]], datetime], datetime | None],
     max_items: int,
     mode: str,
     hours_window: int,
+    require_dt: bool = False,
+    seen: set | None = None,
 ) -> List[Dict[str, str]]:
-    # Fetch the "TOUT" list directly from the HTML DOM (no JS required).
-    html_text = _fetch_html_text(page_url)
-    if not html_text:
-        return []
-
-    # Narrow HTML to the news list block to reduce noise.
-    wrapper_match = re.search(r'<div class="wrapper-news-list">(.*?)<div class="pagination">', html_text, re.S)
-    content = wrapper_match.group(1) if wrapper_match else html_text
-
+    """
+    Boucle commune des extracteurs DOM sur les items bruts de la page
+    (voir _listing_records), arrêt dès `max_items` atteint.
+    `parse_dt(groups, now)` lit la date depuis les groupes nommés du motif.
+    """
     items: List[Dict[str, str]] = []
-    seen = set()
-    # Extract time + href + title from each ".item".
-    pattern = re.compile(
-        r'<div class="item">.*?<div class="meta-date">\s*([^<]+)\s*</div>.*?<a\s+[^>]*href="([^"]+)"[^>]*>(.*?)</a>',
-        re.S,
-    )
-
-    for time_text, href, title_html in pattern.findall(content):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://www.tradingsat.com{url}"
-        if url in seen:
+    seen = set() if seen is None else seen
+    # Une seule horloge par page (au lieu de datetime.now() par item)
+    now = datetime.now()
+    for url, title_html, groups in records:
+        if not url or url in seen:
             continue
         seen.add(url)
 
-        # Strip HTML tags from the title.
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
+        title = _clean_title(title_html)
 
         # Apply time window filter.
-        label_dt = _parse_time_label(time_text.strip())
-        if not _within_window(label_dt, mode, hours_window):
+        label_dt = parse_dt(groups, now)
+        if label_dt is None and require_dt:
+            continue
+        if not _within_window(label_dt, mode, hours_window, now):
             continue
 
         items.append({
@@ -249,22 +445,112 @@ def fetch_dom_items(
         })
         if len(items) >= max_items:
             break
+    return items
 
+
+def _append_links(
+    links: Iterable[Tuple[str, str]],
+    keep: Callable[[str], bool],
+    seen: set,
+    items: List[Dict[str, str]],
+    max_items: int,
+) -> List[Dict[str, str]]:
+    # Fallbacks sans date (liens bruts / markdown Firecrawl) : (url, titre) déjà nettoyés.
+    for url, title in links:
+        if not url or not keep(url) or url in seen:
+            continue
+        seen.add(url)
+        if not title:
+            continue
+        items.append({
+            "url": url,
+            "title": title,
+            "label_dt": "",
+        })
+        if len(items) >= max_items:
+            break
     return items
 
 
-def _parse_relative_time(text: str) -> datetime | None:
-    match = re.search(r"il y a\s+(\d+)\s+(minute|minutes|heure|heures|jour|jours)", text, re.I)
+def _markdown_links(markdown: str, pattern: "re.Pattern[str]") -> Iterable[Tuple[str, str]]:
+    return ((match.group(2).strip(), match.group(1).strip()) for match in pattern.finditer(markdown))
+
+
+def _firecrawl_markdown(page_url: str, use_firecrawl_fallback: bool) -> str:
+    if not (use_firecrawl_fallback and fetch_url_text):
+        return ""
+    try:
+        return fetch_url_text(page_url) or ""
+    except Exception:
+        return ""
+
+
+def _iso_or_label_dt(record: Mapping[str, Optional[str]], now: datetime) -> datetime | None:
+    # Boursier : attribut datetime ISO, sinon libellé ("11h44", "12/01/2026"…).
+    datetime_attr = record["dt"]
+    if datetime_attr:
+        try:
+            return datetime.fromisoformat(datetime_attr.strip())
+        except Exception:
+            pass
+    time_text = record["label"]
+    if time_text:
+        return _parse_time_label(time_text.strip(), now)
+    return None
+
+
+def fetch_dom_items(
+    page_url: str,
+    max_items: int,
+    mode: str,
+    hours_window: int,
+) -> List[Dict[str, str]]:
+    # Fetch the "TOUT" list directly from the HTML DOM (no JS required).
+    html_text, not_modified = _fetch_html_page(page_url)
+    if not html_text:
+        return []
+
+    def _content() -> str:
+        # Narrow HTML to the news list block to reduce noise.
+        wrapper_match = _BFM_WRAPPER_RE.search(html_text)
+        return wrapper_match.group(1) if wrapper_match else html_text
+
+    # Extract time + href + title from each ".item".
+    return _extract_listing(
+        _listing_records(page_url, not_modified, _BFM_ITEM_RE, _content, "https://www.tradingsat.com"),
+        lambda record, now: _parse_time_label(record["label"].strip(), now),
+        max_items,
+        mode,
+        hours_window,
+    )
+
+
+def _parse_relative_time(text: str, now: datetime | None = None) -> datetime | None:
+    match = _RELATIVE_TIME_RE.search(text)
     if not match:
         return None
     value = int(match.group(1))
     unit = match.group(2).lower()
+    now = now or datetime.now()
     if "minute" in unit:
-        return datetime.now() - timedelta(minutes=value)
+        return now - timedelta(minutes=value)
     if "heure" in unit:
-        return datetime.now() - timedelta(hours=value)
+        return now - timedelta(hours=value)
     if "jour" in unit:
-        return datetime.now() - timedelta(days=value)
+        return now - timedelta(days=value)
+    return None
+
+
+def _beincrypto_dt(record: Mapping[str, Optional[str]], now: datetime) -> datetime | None:
+    datetime_attr = record["dt"]
+    if datetime_attr:
+        try:
+            return datetime.fromisoformat(datetime_attr.replace("Z", "+00:00")).replace(tzinfo=None)
+        except Exception:
+            pass
+    time_text = record["label"]
+    if time_text:
+        return _parse_relative_time(time_text.strip(), now)
     return None
 
 
@@ -275,8 +561,10 @@ def fetch_beincrypto_dom_items(
     hours_window: int,
     use_firecrawl_fallback: bool = False,
 ) -> List[Dict[str, str]]:
-    html_text = _fetch_html_text(page_url)
+    html_text, not_modified = _fetch_html_page(page_url)
+    source_url: str | None = page_url
     if not html_text and use_firecrawl_fallback and fetch_url_html:
+        source_url = None
         try:
             html_text = fetch_url_html(page_url) or ""
         except Exception:
@@ -284,141 +572,48 @@ def fetch_beincrypto_dom_items(
     if not html_text:
         return []
 
-    items: List[Dict[str, str]] = []
-    seen = set()
+    base_url = "https://fr.beincrypto.com"
+    seen: set = set()
 
-    block_match = re.search(
-        r"Les dernières nouvelles.*?<div class=\"ant-card-body\">(.*?)</div>\s*</div>",
-        html_text,
-        re.S,
-    )
-    content = block_match.group(1) if block_match else html_text
+    def _content() -> str:
+        block_match = _BEIN_BLOCK_RE.search(html_text)
+        return block_match.group(1) if block_match else html_text
 
-    pattern = re.compile(
-        r'<a[^>]+class="ArticleCardSmall[^"]*"[^>]+href="([^"]+)"[^>]*>.*?'
-        r'<time[^>]+datetime="([^"]+)"[^>]*>(.*?)</time>.*?'
-        r'<div[^>]+data-testid="main-element"[^>]*>(.*?)</div>',
-        re.S,
+    items = _extract_listing(
+        _listing_records(source_url, not_modified, _BEIN_ITEM_RE, _content, base_url),
+        _beincrypto_dt, max_items, mode, hours_window, seen=seen,
     )
-
-    for href, datetime_attr, time_text, title_html in pattern.findall(content):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://fr.beincrypto.com{url}"
-        if url in seen:
-            continue
-        seen.add(url)
-
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
-
-        label_dt = None
-        if datetime_attr:
-            try:
-                label_dt = datetime.fromisoformat(datetime_attr.replace("Z", "+00:00")).replace(tzinfo=None)
-            except Exception:
-                label_dt = None
-        if label_dt is None and time_text:
-            label_dt = _parse_relative_time(time_text.strip())
-
-        if not _within_window(label_dt, mode, hours_window):
-            continue
-
-        items.append({
-            "url": url,
-            "title": title,
-            "label_dt": label_dt.isoformat() if label_dt else "",
-        })
-        if len(items) >= max_items:
-            break
-
     if items:
         return items
 
-    fallback_pattern = re.compile(
-        r'<a[^>]+href="([^"]+)"[^>]*>(.*?)</a>',
-        re.S,
+    anchors = (
+        (url, _clean_title(title_html))
+        for url, title_html, _ in _listing_records(source_url, not_modified, _ANCHOR_RE, _content, base_url)
     )
-    for href, title_html in fallback_pattern.findall(content):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://fr.beincrypto.com{url}"
-        if "/news/" not in url:
-            continue
-        if url in seen:
-            continue
-        seen.add(url)
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
-        if not title:
-            continue
-        items.append({
-            "url": url,
-            "title": title,
-            "label_dt": "",
-        })
-        if len(items) >= max_items:
-            break
-
+    items = _append_links(anchors, lambda url: "/news/" in url, seen, items, max_items)
     if items:
         return items
 
-    if use_firecrawl_fallback and fetch_url_text:
-        try:
-            markdown = fetch_url_text(page_url)
-        except Exception:
-            markdown = ""
-        if markdown:
-            link_pattern = re.compile(r"\[([^\]]+)\]\((https?://fr\.beincrypto\.com/[^)]+)\)")
-            for title_text, href in link_pattern.findall(markdown):
-                url = href.strip()
-                if "/news/" not in url:
-                    continue
-                if url in seen:
-                    continue
-                seen.add(url)
-                title = title_text.strip()
-                if not title:
-                    continue
-                items.append({
-                    "url": url,
-                    "title": title,
-                    "label_dt": "",
-                })
-                if len(items) >= max_items:
-                    break
-
+    markdown = _firecrawl_markdown(page_url, use_firecrawl_fallback)
+    if markdown:
+        _append_links(
+            _markdown_links(markdown, _BEIN_MD_LINK_RE), lambda url: "/news/" in url, seen, items, max_items,
+        )
     return items
 
 
-def _parse_boursedirect_datetime(day_text: str, month_year_text: str, time_text: str) -> datetime | None:
+def _parse_boursedirect_datetime(
+    day_text: str,
+    month_year_text: str,
+    time_text: str,
+    now: datetime | None = None,
+) -> datetime | None:
     month_year = month_year_text.strip().split()
     if len(month_year) < 1:
         return None
     month_name = month_year[0].lower()
-    year = int(month_year[1]) if len(month_year) > 1 and month_year[1].isdigit() else datetime.now().year
-    months = {
-        "janvier": 1,
-        "février": 2,
-        "fevrier": 2,
-        "mars": 3,
-        "avril": 4,
-        "mai": 5,
-        "juin": 6,
-        "juillet": 7,
-        "août": 8,
-        "aout": 8,
-        "septembre": 9,
-        "octobre": 10,
-        "novembre": 11,
-        "décembre": 12,
-        "decembre": 12,
-    }
-    month = months.get(month_name)
+    year = int(month_year[1]) if len(month_year) > 1 and month_year[1].isdigit() else (now or datetime.now()).year
+    month = _MONTHS.get(month_name)
     if not month:
         return None
     try:
@@ -427,7 +622,7 @@ def _parse_boursedirect_datetime(day_text: str, month_year_text: str, time_text:
         return None
     hour, minute = 0, 0
     if time_text:
-        time_match = re.search(r"(\d{1,2}):(\d{2})", time_text)
+        time_match = _CLOCK_RE.search(time_text)
         if time_match:
             hour = int(time_match.group(1))
             minute = int(time_match.group(2))
@@ -440,48 +635,58 @@ def fetch_boursedirect_dom_items(
     mode: str,
     hours_window: int,
 ) -> List[Dict[str, str]]:
-    html_text = _fetch_html_text(page_url)
+    html_text, not_modified = _fetch_html_page(page_url)
     if not html_text:
         return []
 
-    items: List[Dict[str, str]] = []
-    seen = set()
-
-    pattern = re.compile(
-        r'<div class="timeline-item[^"]*">.*?'
-        r'<div class="timeline-date-left[^"]*">([^<]+)</div>.*?'
-        r'<span class="publishDay">(\d{1,2})</span>.*?'
-        r'<span class="text-muted">([^<]+)</span>.*?'
-        r'<a href="([^"]+)">.*?'
-        r'<h2 class="timeline-title[^"]*">(.*?)</h2>',
-        re.S,
+    return _extract_listing(
+        _listing_records(
+            page_url, not_modified, _BOURSEDIRECT_ITEM_RE, lambda: html_text, "https://www.boursedirect.fr",
+        ),
+        lambda record, now: _parse_boursedirect_datetime(
+            record["day"], record["month_year"], record["time"], now
+        ),
+        max_items,
+        mode,
+        hours_window,
     )
 
-    for time_text, day_text, month_year_text, href, title_html in pattern.findall(html_text):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://www.boursedirect.fr{url}"
-        if url in seen:
-            continue
-        seen.add(url)
-
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
 
-        label_dt = _parse_boursedirect_datetime(day_text, month_year_text, time_text)
-        if not _within_window(label_dt, mode, hours_window):
-            continue
-
-        items.append({
-            "url": url,
-            "title": title,
-            "label_dt": label_dt.isoformat() if label_dt else "",
-        })
-        if len(items) >= max_items:
-            break
+def _fetch_boursier_listing_items(
+    page_url: str,
+    required_path: str,
+    pattern: "re.Pattern[str]",
+    keep_markdown_url: Callable[[str], bool],
+    max_items: int,
+    mode: str,
+    hours_window: int,
+    use_firecrawl_fallback: bool,
+) -> List[Dict[str, str]]:
+    # Listing Boursier (bloc #listing), puis fallback markdown Firecrawl.
+    html_text, source_url, not_modified = _fetch_boursier_html(page_url, required_path, use_firecrawl_fallback)
+    seen: set = set()
+
+    items = _extract_listing(
+        _listing_records(
+            source_url,
+            not_modified,
+            pattern,
+            lambda: _slice_boursier_listing(html_text, required_path),
+            "https://www.boursier.com",
+        ),
+        _iso_or_label_dt,
+        max_items,
+        mode,
+        hours_window,
+        require_dt=True,
+        seen=seen,
+    )
+    if items:
+        return items
 
+    markdown = _firecrawl_markdown(page_url, use_firecrawl_fallback)
+    if markdown:
+        _append_links(_markdown_links(markdown, _BOURSIER_MD_LINK_RE), keep_markdown_url, seen, items, max_items)
     return items
 
 
@@ -492,87 +697,17 @@ def fetch_boursier_dom_items(
     hours_window: int,
     use_firecrawl_fallback: bool = False,
 ) -> List[Dict[str, str]]:
-    html_text = _fetch_boursier_html(page_url, "/actualites/economie/", use_firecrawl_fallback)
-
-    items: List[Dict[str, str]] = []
-    seen = set()
-
-    content = _slice_boursier_listing(html_text, "/actualites/economie/")
-
-    pattern = re.compile(
-        r'<article[^>]*class="[^"]*item[^"]*"[^>]*>.*?'
-        r'<h2[^>]*>\s*<a[^>]+href="([^"]+)"[^>]*>(.*?)</a>\s*</h2>.*?'
-        r'<time[^>]+class="date"[^>]+datetime="([^"]+)"[^>]*>([^<]*)</time>',
-        re.S,
+    return _fetch_boursier_listing_items(
+        page_url,
+        "/actualites/economie/",
+        _BOURSIER_ECONOMIE_ITEM_RE,
+        lambda url: "/actualites/economie/" in url or "/actions/actualites/economie/" in url,
+        max_items,
+        mode,
+        hours_window,
+        use_firecrawl_fallback,
     )
 
-    for href, title_html, datetime_attr, time_text in pattern.findall(content):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://www.boursier.com{url}"
-        if url in seen:
-            continue
-        seen.add(url)
-
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
-
-        label_dt = None
-        if datetime_attr:
-            try:
-                label_dt = datetime.fromisoformat(datetime_attr.strip())
-            except Exception:
-                label_dt = None
-        if label_dt is None and time_text:
-            label_dt = _parse_time_label(time_text.strip())
-
-        if label_dt is None:
-            continue
-        if not _within_window(label_dt, mode, hours_window):
-            continue
-
-        items.append({
-            "url": url,
-            "title": title,
-            "label_dt": label_dt.isoformat() if label_dt else "",
-        })
-        if len(items) >= max_items:
-            break
-
-    if items:
-        return items
-
-    if use_firecrawl_fallback and fetch_url_text:
-        try:
-            markdown = fetch_url_text(page_url)
-        except Exception:
-            markdown = ""
-        if markdown:
-            link_pattern = re.compile(r"\[([^\]]+)\]\((https?://www\.boursier\.com/[^)]+)\)")
-            for title_text, href in link_pattern.findall(markdown):
-                url = href.strip()
-                if "/actualites/economie/" not in url and "/actions/actualites/economie/" not in url:
-                    continue
-                if url in seen:
-                    continue
-                seen.add(url)
-                title = title_text.strip()
-                if not title:
-                    continue
-                items.append({
-                    "url": url,
-                    "title": title,
-                    "label_dt": "",
-                })
-                if len(items) >= max_items:
-                    break
-            if items:
-                return items
-
-    return items
-
 
 def fetch_boursier_macroeconomie_dom_items(
     page_url: str,
@@ -581,87 +716,17 @@ def fetch_boursier_macroeconomie_dom_items(
     hours_window: int,
     use_firecrawl_fallback: bool = False,
 ) -> List[Dict[str, str]]:
-    html_text = _fetch_boursier_html(page_url, "/actualites/macroeconomie/", use_firecrawl_fallback)
-
-    items: List[Dict[str, str]] = []
-    seen = set()
-
-    content = _slice_boursier_listing(html_text, "/actualites/macroeconomie/")
-
-    pattern = re.compile(
-        r'<div class="item[^"]*">.*?'
-        r'<time[^>]+class="date"[^>]+datetime="([^"]+)".*?>([^<]*)</time>.*?'
-        r'<a href="([^"]+)".*?>(.*?)</a>',
-        re.S,
+    return _fetch_boursier_listing_items(
+        page_url,
+        "/actualites/macroeconomie/",
+        _BOURSIER_ITEM_RE,
+        lambda url: "/actualites/macroeconomie/" in url or "/actions/actualites/macroeconomie/" in url,
+        max_items,
+        mode,
+        hours_window,
+        use_firecrawl_fallback,
     )
 
-    for datetime_attr, time_text, href, title_html in pattern.findall(content):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://www.boursier.com{url}"
-        if url in seen:
-            continue
-        seen.add(url)
-
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
-
-        label_dt = None
-        if datetime_attr:
-            try:
-                label_dt = datetime.fromisoformat(datetime_attr.strip())
-            except Exception:
-                label_dt = None
-        if label_dt is None and time_text:
-            label_dt = _parse_time_label(time_text.strip())
-
-        if label_dt is None:
-            continue
-        if not _within_window(label_dt, mode, hours_window):
-            continue
-
-        items.append({
-            "url": url,
-            "title": title,
-            "label_dt": label_dt.isoformat() if label_dt else "",
-        })
-        if len(items) >= max_items:
-            break
-
-    if items:
-        return items
-
-    if use_firecrawl_fallback and fetch_url_text:
-        try:
-            markdown = fetch_url_text(page_url)
-        except Exception:
-            markdown = ""
-        if markdown:
-            link_pattern = re.compile(r"\[([^\]]+)\]\((https?://www\.boursier\.com/[^)]+)\)")
-            for title_text, href in link_pattern.findall(markdown):
-                url = href.strip()
-                if "/actualites/macroeconomie/" not in url and "/actions/actualites/macroeconomie/" not in url:
-                    continue
-                if url in seen:
-                    continue
-                seen.add(url)
-                title = title_text.strip()
-                if not title:
-                    continue
-                items.append({
-                    "url": url,
-                    "title": title,
-                    "label_dt": "",
-                })
-                if len(items) >= max_items:
-                    break
-            if items:
-                return items
-
-    return items
-
 
 def fetch_boursier_france_dom_items(
     page_url: str,
@@ -670,87 +735,19 @@ def fetch_boursier_france_dom_items(
     hours_window: int,
     use_firecrawl_fallback: bool = False,
 ) -> List[Dict[str, str]]:
-    html_text = _fetch_boursier_html(page_url, "/actualites/france/", use_firecrawl_fallback)
-
-    items: List[Dict[str, str]] = []
-    seen = set()
-
-    content = _slice_boursier_listing(html_text, "/actualites/france/")
-
-    pattern = re.compile(
-        r'<div class="item[^"]*">.*?'
-        r'<time[^>]+class="date"[^>]+datetime="([^"]+)".*?>([^<]*)</time>.*?'
-        r'<a href="([^"]+)".*?>(.*?)</a>',
-        re.S,
+    return _fetch_boursier_listing_items(
+        page_url,
+        "/actualites/france/",
+        _BOURSIER_ITEM_RE,
+        lambda url: (
+            "/actualites/france/" in url or "/actions/actualites/" in url or "/indices/actualites/" in url
+        ),
+        max_items,
+        mode,
+        hours_window,
+        use_firecrawl_fallback,
     )
 
-    for datetime_attr, time_text, href, title_html in pattern.findall(content):
-        url = href.strip()
-        if not url:
-            continue
-        if url.startswith("/"):
-            url = f"https://www.boursier.com{url}"
-        if url in seen:
-            continue
-        seen.add(url)
-
-        title = re.sub(r"<.*?>", "", title_html)
-        title = unescape(title).strip()
-
-        label_dt = None
-        if datetime_attr:
-            try:
-                label_dt = datetime.fromisoformat(datetime_attr.strip())
-            except Exception:
-                label_dt = None
-        if label_dt is None and time_text:
-            label_dt = _parse_time_label(time_text.strip())
-
-        if label_dt is None:
-            continue
-        if not _within_window(label_dt, mode, hours_window):
-            continue
-
-        items.append({
-            "url": url,
-            "title": title,
-            "label_dt": label_dt.isoformat() if label_dt else "",
-        })
-        if len(items) >= max_items:
-            break
-
-    if items:
-        return items
-
-    if use_firecrawl_fallback and fetch_url_text:
-        try:
-            markdown = fetch_url_text(page_url)
-        except Exception:
-            markdown = ""
-        if markdown:
-            link_pattern = re.compile(r"\[([^\]]+)\]\((https?://www\.boursier\.com/[^)]+)\)")
-            for title_text, href in link_pattern.findall(markdown):
-                url = href.strip()
-                if "/actualites/france/" not in url and "/actions/actualites/" not in url and "/indices/actualites/" not in url:
-                    continue
-                if url in seen:
-                    continue
-                seen.add(url)
-                title = title_text.strip()
-                if not title:
-                    continue
-                items.append({
-                    "url": url,
-                    "title": title,
-                    "label_dt": "",
-                })
-                if len(items) >= max_items:
-                    break
-            if items:
-                return items
-
-    return items
-
 
 def merge_article_items(
     primary: List[Dict[str, str]],
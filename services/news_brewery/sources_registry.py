@@ -1,6 +1,14 @@
-from typing import Optional, Tuple, List, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, Optional, Tuple, List, Dict
 
 from front.components.news_source import NewsSourceConfig
+from services.hand_brewery.firecrawl_async import (
+    DEFAULT_TIMEOUT_SEC as FIRECRAWL_TIMEOUT_SEC,
+    HTTP_TIMEOUT_MARGIN_SEC as FIRECRAWL_HTTP_MARGIN_SEC,
+    set_scrape_deadline,
+)
 from services.news_brewery.bfm_bourse_job import JobConfig, get_bfm_job
 from services.news_brewery.beincrypto_job import JobConfig as BeInJobConfig, get_beincrypto_job
 from services.news_brewery.boursedirect_job import JobConfig as BourseDirectJobConfig, get_boursedirect_job
@@ -142,10 +150,55 @@ def get_news_sources() -> list[NewsSourceConfig]:
     ]
 
 
+# GET direct de la page liste (20 s max) puis une tentative Firecrawl complète
+# (timeout de scrape + marge HTTP) : le fallback a le temps d'aboutir.
+# Les nouvelles tentatives Firecrawl ne partent pas après l'échéance.
+MEGA_DOM_FETCH_TIMEOUT_SEC = 20
+MEGA_SOURCE_TIMEOUT_SEC = MEGA_DOM_FETCH_TIMEOUT_SEC + FIRECRAWL_TIMEOUT_SEC + FIRECRAWL_HTTP_MARGIN_SEC
+
+
+def _fetch_source_dom(
+    source: NewsSourceConfig,
+    max_items: int,
+    mega_hours: int,
+    deadline: Optional[float] = None,
+) -> List[Dict[str, str]]:
+    # Thread abandonné au timeout : plus de scrape Firecrawl après l'échéance
+    set_scrape_deadline(deadline)
+    try:
+        return _fetch_source_dom_items(source, max_items, mega_hours)
+    finally:
+        set_scrape_deadline(None)
+
+
+def _fetch_source_dom_items(source: NewsSourceConfig, max_items: int, mega_hours: int) -> List[Dict[str, str]]:
+    dom_kwargs = {
+        "page_url": source.entry_url,
+        "max_items": max_items,
+        "mode": "last_hours",
+        "hours_window": mega_hours,
+    }
+    if source.supports_firecrawl:
+        try:
+            dom_kwargs["use_firecrawl_fallback"] = True
+            return source.fetch_dom_items(**dom_kwargs)
+        except TypeError:
+            dom_kwargs.pop("use_firecrawl_fallback", None)
+    return source.fetch_dom_items(**dom_kwargs)
+
+
 def collect_mega_urls(
     mega_hours: int = 20,
     source_keys: Optional[list[str]] = None,
+    timeout_sec: float = MEGA_SOURCE_TIMEOUT_SEC,
+    progress_cb: Optional[Callable[[Dict[str, object]], None]] = None,
 ) -> Tuple[List[Dict[str, str]], List[Dict[str, object]]]:
+    """
+    Collecte les URLs de toutes les sources en parallèle (RSS + DOM de chaque
+    source lancés en même temps). Les résultats sont fusionnés dans l'ordre
+    des sources, au fil de l'eau ; une source qui dépasse `timeout_sec` est
+    marquée en erreur sans bloquer les autres.
+    """
     results: list[dict] = []
     seen = set()
     status_entries: list[dict] = []
@@ -155,13 +208,16 @@ def collect_mega_urls(
         return not source_keys or source_key in source_keys
 
     def _record(source_key: str, source_label: str, status: str, count: int = 0, message: str = "") -> None:
-        status_entries.append({
+        entry = {
             "source_key": source_key,
             "source_label": source_label,
             "status": status,
             "count": count,
             "message": message,
-        })
+        }
+        status_entries.append(entry)
+        if progress_cb:
+            progress_cb(entry)
 
     def _add(source_key: str, source_label: str, items: list[dict]) -> None:
         if source_keys and source_key not in source_keys:
@@ -179,47 +235,59 @@ def collect_mega_urls(
                 "label_dt": item.get("label_dt", ""),
             })
 
-    for source in sources:
-        if not _should_run(source.key):
-            continue
+    selected = [source for source in sources if _should_run(source.key)]
+    if not selected:
+        return results, status_entries
 
-        try:
-            max_items = int(source.default_max_total)
-            rss_feed = source.rss_feed_url
-            mode = "last_hours"
-
-            rss_items = source.fetch_rss_items(
-                feed_url=rss_feed,
-                max_items=max_items,
-                mode=mode,
-                hours_window=mega_hours,
-                ignore_time_filter=False,
-            )
-
-            if source.supports_dom_fallback:
-                dom_kwargs = {
-                    "page_url": source.entry_url,
-                    "max_items": max_items,
-                    "mode": mode,
-                    "hours_window": mega_hours,
-                }
-                if source.supports_firecrawl:
+    # Un thread par fetch (RSS + DOM éventuel) : aucune tâche ne patiente en file,
+    # l'échéance commune part donc bien du démarrage effectif de chaque source
+    task_count = sum(2 if source.supports_dom_fallback else 1 for source in selected)
+    executor = ThreadPoolExecutor(max_workers=task_count)
+    deadline = time.monotonic() + timeout_sec
+    pending = []
+    for source in selected:
+        max_items = int(source.default_max_total)
+        rss_future = executor.submit(
+            source.fetch_rss_items,
+            feed_url=source.rss_feed_url,
+            max_items=max_items,
+            mode="last_hours",
+            hours_window=mega_hours,
+            ignore_time_filter=False,
+        )
+        dom_future = (
+            executor.submit(_fetch_source_dom, source, max_items, mega_hours, deadline)
+            if source.supports_dom_fallback
+            else None
+        )
+        pending.append((source, max_items, rss_future, dom_future))
+
+    # Toutes les tâches démarrent au submit : l'échéance est commune
+    try:
+        for source, max_items, rss_future, dom_future in pending:
+            try:
+                rss_items = rss_future.result(timeout=max(0.0, deadline - time.monotonic()))
+                message = ""
+                if dom_future is not None:
                     try:
-                        dom_kwargs["use_firecrawl_fallback"] = True
-                        dom_items = source.fetch_dom_items(**dom_kwargs)
-                    except TypeError:
-                        dom_kwargs.pop("use_firecrawl_fallback", None)
-                        dom_items = source.fetch_dom_items(**dom_kwargs)
+                        dom_items = dom_future.result(timeout=max(0.0, deadline - time.monotonic()))
+                        items = merge_article_items(dom_items, rss_items, max_items)
+                    except FutureTimeout:
+                        # DOM trop lent : on garde au moins le RSS
+                        items = rss_items
+                        message = f"DOM timeout ({timeout_sec:.0f}s), RSS seul"
+                        print(f"⚠️ {source.label} : {message}")
                 else:
-                    dom_items = source.fetch_dom_items(**dom_kwargs)
-
-                items = merge_article_items(dom_items, rss_items, max_items)
-            else:
-                items = rss_items
+                    items = rss_items
 
-            _add(source.key, source.label, items)
-            _record(source.key, source.label, "ok", len(items))
-        except Exception as exc:
-            _record(source.key, source.label, "error", message=str(exc))
+                _add(source.key, source.label, items)
+                _record(source.key, source.label, "ok", len(items), message)
+            except FutureTimeout:
+                _record(source.key, source.label, "error", message=f"Timeout ({timeout_sec:.0f}s)")
+            except Exception as exc:
+                _record(source.key, source.label, "error", message=str(exc))
+    finally:
+        # Ne pas attendre les fetchs abandonnés (timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return results, status_entries
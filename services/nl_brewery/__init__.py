@@ -1,4 +1,10 @@
-from services.nl_brewery.imap_client import check_connection, fetch_emails
+from services.nl_brewery.imap_client import (
+    check_connection,
+    fetch_emails,
+    fetch_email_headers,
+    fetch_email_headers_since,
+    fetch_email_bodies,
+)
 from services.nl_brewery.process_newsletter import process_newsletter
 from services.nl_brewery.nl_brewery_service import (
     check_gmail_connection,
@@ -7,3 +13,17 @@ from services.nl_brewery.nl_brewery_service import (
     add_recipient,
     remove_recipient,
 )
+
+__all__ = [
+    "check_connection",
+    "fetch_emails",
+    "fetch_email_headers",
+    "fetch_email_headers_since",
+    "fetch_email_bodies",
+    "process_newsletter",
+    "check_gmail_connection",
+    "fetch_and_process_newsletters",
+    "load_recipients",
+    "add_recipient",
+    "remove_recipient",
+]
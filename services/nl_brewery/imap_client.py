@@ -1,5 +1,7 @@
 import imaplib
 import email
+import re
+from concurrent.futures import ThreadPoolExecutor
 from email.header import decode_header
 from email.utils import parsedate_to_datetime, parseaddr
 from datetime import datetime, timedelta, timezone
@@ -10,6 +12,15 @@ import streamlit as st
 
 IMAP_HOST = "imap.gmail.com"
 IMAP_PORT = 993
+MAILBOX = "INBOX"
+
+# Fetch en deux temps : en-têtes groupés, puis corps des seuls emails retenus
+HEADER_QUERY = "(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM TO DATE MESSAGE-ID)])"
+HEADER_BATCH_SIZE = 200
+BODY_BATCH_SIZE = 10
+MAX_CONNECTIONS = 3
+
+_UID_RE = re.compile(rb"UID (\d+)")
 
 
 class _HTMLStripper(HTMLParser):
@@ -113,67 +124,209 @@ def _extract_body(message: email.message.Message) -> Dict[str, str]:
     }
 
 
-def fetch_emails(last_hours: int, max_emails: Optional[int] = None) -> List[Dict[str, str]]:
-    if last_hours <= 0:
-        return []
+def _connect(user: str, password: str, mailbox: str = MAILBOX) -> imaplib.IMAP4_SSL:
+    client = imaplib.IMAP4_SSL(IMAP_HOST, IMAP_PORT)
+    client.login(user, password)
+    client.select(mailbox)
+    return client
 
-    user, password = _get_imap_credentials()
-    now_utc = datetime.now(timezone.utc)
-    cutoff = now_utc - timedelta(hours=last_hours)
-    since_date = cutoff.strftime("%d-%b-%Y")
 
+def _logout(client: imaplib.IMAP4_SSL) -> None:
     try:
-        client = imaplib.IMAP4_SSL(IMAP_HOST, IMAP_PORT)
-        client.login(user, password)
-        client.select("INBOX")
+        client.logout()
+    except Exception:
+        pass
 
-        status, data = client.search(None, f'(SINCE "{since_date}")')
-        if status != "OK":
-            client.logout()
-            return []
 
-        message_ids = data[0].split()
-        if max_emails and max_emails > 0:
-            message_ids = message_ids[-max_emails:]
-        emails = []
+def _fetch_parts(client: imaplib.IMAP4_SSL, uids: List[bytes], query: str) -> Dict[bytes, bytes]:
+    """
+    UID FETCH groupé : retourne {uid: octets} pour la partie demandée.
+    """
+    status, msg_data = client.uid("FETCH", b",".join(uids), query)
+    if status != "OK" or not msg_data:
+        return {}
+    parts: Dict[bytes, bytes] = {}
+    for entry in msg_data:
+        if not isinstance(entry, tuple) or len(entry) < 2:
+            continue
+        uid_match = _UID_RE.search(entry[0])
+        if uid_match and entry[1]:
+            parts[uid_match.group(1)] = entry[1]
+    return parts
 
-        for msg_id in message_ids:
-            status, msg_data = client.fetch(msg_id, "(RFC822)")
-            if status != "OK" or not msg_data:
-                continue
-            raw_bytes = msg_data[0][1]
-            if not raw_bytes:
-                continue
-            msg = email.message_from_bytes(raw_bytes)
 
-            subject = _decode_header_value(msg.get("Subject"))
-            sender = parseaddr(_decode_header_value(msg.get("From")))[1]
-            to_value = _decode_header_value(msg.get("To"))
-            date_raw = msg.get("Date")
-            message_id = _decode_header_value(msg.get("Message-ID"))
+def _chunks(values: List[bytes], size: int) -> List[List[bytes]]:
+    return [values[i:i + size] for i in range(0, len(values), size)]
 
-            parsed_date = parsedate_to_datetime(date_raw) if date_raw else None
-            if parsed_date is None:
-                continue
-            if parsed_date.tzinfo is None:
-                parsed_date = parsed_date.replace(tzinfo=timezone.utc)
 
-            if parsed_date < cutoff:
-                continue
+def fetch_email_headers(last_hours: int, max_emails: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Étape 1 (légère) : en-têtes seulement (BODY.PEEK, ne marque pas lu)
+    des emails de la fenêtre. Chaque dict porte son "uid" IMAP.
+    """
+    return fetch_email_headers_since(last_hours, max_emails=max_emails)["headers"]
+
+
+def _uidvalidity(client: imaplib.IMAP4_SSL) -> Optional[int]:
+    _, data = client.response("UIDVALIDITY")
+    try:
+        return int(data[0]) if data and data[0] else None
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_email_headers_since(
+    last_hours: int,
+    last_uid: int = 0,
+    uidvalidity: Optional[int] = None,
+    max_emails: Optional[int] = None,
+    mailbox: str = MAILBOX,
+) -> Dict[str, object]:
+    """
+    Variante incrémentale de fetch_email_headers : seuls les UID > last_uid
+    de la fenêtre sont lus, tant que UIDVALIDITY n'a pas changé (sinon
+    les UID ne sont plus comparables → fenêtre complète, reset=True).
+    Avec max_emails, ce sont les UID les plus anciens qui sont lus (aucun sauté).
+    Retourne {"headers", "uidvalidity", "last_uid" (plus grand UID lu), "reset"}.
+    """
+    result: Dict[str, object] = {"headers": [], "uidvalidity": uidvalidity, "last_uid": last_uid, "reset": False}
+    if last_hours <= 0:
+        return result
 
-            bodies = _extract_body(msg)
+    user, password = _get_imap_credentials()
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=last_hours)
+    since_date = cutoff.strftime("%d-%b-%Y")
 
-            emails.append({
-                "subject": subject,
-                "sender": sender,
-                "to": to_value,
-                "date": parsed_date.astimezone(timezone.utc).isoformat(),
-                "body_html": bodies["body_html"],
-                "body_text": bodies["body_text"],
-                "message_id": message_id,
-            })
+    try:
+        client = _connect(user, password, mailbox)
+        try:
+            current_validity = _uidvalidity(client)
+            if uidvalidity is not None and current_validity != uidvalidity:
+                last_uid = 0
+                result["reset"] = True
+            result["uidvalidity"] = current_validity
+            result["last_uid"] = last_uid
+
+            criteria = f'(SINCE "{since_date}")'
+            if last_uid > 0:
+                criteria = f'(UID {last_uid + 1}:* SINCE "{since_date}")'
+            status, data = client.uid("SEARCH", None, criteria)
+            if status != "OK" or not data or not data[0]:
+                return result
+
+            # "UID n:*" renvoie toujours le dernier message, même si son UID <= last_uid
+            uids = [uid for uid in data[0].split() if int(uid) > last_uid]
+            if not uids:
+                return result
+            if max_emails and max_emails > 0:
+                # Les plus anciens d'abord : le curseur avance par paliers,
+                # les UIDs au-delà de max_emails seront lus au prochain appel
+                uids = sorted(uids, key=int)[:max_emails]
+            result["last_uid"] = max(int(uid) for uid in uids)
+
+            raw_headers: Dict[bytes, bytes] = {}
+            for batch in _chunks(uids, HEADER_BATCH_SIZE):
+                raw_headers.update(_fetch_parts(client, batch, HEADER_QUERY))
+        finally:
+            _logout(client)
+    except Exception as exc:
+        raise RuntimeError(f"Erreur IMAP : {exc}") from exc
 
-        client.logout()
-        return emails
+    headers = []
+    for uid in uids:
+        raw = raw_headers.get(uid)
+        if not raw:
+            continue
+        msg = email.message_from_bytes(raw)
+        date_raw = msg.get("Date")
+        try:
+            parsed_date = parsedate_to_datetime(date_raw) if date_raw else None
+        except (TypeError, ValueError):
+            parsed_date = None
+        if parsed_date is None:
+            continue
+        if parsed_date.tzinfo is None:
+            parsed_date = parsed_date.replace(tzinfo=timezone.utc)
+        if parsed_date < cutoff:
+            continue
+
+        headers.append({
+            "uid": uid.decode(),
+            "subject": _decode_header_value(msg.get("Subject")),
+            "sender": parseaddr(_decode_header_value(msg.get("From")))[1],
+            "to": _decode_header_value(msg.get("To")),
+            "date": parsed_date.astimezone(timezone.utc).isoformat(),
+            "message_id": _decode_header_value(msg.get("Message-ID")),
+        })
+    result["headers"] = headers
+    return result
+
+
+def _fetch_bodies_worker(user: str, password: str, mailbox: str, uids: List[bytes]) -> Dict[bytes, bytes]:
+    client = _connect(user, password, mailbox)
+    try:
+        raw_messages: Dict[bytes, bytes] = {}
+        for batch in _chunks(uids, BODY_BATCH_SIZE):
+            raw_messages.update(_fetch_parts(client, batch, "(RFC822)"))
+        return raw_messages
+    finally:
+        _logout(client)
+
+
+def fetch_email_bodies(
+    headers: List[Dict[str, str]],
+    max_connections: int = MAX_CONNECTIONS,
+    mailbox: str = MAILBOX,
+) -> List[Dict[str, str]]:
+    """
+    Étape 2 : télécharge le corps des seuls emails retenus (dicts issus de
+    fetch_email_headers), réparti sur un petit pool de connexions IMAP.
+    mailbox = celle des en-têtes (les UID n'ont de sens que dans leur mailbox).
+    L'ordre des en-têtes est conservé.
+    """
+    uids = [h["uid"].encode() for h in headers if h.get("uid")]
+    if not uids:
+        return []
+
+    user, password = _get_imap_credentials()
+    workers = max(1, min(int(max_connections or 1), len(uids)))
+    # Répartition en tranches contiguës : une connexion par tranche
+    slice_size = -(-len(uids) // workers)
+    raw_messages: Dict[bytes, bytes] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_fetch_bodies_worker, user, password, mailbox, chunk)
+                for chunk in _chunks(uids, slice_size)
+            ]
+            for future in futures:
+                raw_messages.update(future.result())
     except Exception as exc:
         raise RuntimeError(f"Erreur IMAP : {exc}") from exc
+
+    emails = []
+    for header in headers:
+        raw_bytes = raw_messages.get((header.get("uid") or "").encode())
+        if not raw_bytes:
+            continue
+        bodies = _extract_body(email.message_from_bytes(raw_bytes))
+        emails.append({
+            "subject": header.get("subject", ""),
+            "sender": header.get("sender", ""),
+            "to": header.get("to", ""),
+            "date": header.get("date", ""),
+            "body_html": bodies["body_html"],
+            "body_text": bodies["body_text"],
+            "message_id": header.get("message_id", ""),
+            "uid": header.get("uid", ""),
+        })
+    return emails
+
+
+def fetch_emails(last_hours: int, max_emails: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Tous les emails de la fenêtre (en-têtes puis corps).
+    Pour ne télécharger que les emails utiles, filtrer le résultat de
+    fetch_email_headers puis appeler fetch_email_bodies.
+    """
+    return fetch_email_bodies(fetch_email_headers(last_hours, max_emails=max_emails))
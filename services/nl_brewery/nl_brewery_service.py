@@ -1,7 +1,15 @@
 from typing import List, Dict, Set, Tuple, Optional, Callable
 from db.supabase_client import get_supabase
 import time
-from services.nl_brewery.imap_client import check_connection, fetch_emails
+from concurrent.futures import ThreadPoolExecutor
+from services.nl_brewery.imap_client import (
+    check_connection,
+    MAILBOX,
+    fetch_email_bodies,
+    fetch_email_headers,
+    fetch_email_headers_since,
+)
+from services.nl_brewery.sync_state import NlSyncState, get_nl_sync_state
 import tempfile
 from services.nl_brewery.process_newsletter import (
     process_newsletter,
@@ -16,6 +24,8 @@ from services.raw_storage.raw_news_service import (
 
 
 TABLE_RECIPIENTS = "nl_recipients"
+# Newsletters traitées en parallèle (chacune = clean + structure + jsonfy)
+NL_MAX_WORKERS = 4
 
 
 def load_recipients() -> List[str]:
@@ -82,23 +92,138 @@ def _dedupe_key(email_data: Dict[str, str]) -> Tuple[str, str, str]:
     )
 
 
+def _message_key(email_data: Dict[str, str]) -> str:
+    # Message-ID, sinon empreinte expéditeur / sujet / date
+    message_id = (email_data.get("message_id") or "").strip()
+    if message_id:
+        return message_id
+    return "|".join([
+        email_data.get("sender", "") or "",
+        email_data.get("subject", "") or "",
+        email_data.get("date", "") or "",
+    ])
+
+
+def _select_eligible(
+    headers: List[Dict[str, str]],
+    recipients: List[str],
+    skip_keys: Optional[Set[str]] = None,
+) -> List[Dict[str, str]]:
+    unique_keys: Set[Tuple[str, str, str]] = set()
+    eligible = []
+    for header in headers:
+        if not _match_recipient(header.get("to", ""), recipients):
+            continue
+        key = _dedupe_key(header)
+        if key in unique_keys:
+            continue
+        unique_keys.add(key)
+        if skip_keys and _message_key(header) in skip_keys:
+            continue
+        eligible.append(header)
+    return eligible
+
+
+def _fetch_eligible_emails(
+    last_hours: int,
+    max_emails: Optional[int],
+    recipients: List[str],
+) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Fetch en deux temps : filtre destinataire + dédoublonnage sur les seuls
+    en-têtes, puis téléchargement des corps des emails retenus.
+    Retourne (emails éligibles avec corps, nombre d'emails de la fenêtre).
+    """
+    headers = fetch_email_headers(last_hours, max_emails=max_emails)
+    return fetch_email_bodies(_select_eligible(headers, recipients)), len(headers)
+
+
+def _fetch_new_emails(
+    last_hours: int,
+    max_emails: Optional[int],
+    recipients: List[str],
+    sync: NlSyncState,
+) -> Tuple[List[Dict[str, str]], int, Dict[str, object]]:
+    """
+    Variante incrémentale : UID > dernier UID vu (curseur persistant), puis
+    exclusion des Message-ID déjà traités. Retourne (emails, nombre d'emails
+    lus, curseur à valider via _commit_sync).
+    """
+    cursor = sync.get_cursor(MAILBOX) or {}
+    fetched = fetch_email_headers_since(
+        last_hours,
+        last_uid=int(cursor.get("last_uid") or 0),
+        uidvalidity=cursor.get("uidvalidity"),
+        max_emails=max_emails,
+        mailbox=MAILBOX,
+    )
+    headers = fetched["headers"]
+    done = sync.processed_keys(_message_key(h) for h in headers)
+    eligible = _select_eligible(headers, recipients, skip_keys=done)
+    next_cursor = {
+        "mailbox": MAILBOX,
+        "uidvalidity": fetched["uidvalidity"],
+        "last_uid": fetched["last_uid"],
+        "already_processed": len(done),
+    }
+    return fetch_email_bodies(eligible, mailbox=MAILBOX), len(headers), next_cursor
+
+
+def _mark_processed(sync: Optional[NlSyncState], email_data: Dict[str, str], created: int) -> None:
+    if sync is None:
+        return
+    uid = email_data.get("uid")
+    try:
+        sync.mark_processed(_message_key(email_data), MAILBOX, int(uid) if uid else None, created)
+    except Exception as exc:
+        print(f"⚠️ NL sync state: marquage impossible ({exc})")
+
+
+def _commit_cursor(
+    sync: Optional[NlSyncState],
+    cursor: Optional[Dict[str, object]],
+    failed_uids: List[int],
+) -> None:
+    """
+    Avance le curseur UID. En cas d'échec, il s'arrête juste avant le
+    premier UID en échec (relu au prochain run ; les Message-ID déjà
+    traités sont ignorés).
+    """
+    if sync is None or cursor is None:
+        return
+    try:
+        last_uid = int(cursor["last_uid"] or 0)
+        if failed_uids:
+            last_uid = min(last_uid, min(failed_uids) - 1)
+        sync.set_cursor(str(cursor["mailbox"]), cursor["uidvalidity"], last_uid)
+    except Exception as exc:
+        print(f"⚠️ NL sync state: mise à jour impossible ({exc})")
+
+
+def _process_one(email_data: Dict[str, str]) -> Dict[str, object]:
+    # Exécuté dans le pool : pipeline LLM complet d'une newsletter
+    step_start = time.time()
+    body_text = (email_data.get("body_text") or "").strip()
+    if not body_text:
+        result = {"status": "empty"}
+    else:
+        try:
+            result = process_newsletter(email_data)
+        except Exception as exc:
+            result = {"status": "error", "message": str(exc), "items": []}
+    result["elapsed"] = time.time() - step_start
+    return result
+
+
 def fetch_and_process_newsletters(last_hours: int, max_emails: Optional[int] = None) -> Dict[str, object]:
     recipients = load_recipients()
-    emails = fetch_emails(last_hours, max_emails=max_emails)
+    emails, email_count = _fetch_eligible_emails(last_hours, max_emails, recipients)
 
-    unique_keys: Set[Tuple[str, str, str]] = set()
     items = []
     errors = []
     raw_texts = []
 
     for email_data in emails:
-        if not _match_recipient(email_data.get("to", ""), recipients):
-            continue
-        key = _dedupe_key(email_data)
-        if key in unique_keys:
-            continue
-        unique_keys.add(key)
-
         body_text = (email_data.get("body_text") or "").strip()
         if body_text:
             raw_texts.append(
@@ -123,7 +248,7 @@ def fetch_and_process_newsletters(last_hours: int, max_emails: Optional[int] = N
 
     return {
         "status": "success",
-        "email_count": len(emails),
+        "email_count": email_count,
         "raw_preview": "\n\n".join(raw_texts),
         "items": items,
         "errors": errors,
@@ -132,20 +257,13 @@ def fetch_and_process_newsletters(last_hours: int, max_emails: Optional[int] = N
 
 def fetch_raw_newsletters(last_hours: int, max_emails: Optional[int] = None) -> Dict[str, object]:
     recipients = load_recipients()
-    emails = fetch_emails(last_hours, max_emails=max_emails)
+    emails, email_count = _fetch_eligible_emails(last_hours, max_emails, recipients)
 
-    unique_keys: Set[Tuple[str, str, str]] = set()
     raw_texts = []
     errors = []
     matched_count = 0
 
     for email_data in emails:
-        if not _match_recipient(email_data.get("to", ""), recipients):
-            continue
-        key = _dedupe_key(email_data)
-        if key in unique_keys:
-            continue
-        unique_keys.add(key)
         matched_count += 1
 
         body_text = (email_data.get("body_text") or "").strip()
@@ -161,7 +279,7 @@ def fetch_raw_newsletters(last_hours: int, max_emails: Optional[int] = None) ->
 
     return {
         "status": "success",
-        "email_count": len(emails),
+        "email_count": email_count,
         "matched_count": matched_count,
         "raw_preview": "\n\n".join(raw_texts),
         "errors": errors,
@@ -286,22 +404,15 @@ def run_jsonfy(text_value: str) -> Dict[str, object]:
 
 def build_temp_newsletters(last_hours: int, max_emails: Optional[int] = None) -> Dict[str, object]:
     recipients = load_recipients()
-    emails = fetch_emails(last_hours, max_emails=max_emails)
+    emails, email_count = _fetch_eligible_emails(last_hours, max_emails, recipients)
 
-    unique_keys: Set[Tuple[str, str, str]] = set()
     blocks = []
     errors = []
     matched_count = 0
     status_log = []
-    total = len(emails)
+    total = email_count
 
     for email_data in emails:
-        if not _match_recipient(email_data.get("to", ""), recipients):
-            continue
-        key = _dedupe_key(email_data)
-        if key in unique_keys:
-            continue
-        unique_keys.add(key)
         matched_count += 1
         status_log.append(f"NL {matched_count}/{total} · démarrage")
 
@@ -337,7 +448,7 @@ def build_temp_newsletters(last_hours: int, max_emails: Optional[int] = None) ->
 
     return {
         "status": "success",
-        "email_count": len(emails),
+        "email_count": email_count,
         "matched_count": matched_count,
         "temp_path": temp_path,
         "temp_text": temp_text,
@@ -350,21 +461,25 @@ def run_full_nl_brewery(
     last_hours: int,
     max_emails: Optional[int] = None,
     progress_cb: Optional[Callable[[Dict[str, object]], None]] = None,
+    incremental: bool = True,
+    max_workers: int = NL_MAX_WORKERS,
 ) -> Dict[str, object]:
+    """
+    incremental=True : seuls les emails arrivés depuis le dernier run
+    (curseur UID) et jamais traités (index Message-ID) passent au LLM.
+    Les newsletters sont traitées en parallèle (max_workers, budget LLM
+    "openai" partagé) ; chacune est insérée en base dès qu'elle est prête,
+    dans l'ordre des emails (commit ordonné).
+    """
     start_time = time.time()
     recipients = load_recipients()
-    emails = fetch_emails(last_hours, max_emails=max_emails)
-
-    unique_keys: Set[Tuple[str, str, str]] = set()
-    eligible_emails = []
-    for email_data in emails:
-        if not _match_recipient(email_data.get("to", ""), recipients):
-            continue
-        key = _dedupe_key(email_data)
-        if key in unique_keys:
-            continue
-        unique_keys.add(key)
-        eligible_emails.append(email_data)
+    sync = get_nl_sync_state() if incremental else None
+    cursor: Optional[Dict[str, object]] = None
+    if sync is not None:
+        eligible_emails, email_count, cursor = _fetch_new_emails(last_hours, max_emails, recipients, sync)
+    else:
+        eligible_emails, email_count = _fetch_eligible_emails(last_hours, max_emails, recipients)
+    already_processed = int(cursor.get("already_processed", 0)) if cursor else 0
 
     total = len(eligible_emails)
     if progress_cb:
@@ -376,85 +491,115 @@ def run_full_nl_brewery(
             "message": f"{total} newsletter(s) à traiter",
         })
 
-    items = []
+    created_total = 0
+    inserted = 0
+    insert_error = ""
     errors = []
-    timings = []
-
-    for idx, email_data in enumerate(eligible_emails, start=1):
-        step_start = time.time()
-        if progress_cb:
-            progress_cb({
-                "stage": "processing",
-                "current": idx,
-                "total": total,
-                "progress": (idx - 1) / total if total else 0,
-                "message": f"NL {idx}/{total} · traitement en cours",
-            })
-
-        body_text = (email_data.get("body_text") or "").strip()
-        if not body_text:
-            errors.append("Newsletter vide détectée.")
-            continue
+    failed_uids: List[int] = []
+
+    workers = max(1, min(int(max_workers or 1), total or 1))
+    process_start = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_process_one, email_data) for email_data in eligible_emails]
+
+        # Les callbacks restent dans le thread appelant (Streamlit), dans l'ordre.
+        for idx, (email_data, future) in enumerate(zip(eligible_emails, futures), start=1):
+            if progress_cb:
+                progress_cb({
+                    "stage": "processing",
+                    "current": idx,
+                    "total": total,
+                    "progress": (idx - 1) / total if total else 0,
+                    "message": f"NL {idx}/{total} · traitement en cours",
+                })
+
+            result = future.result()
+            if result.get("status") == "empty":
+                errors.append("Newsletter vide détectée.")
+                _mark_processed(sync, email_data, 0)
+                continue
+            if result.get("status") != "success":
+                errors.append(result.get("message", "Erreur newsletter"))
+                if email_data.get("uid"):
+                    failed_uids.append(int(email_data["uid"]))
+                continue
 
-        result = process_newsletter(email_data)
-        if result.get("status") != "success":
-            errors.append(result.get("message", "Erreur newsletter"))
-            continue
+            items = []
+            for item in result.get("items", []):
+                if not isinstance(item, dict):
+                    continue
+                item["source_name"] = "Newsletter"
+                item["source_link"] = email_data.get("sender")
+                item["source_date"] = email_data.get("date")
+                item["source_raw"] = None
+                items.append(item)
+            created = len(items)
+            created_total += created
+
+            if items:
+                insert_result = insert_raw_news(enrich_raw_items(
+                    items,
+                    flow="nl_brewery",
+                    source_type="newsletter",
+                    source_raw=None,
+                ))
+                if insert_result.get("status") != "success":
+                    insert_error = insert_result.get("message", "Erreur insertion DB")
+                    errors.append(insert_error)
+                    if email_data.get("uid"):
+                        failed_uids.append(int(email_data["uid"]))
+                    continue
+                inserted += insert_result.get("inserted", 0)
+            _mark_processed(sync, email_data, created)
+
+            # Débit réel du pool (temps mur / newsletter terminée)
+            avg_sec = (time.time() - process_start) / idx
+            eta_sec = avg_sec * (total - idx)
+
+            if progress_cb:
+                progress_cb({
+                    "stage": "processed",
+                    "current": idx,
+                    "total": total,
+                    "progress": idx / total if total else 1,
+                    "avg_sec": avg_sec,
+                    "eta_sec": eta_sec,
+                    "message": f"NL {idx}/{total} · OK ({created} item(s))",
+                })
+
+    _commit_cursor(sync, cursor, failed_uids)
+    duration = time.time() - start_time
 
-        created = 0
-        for item in result.get("items", []):
-            if not isinstance(item, dict):
-                continue
-            item["source_name"] = "Newsletter"
-            item["source_link"] = email_data.get("sender")
-            item["source_date"] = email_data.get("date")
-            item["source_raw"] = None
-            items.append(item)
-            created += 1
-
-        elapsed = time.time() - step_start
-        timings.append(elapsed)
-        avg_sec = sum(timings) / len(timings)
-        eta_sec = avg_sec * (total - idx)
-
-        if progress_cb:
-            progress_cb({
-                "stage": "processed",
-                "current": idx,
-                "total": total,
-                "progress": idx / total if total else 1,
-                "avg_sec": avg_sec,
-                "eta_sec": eta_sec,
-                "message": f"NL {idx}/{total} · OK ({created} item(s))",
-            })
-
-    if not items:
-        duration = time.time() - start_time
+    if not created_total:
+        if sync is not None and total == 0:
+            return {
+                "status": "success",
+                "message": "Aucune nouvelle newsletter",
+                "email_count": email_count,
+                "matched_count": 0,
+                "already_processed": already_processed,
+                "inserted": 0,
+                "errors": errors,
+                "duration_sec": duration,
+            }
         return {
             "status": "error",
             "message": "Aucun item généré.",
-            "email_count": len(emails),
+            "email_count": email_count,
             "matched_count": total,
+            "already_processed": already_processed,
             "inserted": 0,
             "errors": errors,
             "duration_sec": duration,
         }
 
-    enriched_items = enrich_raw_items(
-        items,
-        flow="nl_brewery",
-        source_type="newsletter",
-        source_raw=None,
-    )
-    insert_result = insert_raw_news(enriched_items)
-    duration = time.time() - start_time
-
-    if insert_result.get("status") != "success":
+    if not inserted and insert_error:
         return {
             "status": "error",
-            "message": insert_result.get("message", "Erreur insertion DB"),
-            "email_count": len(emails),
+            "message": insert_error,
+            "email_count": email_count,
             "matched_count": total,
+            "already_processed": already_processed,
             "inserted": 0,
             "errors": errors,
             "duration_sec": duration,
@@ -463,9 +608,10 @@ def run_full_nl_brewery(
     return {
         "status": "success",
         "message": "NL Brewery terminé",
-        "email_count": len(emails),
+        "email_count": email_count,
         "matched_count": total,
-        "inserted": insert_result.get("inserted", 0),
+        "already_processed": already_processed,
+        "inserted": inserted,
         "errors": errors,
         "duration_sec": duration,
     }
@@ -1,4 +1,3 @@
-import json
 import streamlit as st
 from openai import OpenAI
 from typing import Dict, List
@@ -6,6 +5,9 @@ from prompts.nl_brewery.clean_raw import PROMPT_CLEAN_RAW
 from prompts.nl_brewery.structure import PROMPT_STRUCTURE
 from prompts.nl_brewery.jsonfy import PROMPT_JSONFY
 from prompts.nl_brewery.json_secure import PROMPT_JSON_SECURE
+from services.utils.json_items import is_valid_items, secure_items
+from services.utils.llm_cache import cached_chat_completion, is_text_reply
+from services.utils.rate_limiter import get_rate_limiter
 
 
 REQUEST_TIMEOUT = 45
@@ -13,16 +15,19 @@ client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
 
 
 def _run_text_prompt(prompt: str, content: str, temperature: float = 0.2) -> str:
-    response = client.chat.completions.create(
+    return cached_chat_completion(
+        client,
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": prompt},
             {"role": "user", "content": content}
         ],
         temperature=temperature,
-        timeout=REQUEST_TIMEOUT
+        timeout=REQUEST_TIMEOUT,
+        validate=is_text_reply,
+        # Budget "openai" partagé (newsletters traitées en parallèle)
+        rate_limiter=get_rate_limiter("openai")
     )
-    return response.choices[0].message.content or ""
 
 
 def clean_raw_text(raw_text: str) -> Dict[str, object]:
@@ -53,7 +58,8 @@ def jsonfy_text(structured_output: str) -> Dict[str, object]:
     if not structured_output or not structured_output.strip():
         return {"status": "error", "message": "Texte structuré vide", "items": []}
     try:
-        response_jsonfy = client.chat.completions.create(
+        raw_json = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": PROMPT_JSONFY},
@@ -61,23 +67,29 @@ def jsonfy_text(structured_output: str) -> Dict[str, object]:
             ],
             temperature=0,
             response_format={"type": "json_object"},
-            timeout=REQUEST_TIMEOUT
+            validate=is_valid_items,
+            timeout=REQUEST_TIMEOUT,
+            rate_limiter=get_rate_limiter("openai")
         )
-        raw_json = response_jsonfy.choices[0].message.content or ""
 
-        response_secure = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": PROMPT_JSON_SECURE},
-                {"role": "user", "content": raw_json}
-            ],
-            temperature=0,
-            response_format={"type": "json_object"},
-            timeout=REQUEST_TIMEOUT
+        items = secure_items(
+            raw_json,
+            # Escalade LLM seulement si la validation locale échoue
+            lambda content: cached_chat_completion(
+                client,
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": PROMPT_JSON_SECURE},
+                    {"role": "user", "content": content}
+                ],
+                temperature=0,
+                response_format={"type": "json_object"},
+                validate=is_valid_items,
+                timeout=REQUEST_TIMEOUT,
+                rate_limiter=get_rate_limiter("openai")
+            )
         )
-        secure_json = response_secure.choices[0].message.content or ""
-        data = json.loads(secure_json)
-        return {"status": "success", "items": data.get("items", [])}
+        return {"status": "success", "items": items}
     except Exception as exc:
         return {"status": "error", "message": str(exc), "items": []}
 
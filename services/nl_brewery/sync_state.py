@@ -0,0 +1,113 @@
+"""
+===========================================
+📬 NL SYNC STATE
+===========================================
+État de synchronisation IMAP persistant (SQLite)
+- Par mailbox : UIDVALIDITY + dernier UID vu → on ne lit que les nouveaux emails
+- Index des newsletters déjà traitées (clé = Message-ID) → pas de retraitement LLM
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from services.utils.llm_cache import CACHE_DIR
+
+
+NL_SYNC_PATH = os.path.join(CACHE_DIR, "nl_sync.sqlite3")
+
+
+class NlSyncState:
+    """
+    Store SQLite du curseur IMAP et des Message-ID traités.
+    Thread-safe (une connexion + un lock).
+    """
+
+    def __init__(self, path: str = NL_SYNC_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS mailbox_state ("
+            " mailbox TEXT PRIMARY KEY,"
+            " uidvalidity INTEGER,"
+            " last_uid INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_messages ("
+            " message_key TEXT PRIMARY KEY,"
+            " mailbox TEXT NOT NULL,"
+            " uid INTEGER,"
+            " items INTEGER NOT NULL DEFAULT 0,"
+            " processed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_cursor(self, mailbox: str) -> Optional[Dict[str, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uidvalidity, last_uid FROM mailbox_state WHERE mailbox = ?",
+                (mailbox,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"uidvalidity": row[0], "last_uid": int(row[1])}
+
+    def set_cursor(self, mailbox: str, uidvalidity: Optional[int], last_uid: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mailbox_state (mailbox, uidvalidity, last_uid, updated_at)"
+                " VALUES (?, ?, ?, ?)",
+                (mailbox, uidvalidity, int(last_uid), time.time()),
+            )
+            self._conn.commit()
+
+    def processed_keys(self, keys: Iterable[str]) -> set:
+        keys = list({key for key in keys if key})
+        found = set()
+        with self._lock:
+            # Limite SQLite ~999 paramètres par requête
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT message_key FROM processed_messages WHERE message_key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def mark_processed(self, key: str, mailbox: str, uid: Optional[int], items: int = 0) -> None:
+        if not key:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO processed_messages (message_key, mailbox, uid, items, processed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, mailbox, uid, int(items), time.time()),
+            )
+            self._conn.commit()
+
+
+_state: Optional[NlSyncState] = None
+_state_lock = threading.Lock()
+
+
+def get_nl_sync_state() -> Optional[NlSyncState]:
+    """
+    État partagé par process (None si le disque n'est pas utilisable).
+    """
+    global _state
+    with _state_lock:
+        if _state is None:
+            try:
+                _state = NlSyncState()
+            except Exception as exc:
+                print(f"⚠️ NL sync state indisponible: {exc}")
+                return None
+        return _state
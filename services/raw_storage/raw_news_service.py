@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime, date
 from typing import Optional
-import streamlit as st
-from supabase import create_client, Client
+from supabase import Client
+
+from db.supabase_client import get_supabase
 
 
 # ======================================================
@@ -10,10 +11,7 @@ from supabase import create_client, Client
 # ======================================================
 
 def get_supabase_client() -> Client:
-    return create_client(
-        st.secrets["SUPABASE_URL"],
-        st.secrets["SUPABASE_SERVICE_KEY"]
-    )
+    return get_supabase()
 
 
 # ======================================================
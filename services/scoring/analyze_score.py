@@ -1,16 +1,19 @@
 import json
 import streamlit as st
 from openai import OpenAI
-from typing import Dict
+from typing import Dict, List
 from prompts.theministry.score.score_eco_geopol import PROMPT_SCORE_ECO_GEOPOL
 from prompts.theministry.score.score_indices import PROMPT_SCORE_INDICES
 from prompts.theministry.score.score_pea import PROMPT_SCORE_PEA
 from prompts.theministry.score.score_action import PROMPT_SCORE_ACTION
 from prompts.theministry.score.score_commodites import PROMPT_SCORE_COMMODITES
 from prompts.theministry.score.score_crypto import PROMPT_SCORE_CRYPTO
+from prompts.theministry.score.score_batch import PROMPT_SCORE_BATCH_MODE
+from services.utils.rate_limiter import get_rate_limiter
 
 
 REQUEST_TIMEOUT = 60
+BATCH_REQUEST_TIMEOUT = 120
 MAX_RETRIES = 2
 
 
@@ -38,6 +41,28 @@ def get_prompt_by_label(labels: str) -> str:
     return prompts_map.get(labels, PROMPT_SCORE_ECO_GEOPOL)
 
 
+def build_score_input(
+    title: str,
+    content: str,
+    tags: str = None,
+    labels: str = None,
+    entities: str = None,
+    source_type: str = None
+) -> str:
+    """
+    Construit l'input utilisateur d'un item (titre, contenu + contexte).
+    """
+    return f"""TITRE: {title}
+
+CONTENU: {content}
+
+TAG: {tags or "Non renseigné"}
+LABEL: {labels or "Non renseigné"}
+ENTITIES: {entities or "Non renseigné"}
+SOURCE: {source_type or "Non renseigné"}
+"""
+
+
 def analyze_score(
     title: str,
     content: str,
@@ -90,15 +115,7 @@ def analyze_score(
     print(f"[DEBUG analyze_score] Prompt sélectionné: {prompt[:100]}...")
     
     # Construire l'input pour l'IA avec contexte
-    user_input = f"""TITRE: {title}
-
-CONTENU: {content}
-
-TAG: {tags or "Non renseigné"}
-LABEL: {labels or "Non renseigné"}
-ENTITIES: {entities or "Non renseigné"}
-SOURCE: {source_type or "Non renseigné"}
-"""
+    user_input = build_score_input(title, content, tags, labels, entities, source_type)
     
     print(f"[DEBUG analyze_score] Appel OpenAI pour: {title[:50]}...")
     
@@ -106,6 +123,7 @@ SOURCE: {source_type or "Non renseigné"}
         # Retry logic pour gérer les timeouts
         for attempt in range(MAX_RETRIES):
             try:
+                get_rate_limiter("openai").acquire()
                 response = client.chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[
@@ -178,3 +196,120 @@ SOURCE: {source_type or "Non renseigné"}
             "message": error_msg,
             "score": None
         }
+
+
+def _is_valid_score(score: object) -> bool:
+    return isinstance(score, int) and not isinstance(score, bool) and 0 <= score <= 100
+
+
+def analyze_scores_batch(items: List[Dict], labels: str = None) -> Dict[str, Dict[str, object]]:
+    """
+    Score plusieurs items partageant le même label en un seul appel JSON.
+    
+    Args:
+        items: Liste d'items (id, title, content, tags, labels, entities, source_type)
+        labels: Label commun (sélectionne le prompt)
+    
+    Returns:
+        {item_id: {"status": "success" | "error", "score": int | None, "message": str}}
+        Les items absents ou invalides dans la réponse sont en "error"
+        (à re-scorer individuellement par l'appelant).
+    """
+    
+    results: Dict[str, Dict[str, object]] = {}
+    local_ids: Dict[str, str] = {}
+    blocks = []
+    
+    for item in items:
+        item_id = item.get("id")
+        if not item.get("title") or not item.get("content"):
+            results[item_id] = {
+                "status": "error",
+                "message": "Titre ou contenu manquant",
+                "score": None
+            }
+            continue
+        # Ids courts dans le prompt (moins de tokens, pas d'UUID à recopier)
+        local_id = str(len(local_ids) + 1)
+        local_ids[local_id] = item_id
+        blocks.append(f"### ITEM {local_id}\n" + build_score_input(
+            item.get("title", ""),
+            item.get("content", ""),
+            item.get("tags"),
+            item.get("labels"),
+            item.get("entities"),
+            item.get("source_type"),
+        ))
+    
+    if not blocks:
+        return results
+    
+    def _fail(message: str) -> Dict[str, Dict[str, object]]:
+        for item_id in local_ids.values():
+            results[item_id] = {"status": "error", "message": message, "score": None}
+        return results
+    
+    try:
+        client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+    except Exception as e:
+        return _fail(f"Erreur init OpenAI: {str(e)}")
+    
+    prompt = get_prompt_by_label(labels) + PROMPT_SCORE_BATCH_MODE
+    
+    try:
+        for attempt in range(MAX_RETRIES):
+            try:
+                get_rate_limiter("openai").acquire()
+                response = client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": "\n\n".join(blocks)}
+                    ],
+                    temperature=0,
+                    response_format={"type": "json_object"},
+                    timeout=BATCH_REQUEST_TIMEOUT
+                )
+                data = json.loads(response.choices[0].message.content or "")
+                break
+            except Exception as e:
+                if attempt < MAX_RETRIES - 1:
+                    continue
+                raise e
+    except json.JSONDecodeError as e:
+        return _fail(f"Erreur JSON: {str(e)}")
+    except Exception as e:
+        error_msg = str(e)
+        if "timeout" in error_msg.lower():
+            error_msg = f"Timeout ({BATCH_REQUEST_TIMEOUT}s dépassé)"
+        return _fail(error_msg)
+    
+    entries = data.get("scores") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return _fail("Champ 'scores' manquant dans la réponse IA")
+    
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        item_id = local_ids.get(str(entry.get("id", "")).strip())
+        if not item_id or item_id in results:
+            continue
+        score = entry.get("score")
+        if _is_valid_score(score):
+            results[item_id] = {"status": "success", "score": score}
+        else:
+            results[item_id] = {
+                "status": "error",
+                "message": f"Score invalide: {score} (doit être un entier entre 0 et 100)",
+                "score": None
+            }
+    
+    for item_id in local_ids.values():
+        if item_id not in results:
+            results[item_id] = {
+                "status": "error",
+                "message": "Item absent de la réponse IA",
+                "score": None
+            }
+    
+    return results
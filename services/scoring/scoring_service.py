@@ -1,7 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from db.supabase_client import get_supabase
-from typing import List, Dict, Optional
-from services.scoring.analyze_score import analyze_score
-from services.scoring.update_score import update_item_score
+from typing import Callable, List, Dict, Optional
+from services.scoring.analyze_score import analyze_score, analyze_scores_batch, get_prompt_by_label
+from services.scoring.update_score import update_item_score, batch_update_scores
+
+
+SCORE_BATCH_SIZE = 8
+SCORE_MAX_WORKERS = 4
 
 
 def fetch_items_to_score(limit: Optional[int] = None, force_all: bool = False) -> List[Dict[str, str]]:
@@ -96,6 +101,133 @@ def score_single_item(
     }
 
 
+def _score_chunk(chunk: List[Dict], labels: Optional[str]) -> Dict[str, Dict[str, object]]:
+    """
+    Score un chunk en un appel batch, puis re-score individuellement
+    les items rejetés par la validation.
+    """
+    results = analyze_scores_batch(chunk, labels)
+    for item in chunk:
+        item_id = item.get("id")
+        if results.get(item_id, {}).get("status") == "success":
+            continue
+        results[item_id] = analyze_score(
+            item.get("title", ""),
+            item.get("content", ""),
+            item.get("tags"),
+            item.get("labels"),
+            item.get("entities"),
+            item.get("source_type"),
+        )
+    return results
+
+
+def score_items_batch(
+    items: List[Dict],
+    batch_size: int = SCORE_BATCH_SIZE,
+    max_workers: int = SCORE_MAX_WORKERS,
+    progress_cb: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, object]:
+    """
+    Score une liste d'items par groupes de `batch_size` partageant le même
+    prompt de label (un appel JSON par groupe), avec repli sur le scoring
+    unitaire pour les items invalides. Les scores sont écrits en DB par chunk.
+    
+    progress_cb (appelé depuis le thread appelant) :
+        {"stage", "current", "total", "progress", "success", "errors", "message"}
+    
+    Returns:
+        {
+            "status": "success" | "partial",
+            "total": int,
+            "success": int,
+            "errors": int,
+            "details": [{"item_id", "status", "score", "message"}, ...]
+        }
+    """
+    
+    total = len(items)
+    success_count = 0
+    error_count = 0
+    done = 0
+    details = []
+    
+    # Regrouper par prompt effectif (un label inconnu retombe sur Eco-Geopol)
+    groups: Dict[str, Dict[str, object]] = {}
+    for item in items:
+        prompt = get_prompt_by_label(item.get("labels"))
+        group = groups.setdefault(prompt, {"labels": item.get("labels"), "items": []})
+        group["items"].append(item)
+    
+    chunks = []
+    size = max(1, batch_size)
+    for group in groups.values():
+        group_items = group["items"]
+        for start in range(0, len(group_items), size):
+            chunks.append((group_items[start:start + size], group["labels"]))
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_score_chunk, chunk, labels): chunk for chunk, labels in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                results = {
+                    item.get("id"): {"status": "error", "message": str(e), "score": None}
+                    for item in chunk
+                }
+            
+            scores = {
+                item_id: result["score"]
+                for item_id, result in results.items()
+                if result.get("status") == "success"
+            }
+            updates = batch_update_scores(scores) if scores else {}
+            
+            for item in chunk:
+                item_id = item.get("id")
+                result = results.get(item_id, {"status": "error", "message": "Résultat manquant", "score": None})
+                if result.get("status") == "success":
+                    update = updates.get(item_id, {})
+                    if update.get("status") == "success":
+                        success_count += 1
+                        details.append({
+                            "item_id": item_id,
+                            "status": "success",
+                            "score": result["score"],
+                            "message": f"Score attribué: {result['score']}/100"
+                        })
+                        continue
+                    result = {
+                        "status": "error",
+                        "score": result["score"],
+                        "message": f"Score calculé ({result['score']}) mais erreur DB: {update.get('message', '')}"
+                    }
+                error_count += 1
+                details.append({"item_id": item_id, **result})
+            
+            done += len(chunk)
+            if progress_cb:
+                progress_cb({
+                    "stage": "score",
+                    "current": done,
+                    "total": total,
+                    "progress": done / total if total else 1,
+                    "success": success_count,
+                    "errors": error_count,
+                    "message": f"Score {done}/{total}",
+                })
+    
+    return {
+        "status": "success" if error_count == 0 else "partial",
+        "total": total,
+        "success": success_count,
+        "errors": error_count,
+        "details": details
+    }
+
+
 def get_scoring_stats() -> Dict[str, object]:
     """
     Récupère les statistiques de scoring.
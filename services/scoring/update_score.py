@@ -43,3 +43,47 @@ def update_item_score(item_id: str, score: int) -> Dict[str, object]:
             "status": "error",
             "message": f"Erreur DB: {str(e)}"
         }
+
+
+def batch_update_scores(scores: Dict[str, int], chunk_size: int = 100) -> Dict[str, Dict[str, object]]:
+    """
+    Met à jour plusieurs scores en regroupant les items de même score
+    (un UPDATE ... WHERE id IN (...) par valeur).
+    
+    Args:
+        scores: {item_id: score}
+        chunk_size: Nombre max d'ids par requête
+    
+    Returns:
+        {item_id: {"status": "success" | "error", "message": str}}
+    """
+    
+    results: Dict[str, Dict[str, object]] = {}
+    by_score: Dict[int, list] = {}
+    for item_id, score in scores.items():
+        by_score.setdefault(score, []).append(item_id)
+    
+    processed_at = datetime.utcnow().isoformat()
+    
+    for score, ids in by_score.items():
+        for start in range(0, len(ids), chunk_size):
+            chunk_ids = ids[start:start + chunk_size]
+            try:
+                supabase = get_supabase()
+                response = supabase.table("brew_items").update({
+                    "score_global": score,
+                    "processed_at": processed_at
+                }).in_("id", chunk_ids).execute()
+                updated_ids = {row.get("id") for row in (response.data or [])}
+                message = "Aucune donnée retournée par la DB"
+            except Exception as e:
+                updated_ids = set()
+                message = f"Erreur DB: {str(e)}"
+            
+            for item_id in chunk_ids:
+                if item_id in updated_ids:
+                    results[item_id] = {"status": "success", "message": f"Score mis à jour: {score}/100"}
+                else:
+                    results[item_id] = {"status": "error", "message": message}
+    
+    return results
@@ -0,0 +1,142 @@
+"""
+===========================================
+🧾 JSON ITEMS (validation locale)
+===========================================
+Validation / réparation locale de la sortie JSONFY {"items":[{"title","content"}]}
+- Extraction du JSON (fences markdown, texte autour)
+- Forme des items, alias de clés (titre / contenu…), champs requis non vides
+- Nettoyage des chaînes (caractères de contrôle, espaces, marqueurs markdown du titre)
+- Escalade vers PROMPT_JSON_SECURE (LLM) uniquement si la validation locale échoue
+"""
+
+import json
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+_TITLE_KEYS = ("title", "titre", "headline", "heading")
+_CONTENT_KEYS = ("content", "contenu", "paragraph", "paragraphe", "text", "texte", "body")
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_INLINE_SPACES = re.compile(r"[ \t\u00a0]+")
+_MANY_NEWLINES = re.compile(r"\n{3,}")
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+# Markdown réel uniquement : "## ", puces "- " / "* ", paires **…** / *…* (jamais un "-" nu : "-3%")
+_TITLE_HEADING = re.compile(r"^#{1,6}\s+")
+_TITLE_BULLET = re.compile(r"^[-*+]\s+")
+_TITLE_EMPHASIS = re.compile(r"(\*\*|\*)(\S(?:.*?\S)?)\1")
+
+_stats = {"local": 0, "escalated": 0}
+_stats_lock = threading.Lock()
+
+
+class JsonItemsError(ValueError):
+    pass
+
+
+def _clean_text(value: str) -> str:
+    text = _CONTROL_CHARS.sub("", value.replace("\r\n", "\n").replace("\r", "\n"))
+    lines = [_INLINE_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return _MANY_NEWLINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _clean_title(value: str) -> str:
+    title = _clean_text(value).replace("\n", " ").strip()
+    title = _TITLE_BULLET.sub("", _TITLE_HEADING.sub("", title))
+    return _TITLE_EMPHASIS.sub(r"\2", title).strip()
+
+
+def _pick(item: Dict, keys: Tuple[str, ...]) -> Optional[object]:
+    lowered = {str(k).strip().lower(): v for k, v in item.items()}
+    for key in keys:
+        if key in lowered:
+            return lowered[key]
+    return None
+
+
+def _load(raw: str) -> object:
+    text = _FENCE.sub("", (raw or "").strip())
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        pass
+    # Texte autour du JSON : on garde le plus grand bloc {...}
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise JsonItemsError("aucun objet JSON")
+    try:
+        return json.loads(text[start:end + 1], strict=False)
+    except ValueError as exc:
+        raise JsonItemsError(f"JSON invalide: {exc}")
+
+
+def validate_items(raw: str) -> List[Dict[str, str]]:
+    """
+    Valide et répare localement une sortie JSONFY.
+    Retourne la liste d'items {"title", "content"} nettoyés (items vides retirés).
+    Lève JsonItemsError si la structure est irrécupérable.
+    """
+    data = _load(raw)
+    if isinstance(data, dict):
+        items = data.get("items")
+        if items is None and len(data) == 1:
+            # {"articles": [...]} ou autre clé unique
+            items = next(iter(data.values()))
+    else:
+        items = data
+    if not isinstance(items, list):
+        raise JsonItemsError("clé 'items' absente ou non liste")
+
+    cleaned: List[Dict[str, str]] = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise JsonItemsError("item non objet")
+        title = _pick(item, _TITLE_KEYS)
+        content = _pick(item, _CONTENT_KEYS)
+        if title is None and content is None:
+            continue
+        if not isinstance(title, (str, type(None))) or not isinstance(content, (str, type(None))):
+            raise JsonItemsError("title/content non texte")
+        title = _clean_title(title or "")
+        content = _clean_text(content or "")
+        if not title or not content:
+            continue
+        cleaned.append({"title": title, "content": content})
+
+    if items and not cleaned:
+        raise JsonItemsError("aucun item valide")
+    return cleaned
+
+
+def is_valid_items(raw: str) -> bool:
+    """
+    Validateur de cache LLM : True si la sortie passe validate_items (stats non comptées).
+    """
+    try:
+        validate_items(raw)
+    except JsonItemsError:
+        return False
+    return True
+
+
+def secure_items(raw_json: str, escalate: Callable[[str], str]) -> List[Dict[str, str]]:
+    """
+    Validation locale d'abord ; en cas d'échec, `escalate(raw_json)`
+    (appel LLM PROMPT_JSON_SECURE) puis nouvelle validation de sa sortie.
+    """
+    try:
+        items = validate_items(raw_json)
+        with _stats_lock:
+            _stats["local"] += 1
+        return items
+    except JsonItemsError:
+        pass
+    with _stats_lock:
+        _stats["escalated"] += 1
+    return validate_items(escalate(raw_json))
+
+
+def get_json_items_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
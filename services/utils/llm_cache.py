@@ -0,0 +1,295 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+# Cache disque partagé par les pipelines (news / newsletters / youtube).
+# Clé = hash(model, messages, temperature, response_format) → réponse texte.
+CACHE_DIR = os.getenv("FORGE_CACHE_DIR", "/tmp/the_forge_cache")
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm_cache.sqlite3")
+LLM_CACHE_TTL_SEC = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# accessed_at des hits écrit par lots (LRU approximatif entre deux flush)
+ACCESS_FLUSH_BATCH = 64
+ACCESS_FLUSH_INTERVAL_SEC = 30
+# Débuts de réponse typiques d'un refus : jamais mis en cache
+REFUSAL_MARKERS = (
+    "je ne peux pas",
+    "je suis désolé",
+    "désolé,",
+    "i'm sorry",
+    "i am sorry",
+    "i can't",
+    "i cannot",
+    "as an ai",
+)
+
+
+class LLMCache:
+    """
+    Cache SQLite des réponses LLM : TTL, éviction LRU bornée en taille,
+    compteurs hit/miss. Thread-safe (une connexion + un lock).
+    Les accessed_at des hits sont gardés en mémoire et écrits par lots
+    (flush avant toute éviction, à la lecture des stats et à la sortie du process).
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_sec: float = LLM_CACHE_TTL_SEC,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+    ) -> None:
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._pending_access: Dict[str, float] = {}
+        self._last_flush = time.time()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict[str, str]] = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "response_format": response_format,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_sec and now - row[1] > self.ttl_sec):
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._pending_access[key] = now
+            if (
+                len(self._pending_access) >= ACCESS_FLUSH_BATCH
+                or now - self._last_flush >= ACCESS_FLUSH_INTERVAL_SEC
+            ):
+                self._flush_access_locked()
+                self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str, model: str = "") -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._pending_access.pop(key, None)
+            self._flush_access_locked()
+            self._evict_locked()
+            self._conn.commit()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_access_locked()
+            self._conn.commit()
+
+    def _flush_access_locked(self) -> None:
+        self._last_flush = time.time()
+        if not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._pending_access.items()],
+        )
+        self._pending_access.clear()
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # LRU : on supprime les moins récemment lus jusqu'à repasser sous ~90% du max
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= target:
+                break
+            to_delete.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", to_delete)
+        self.evictions += len(to_delete)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._flush_access_locked()
+            self._conn.commit()
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_access.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Cache partagé par process (None si le disque n'est pas utilisable).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LLMCache()
+            except Exception as exc:
+                print(f"⚠️ LLM cache indisponible: {exc}")
+                return None
+            atexit.register(_flush_at_exit, _cache)
+        return _cache
+
+
+def cached_chat_completion(
+    client,
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    timeout: float,
+    response_format: Optional[Dict[str, str]] = None,
+    rate_limiter=None,
+    validate: Optional[Callable[[str], bool]] = None,
+    use_cache: bool = True,
+) -> str:
+    """
+    chat.completions.create + cache disque. Retourne le contenu texte.
+    Ne sont mises en cache que les réponses complètes (finish_reason "stop"),
+    non vides, et :
+    - en mode json_object : JSON valide (+ `validate` si fourni) ;
+    - en mode texte : validées par `validate` (sans validateur, jamais en cache).
+    `use_cache=False` : ni lecture ni écriture du cache.
+    `rate_limiter` (TokenBucket) : un jeton consommé par appel réel (jamais sur un hit cache).
+    """
+    cache = get_llm_cache() if use_cache else None
+    key = LLMCache.make_key(model, messages, temperature, response_format)
+    if cache is not None:
+        try:
+            cached = cache.get(key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    kwargs = {}
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        timeout=timeout,
+        **kwargs,
+    )
+    choice = response.choices[0]
+    content = choice.message.content or ""
+
+    if cache is not None and _is_cacheable(
+        content, response_format, getattr(choice, "finish_reason", "stop"), validate
+    ):
+        try:
+            cache.set(key, content, model=model)
+        except Exception:
+            pass
+    return content
+
+
+def is_text_reply(content: str) -> bool:
+    """
+    Validateur des prompts texte (clean / structure / dédup) : réponse non vide
+    qui ne commence pas par un refus du modèle.
+    """
+    head = content.strip()[:200].lower()
+    return bool(head) and not any(marker in head for marker in REFUSAL_MARKERS)
+
+
+def _is_cacheable(
+    content: str,
+    response_format: Optional[Dict[str, str]],
+    finish_reason: Optional[str],
+    validate: Optional[Callable[[str], bool]],
+) -> bool:
+    # Réponse tronquée (length) ou filtrée : le re-run doit pouvoir réessayer
+    if finish_reason not in (None, "stop") or not content.strip():
+        return False
+    # Ne jamais figer en cache un JSON invalide (le re-run doit pouvoir réessayer)
+    if response_format and response_format.get("type") == "json_object":
+        try:
+            json.loads(content)
+        except ValueError:
+            return False
+    elif validate is None:
+        return False
+    if validate is not None:
+        try:
+            return bool(validate(content))
+        except Exception:
+            return False
+    return True
+
+
+def _flush_at_exit(cache: LLMCache) -> None:
+    try:
+        cache.flush()
+    except Exception:
+        pass
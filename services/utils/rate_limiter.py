@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import streamlit as st
+
+
+# Débits par défaut (requêtes / minute), surchargeables via secrets
+# ex: OPENAI_RPM = 500 (tier 1 gpt-4o-mini), FIRECRAWL_RPM = 100
+DEFAULT_RATES = {
+    "openai": 500,
+    "firecrawl": 100,
+    "youtube": 30,
+}
+
+# Rafale max par fournisseur (défaut : rate / 10)
+# youtube = 1 → espacement régulier (~2s) entre téléchargements de transcripts
+DEFAULT_BURSTS = {
+    "youtube": 1,
+}
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe : `rate_per_minute` jetons par minute,
+    rafale max `burst`. acquire() bloque jusqu'à disponibilité.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None) -> None:
+        self.rate_per_sec = max(float(rate_per_minute), 1.0) / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute // 10)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Consomme `tokens` jetons. Retourne le temps d'attente total (secondes).
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                else:
+                    delay = (tokens - self._tokens) / self.rate_per_sec
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Version non bloquante (boucles asyncio) : consomme et retourne 0.0
+        si possible, sinon retourne le délai à attendre avant de réessayer.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate_per_sec
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Suspend toutes les acquisitions pendant `seconds` (ex: après un 429)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
+
+
+_registry: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def _configured_rate(name: str) -> float:
+    try:
+        value = st.secrets.get(f"{name.upper()}_RPM")
+    except Exception:
+        value = None
+    try:
+        return float(value) if value else float(DEFAULT_RATES.get(name, 60))
+    except (TypeError, ValueError):
+        return float(DEFAULT_RATES.get(name, 60))
+
+
+def get_rate_limiter(name: str) -> TokenBucket:
+    """
+    Bucket partagé par process pour un fournisseur ("openai", "firecrawl"…)
+    """
+    with _registry_lock:
+        bucket = _registry.get(name)
+        if bucket is None:
+            bucket = TokenBucket(_configured_rate(name), burst=DEFAULT_BURSTS.get(name))
+            _registry[name] = bucket
+        return bucket
@@ -1,11 +1,32 @@
 from typing import Optional
 from yt_dlp import YoutubeDL
 
+from services.youtube_brewery.youtube_cache import get_youtube_cache
+
 
 def _resolve_channel_id_from_handle(handle: str) -> Optional[str]:
     """
-    Résout un @handle YouTube en channel_id via yt-dlp.
+    Résout un @handle YouTube en channel_id via yt-dlp (résultat mis en cache :
+    un channel_id ne change pas).
     """
+    cache = get_youtube_cache()
+    if cache is not None:
+        try:
+            cached = cache.get_channel_id(handle)
+        except Exception:
+            cached = None
+        if cached:
+            return cached
+    channel_id = _resolve_channel_id_live(handle)
+    if channel_id and cache is not None:
+        try:
+            cache.put_channel_id(handle, channel_id)
+        except Exception:
+            pass
+    return channel_id
+
+
+def _resolve_channel_id_live(handle: str) -> Optional[str]:
     url = f"https://www.youtube.com/@{handle}"
     ydl_opts = {
         "quiet": True,
@@ -5,6 +5,8 @@ from typing import Dict, List, Optional, Tuple
 import requests
 from yt_dlp import YoutubeDL
 
+from services.youtube_brewery.youtube_cache import get_youtube_cache, video_id_from_url
+
 
 LANG_PREFERENCES = ["en", "en-US", "en-GB", "fr", "fr-FR", "fr-CA"]
 EXT_PREFERENCES = ["vtt", "json3", "srv3", "ttml"]
@@ -85,13 +87,29 @@ def _parse_json3(payload: str) -> str:
     return " ".join(texts).strip()
 
 
-def fetch_video_transcript(video_url: str, max_retries: int = 3) -> str:
+def cached_video_transcript(video_url: str) -> Optional[str]:
+    """
+    Transcript déjà en cache local pour cette vidéo (None sinon), sans réseau.
+    """
+    video_id = video_id_from_url(video_url)
+    cache = get_youtube_cache() if video_id else None
+    if cache is None:
+        return None
+    try:
+        return cache.get_transcript(video_id) or None
+    except Exception:
+        return None
+
+
+def fetch_video_transcript(video_url: str, max_retries: int = 3, use_cache: bool = True) -> str:
     """
     Récupère le transcript d'une vidéo YouTube via yt-dlp avec retry automatique.
+    Les transcripts déjà parsés sont servis depuis le cache local (par video_id).
     
     Args:
         video_url: URL de la vidéo YouTube
         max_retries: Nombre maximum de tentatives (défaut: 3)
+        use_cache: Lire / écrire le cache local (défaut: True)
     
     Returns:
         Le transcript en texte brut
@@ -99,6 +117,23 @@ def fetch_video_transcript(video_url: str, max_retries: int = 3) -> str:
     Raises:
         RuntimeError: Si toutes les tentatives échouent
     """
+    if use_cache:
+        cached = cached_video_transcript(video_url)
+        if cached:
+            return cached
+
+    video_id = video_id_from_url(video_url)
+    cache = get_youtube_cache() if use_cache and video_id else None
+    transcript = _fetch_video_transcript_with_retries(video_url, max_retries)
+    if cache is not None:
+        try:
+            cache.put_transcript(video_id, transcript)
+        except Exception:
+            pass
+    return transcript
+
+
+def _fetch_video_transcript_with_retries(video_url: str, max_retries: int) -> str:
     last_error = None
     
     for attempt in range(max_retries):
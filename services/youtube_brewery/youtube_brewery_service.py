@@ -1,7 +1,9 @@
 from typing import Dict, List, Optional
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from services.youtube_brewery.transcript_utils import fetch_video_transcript
+from services.utils.rate_limiter import get_rate_limiter
+from services.youtube_brewery.transcript_utils import cached_video_transcript, fetch_video_transcript
 from services.youtube_brewery.process_transcript import (
     clean_raw_text,
     structure_text,
@@ -9,6 +11,12 @@ from services.youtube_brewery.process_transcript import (
 )
 
 
+# Téléchargements yt-dlp en parallèle (bornés par le bucket "youtube")
+TRANSCRIPT_WORKERS = 2
+# Vidéos en clean + structure simultanément
+LLM_WORKERS = 3
+
+
 def _format_temp_block(video: Dict[str, str], content: str) -> str:
     return (
         "=== VIDEO ===\n"
@@ -50,58 +58,89 @@ def _parse_temp_block(block: str) -> Optional[Dict[str, str]]:
     }
 
 
-def build_temp_transcripts(videos: List[Dict[str, str]]) -> Dict[str, object]:
-    blocks: List[str] = []
-    errors: List[str] = []
-    status_log: List[str] = []
+def build_temp_transcripts(
+    videos: List[Dict[str, str]],
+    transcript_workers: int = TRANSCRIPT_WORKERS,
+    llm_workers: int = LLM_WORKERS,
+) -> Dict[str, object]:
+    """
+    Pipeline : téléchargement des transcripts (bucket "youtube", ~1 toutes
+    les 2s) → clean + structure LLM en parallèle dès qu'un transcript est prêt.
+    status_log / errors / blocs restent dans l'ordre des vidéos.
+    """
     total = len(videos)
+    logs: List[List[str]] = [[] for _ in videos]
+    video_errors: List[List[str]] = [[] for _ in videos]
+    video_blocks: List[Optional[str]] = [None] * total
+    limiter = get_rate_limiter("youtube")
 
-    for idx, video in enumerate(videos, start=1):
-        title = video.get("title") or "Sans titre"
-        url = video.get("url") or ""
-        status_log.append(f"VID {idx}/{total} · démarrage · {title}")
-
-        if not url:
-            errors.append(f"URL manquante pour {title}")
-            status_log.append(f"VID {idx}/{total} · URL manquante")
-            continue
-
-        try:
-            step_start = time.time()
-            transcript = fetch_video_transcript(url, max_retries=3)
-            step_duration = time.time() - step_start
-            status_log.append(f"VID {idx}/{total} · transcript OK ({step_duration:.1f}s)")
-        except Exception as exc:
-            errors.append(f"Transcript indisponible pour {title}: {exc}")
-            status_log.append(f"VID {idx}/{total} · transcript NOK")
-            continue
-        
-        # Délai entre vidéos pour éviter le rate limiting YouTube
-        if idx < total:
-            time.sleep(2)
-
+    def _process(idx: int, video: Dict[str, str], transcript: str) -> None:
+        log = logs[idx - 1]
         step_start = time.time()
         cleaned = clean_raw_text(transcript)
         step_duration = time.time() - step_start
         if cleaned.get("status") != "success":
-            errors.append(cleaned.get("message", "Erreur clean"))
-            status_log.append(f"VID {idx}/{total} · clean NOK ({step_duration:.1f}s)")
-            continue
-        status_log.append(f"VID {idx}/{total} · clean OK ({step_duration:.1f}s)")
+            video_errors[idx - 1].append(cleaned.get("message", "Erreur clean"))
+            log.append(f"VID {idx}/{total} · clean NOK ({step_duration:.1f}s)")
+            return
+        log.append(f"VID {idx}/{total} · clean OK ({step_duration:.1f}s)")
 
         step_start = time.time()
         structured = structure_text(cleaned.get("text", ""))
         step_duration = time.time() - step_start
         if structured.get("status") != "success":
-            errors.append(structured.get("message", "Erreur structure"))
-            status_log.append(f"VID {idx}/{total} · structure NOK ({step_duration:.1f}s)")
-            continue
-        status_log.append(f"VID {idx}/{total} · structure OK ({step_duration:.1f}s)")
+            video_errors[idx - 1].append(structured.get("message", "Erreur structure"))
+            log.append(f"VID {idx}/{total} · structure NOK ({step_duration:.1f}s)")
+            return
+        log.append(f"VID {idx}/{total} · structure OK ({step_duration:.1f}s)")
+
+        video_blocks[idx - 1] = _format_temp_block(video, structured.get("text", ""))
+        log.append(f"VID {idx}/{total} · ajouté")
+
+    def _download(idx: int, video: Dict[str, str]) -> Optional[Future]:
+        log = logs[idx - 1]
+        title = video.get("title") or "Sans titre"
+        url = video.get("url") or ""
+        log.append(f"VID {idx}/{total} · démarrage · {title}")
 
-        blocks.append(_format_temp_block(video, structured.get("text", "")))
-        status_log.append(f"VID {idx}/{total} · ajouté")
+        if not url:
+            video_errors[idx - 1].append(f"URL manquante pour {title}")
+            log.append(f"VID {idx}/{total} · URL manquante")
+            return None
 
-    temp_text = "\n\n".join(blocks).strip()
+        try:
+            step_start = time.time()
+            transcript = cached_video_transcript(url)
+            source = "cache"
+            if transcript is None:
+                # Rate limit YouTube propre au téléchargement réel (ni le cache ni les étapes LLM n'attendent)
+                limiter.acquire()
+                step_start = time.time()
+                transcript = fetch_video_transcript(url, max_retries=3)
+                source = "yt-dlp"
+            step_duration = time.time() - step_start
+            log.append(f"VID {idx}/{total} · transcript OK · {source} ({step_duration:.1f}s)")
+        except Exception as exc:
+            video_errors[idx - 1].append(f"Transcript indisponible pour {title}: {exc}")
+            log.append(f"VID {idx}/{total} · transcript NOK")
+            return None
+
+        return llm_pool.submit(_process, idx, video, transcript)
+
+    with ThreadPoolExecutor(max_workers=max(1, int(llm_workers or 1))) as llm_pool:
+        with ThreadPoolExecutor(max_workers=max(1, int(transcript_workers or 1))) as download_pool:
+            downloads = [download_pool.submit(_download, idx, video) for idx, video in enumerate(videos, start=1)]
+            for idx, download in enumerate(downloads, start=1):
+                try:
+                    llm_future = download.result()
+                    if llm_future is not None:
+                        llm_future.result()
+                except Exception as exc:
+                    video_errors[idx - 1].append(str(exc))
+
+    status_log = [line for log in logs for line in log]
+    errors = [error for errs in video_errors for error in errs]
+    temp_text = "\n\n".join(block for block in video_blocks if block).strip()
 
     return {
         "status": "success",
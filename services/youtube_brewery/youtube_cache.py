@@ -0,0 +1,256 @@
+"""
+===========================================
+📼 YOUTUBE CACHE
+===========================================
+Cache local YouTube Brewery (SQLite)
+- Transcripts parsés par video_id (texte compressé zlib)
+- Listes de vidéos par chaîne (TTL court)
+- Métadonnées complètes par video_id (extraction yt-dlp complète une seule fois)
+- Résolution @handle → channel_id
+- Purge des entrées expirées (TTL) à l'écriture, au plus une fois par PURGE_INTERVAL_SEC
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from services.utils.llm_cache import CACHE_DIR
+
+
+YOUTUBE_CACHE_PATH = os.path.join(CACHE_DIR, "youtube_cache.sqlite3")
+TRANSCRIPT_TTL_SEC = 30 * 24 * 3600
+CHANNEL_LISTING_TTL_SEC = 15 * 60
+VIDEO_META_TTL_SEC = 30 * 24 * 3600
+PURGE_INTERVAL_SEC = 3600
+
+# Table → TTL au-delà duquel une ligne n'est plus jamais servie (lectures avec max_age_sec par défaut)
+_EXPIRING_TABLES = {
+    "transcripts": TRANSCRIPT_TTL_SEC,
+    "channel_listings": CHANNEL_LISTING_TTL_SEC,
+    "video_meta": VIDEO_META_TTL_SEC,
+}
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def video_id_from_url(url: str) -> str:
+    """
+    watch?v=ID, youtu.be/ID, /shorts/ID, /live/ID, /embed/ID → ID ("" sinon)
+    """
+    raw = (url or "").strip()
+    if _VIDEO_ID_RE.match(raw):
+        return raw
+    parts = urlsplit(raw)
+    host = (parts.hostname or "").lower()
+    candidate = ""
+    if host.endswith("youtu.be"):
+        candidate = parts.path.strip("/").split("/")[0]
+    elif "youtube" in host:
+        candidate = (parse_qs(parts.query).get("v") or [""])[0]
+        if not candidate:
+            segments = [s for s in parts.path.split("/") if s]
+            if len(segments) >= 2 and segments[0] in ("shorts", "live", "embed", "v"):
+                candidate = segments[1]
+    return candidate if _VIDEO_ID_RE.match(candidate) else ""
+
+
+class YoutubeCache:
+    """
+    Store SQLite des transcripts / listes de chaînes / métadonnées vidéo.
+    Thread-safe (une connexion + un lock).
+    """
+
+    def __init__(self, path: str = YOUTUBE_CACHE_PATH) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.purged = 0
+        self._purged_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            " video_id TEXT PRIMARY KEY,"
+            " transcript BLOB NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS channel_listings ("
+            " channel_key TEXT PRIMARY KEY,"
+            " max_items INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS video_meta ("
+            " video_id TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        for table in _EXPIRING_TABLES:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_fetched ON {table}(fetched_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS channel_ids ("
+            " handle TEXT PRIMARY KEY,"
+            " channel_id TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _purge_expired_locked(self, table: str) -> None:
+        # Les TTL ne s'appliquent qu'en lecture : sans purge le fichier grossit sans fin
+        now = time.time()
+        if now - self._purged_at.get(table, 0.0) < PURGE_INTERVAL_SEC:
+            return
+        self._purged_at[table] = now
+        cursor = self._conn.execute(
+            f"DELETE FROM {table} WHERE fetched_at < ?",
+            (now - _EXPIRING_TABLES[table],),
+        )
+        self.purged += max(cursor.rowcount, 0)
+
+    # --- Transcripts ---
+
+    def get_transcript(self, video_id: str, max_age_sec: int = TRANSCRIPT_TTL_SEC) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT transcript, fetched_at FROM transcripts WHERE video_id = ?",
+                (video_id,),
+            ).fetchone()
+            hit = row is not None and time.time() - row[1] <= max_age_sec
+            self._record(hit)
+        if not hit:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put_transcript(self, video_id: str, transcript: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, transcript, fetched_at) VALUES (?, ?, ?)",
+                (video_id, zlib.compress(transcript.encode("utf-8"), 6), time.time()),
+            )
+            self._purge_expired_locked("transcripts")
+            self._conn.commit()
+
+    # --- Listes de vidéos par chaîne ---
+
+    def get_channel_listing(
+        self,
+        channel_key: str,
+        limit: int,
+        max_age_sec: int = CHANNEL_LISTING_TTL_SEC,
+    ) -> Optional[List[Dict[str, object]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT max_items, payload, fetched_at FROM channel_listings WHERE channel_key = ?",
+                (channel_key,),
+            ).fetchone()
+            # Une liste récupérée avec un limit plus petit ne couvre pas la demande
+            hit = row is not None and row[0] >= limit and time.time() - row[2] <= max_age_sec
+            self._record(hit)
+        if not hit:
+            return None
+        return json.loads(row[1])[:limit]
+
+    def put_channel_listing(self, channel_key: str, limit: int, videos: List[Dict[str, object]]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_listings (channel_key, max_items, payload, fetched_at)"
+                " VALUES (?, ?, ?, ?)",
+                (channel_key, int(limit), json.dumps(videos, ensure_ascii=False), time.time()),
+            )
+            self._purge_expired_locked("channel_listings")
+            self._conn.commit()
+
+    # --- Métadonnées vidéo ---
+
+    def get_video_meta(self, video_ids: Iterable[str], max_age_sec: int = VIDEO_META_TTL_SEC) -> Dict[str, Dict]:
+        ids = [vid for vid in dict.fromkeys(video_ids) if vid]
+        found: Dict[str, Dict] = {}
+        cutoff = time.time() - max_age_sec
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT video_id, payload FROM video_meta"
+                    f" WHERE fetched_at >= ? AND video_id IN ({placeholders})",
+                    [cutoff, *chunk],
+                ).fetchall()
+                found.update((row[0], json.loads(row[1])) for row in rows)
+        return found
+
+    def put_video_meta(self, video_id: str, meta: Dict[str, object]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_meta (video_id, payload, fetched_at) VALUES (?, ?, ?)",
+                (video_id, json.dumps(meta, ensure_ascii=False), time.time()),
+            )
+            self._purge_expired_locked("video_meta")
+            self._conn.commit()
+
+    # --- @handle → channel_id ---
+
+    def get_channel_id(self, handle: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT channel_id FROM channel_ids WHERE handle = ?",
+                (handle.lower(),),
+            ).fetchone()
+            self._record(row is not None)
+        return row[0] if row else None
+
+    def put_channel_id(self, handle: str, channel_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_ids (handle, channel_id, fetched_at) VALUES (?, ?, ?)",
+                (handle.lower(), channel_id, time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            transcripts = self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+            videos = self._conn.execute("SELECT COUNT(*) FROM video_meta").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "purged": self.purged,
+                "transcripts": transcripts,
+                "videos": videos,
+            }
+
+
+_cache: Optional[YoutubeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_youtube_cache() -> Optional[YoutubeCache]:
+    """
+    Cache partagé par process (None si le disque n'est pas utilisable).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = YoutubeCache()
+            except Exception as exc:
+                print(f"⚠️ YouTube cache indisponible: {exc}")
+                return None
+        return _cache
@@ -2,6 +2,7 @@ import requests
 import xml.etree.ElementTree as ET
 from typing import Optional, Dict, List
 from services.youtube_brewery.rss_utils import get_rss_url_from_channel_url
+from services.youtube_brewery.youtube_cache import get_youtube_cache
 from services.youtube_brewery.ytdlp_utils import (
     get_latest_video_from_channel_ytdlp,
     get_latest_videos_from_channel_ytdlp,
@@ -121,10 +122,27 @@ def get_latest_video_from_channel(channel_url: str) -> Optional[Dict[str, str]]:
 
 
 def get_latest_videos_from_channel(channel_url: str, limit: int = 10) -> List[Dict[str, str]]:
+    # Liste mise en cache quelques minutes (TTL court : nouvelles vidéos)
+    cache = get_youtube_cache()
+    channel_key = f"channel:{channel_url}"
+    if cache is not None:
+        try:
+            cached = cache.get_channel_listing(channel_key, limit)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
+
+    videos: List[Dict[str, str]] = []
     rss_url = get_rss_url_from_channel_url(channel_url)
     if rss_url:
-        rss_videos = _parse_rss_videos(rss_url, limit=limit)
-        if rss_videos:
-            return rss_videos
-
-    return get_latest_videos_from_channel_ytdlp(channel_url, limit=limit)
+        videos = _parse_rss_videos(rss_url, limit=limit)
+    if not videos:
+        videos = get_latest_videos_from_channel_ytdlp(channel_url, limit=limit)
+
+    if cache is not None and videos:
+        try:
+            cache.put_channel_listing(channel_key, limit, videos)
+        except Exception:
+            pass
+    return videos
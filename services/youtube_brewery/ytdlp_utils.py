@@ -2,6 +2,8 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 from yt_dlp import YoutubeDL
 
+from services.youtube_brewery.youtube_cache import YoutubeCache, get_youtube_cache
+
 
 def _format_date(upload_date: Optional[str], timestamp: Optional[int]) -> Optional[str]:
     if upload_date and len(upload_date) == 8:
@@ -34,67 +36,150 @@ def _filter_videos(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [entry for entry in entries if entry.get("id") and entry.get("title")]
 
 
-def get_latest_videos_from_channel_ytdlp(channel_url: str, limit: int = 10) -> List[Dict[str, str]]:
+def _video_from_entry(entry: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, str]]:
+    info = info or {}
+    video_id = entry.get("id")
+    title = entry.get("title")
+    if not video_id or not title:
+        return None
+    published = _format_date(entry.get("upload_date"), entry.get("timestamp"))
+    channel_name = (
+        entry.get("uploader")
+        or entry.get("channel")
+        or entry.get("channel_name")
+        or info.get("uploader")
+        or info.get("channel")
+    )
+    url = entry.get("webpage_url") or entry.get("url")
+    if url and not url.startswith("http"):
+        url = f"https://www.youtube.com/watch?v={url}"
+    if not url and video_id:
+        url = f"https://www.youtube.com/watch?v={video_id}"
+    thumbnail = _pick_thumbnail(entry)
+    if not thumbnail and video_id:
+        thumbnail = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+
+    duration_seconds = entry.get("duration") or entry.get("duration_seconds")
+
+    return {
+        "channel_name": channel_name,
+        "video_id": video_id,
+        "title": title,
+        "published": published or "",
+        "url": url or "",
+        "thumbnail": thumbnail or "",
+        "duration_seconds": duration_seconds,
+        "source": "yt-dlp",
+    }
+
+
+def _extract_channel(channel_url: str, limit: int, flat: bool) -> Optional[Dict[str, Any]]:
     ydl_opts = {
         "quiet": True,
         "skip_download": True,
-        "extract_flat": False,
+        "extract_flat": "in_playlist" if flat else False,
         "playlistend": max(1, min(limit, 50)),
         "noplaylist": True,
         "socket_timeout": 60,
         "retries": 1,
         "extractor_retries": 1,
     }
+    with YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(_normalize_channel_videos_url(channel_url), download=False)
+    return info if isinstance(info, dict) else None
+
+
+def _extract_video(video_id: str) -> Optional[Dict[str, Any]]:
+    ydl_opts = {
+        "quiet": True,
+        "skip_download": True,
+        "noplaylist": True,
+        "socket_timeout": 30,
+        "retries": 1,
+        "extractor_retries": 1,
+    }
+    with YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+    return info if isinstance(info, dict) else None
+
+
+def _full_channel_videos(channel_url: str, limit: int) -> List[Dict[str, str]]:
+    # Extraction complète de la liste (chemin historique, fallback)
+    info = _extract_channel(channel_url, limit, flat=False)
+    entries = info.get("entries") if info else None
+    if not entries:
+        return []
+    videos = []
+    for entry in _filter_videos(entries):
+        video = _video_from_entry(entry, info)
+        if video:
+            videos.append(video)
+    return videos
+
+
+def _incremental_channel_videos(channel_url: str, limit: int, cache: YoutubeCache) -> List[Dict[str, str]]:
+    """
+    Liste à plat (ids seulement), puis extraction complète des seules
+    vidéos absentes du cache de métadonnées.
+    """
+    info = _extract_channel(channel_url, limit, flat=True)
+    entries = info.get("entries") if info else None
+    if not entries:
+        return []
+    entries = [entry for entry in entries if isinstance(entry, dict) and entry.get("id")]
+    known = cache.get_video_meta(entry["id"] for entry in entries)
+
+    videos = []
+    for entry in entries:
+        video_id = entry["id"]
+        video = known.get(video_id)
+        if video is None:
+            try:
+                full = _extract_video(video_id)
+            except Exception:
+                full = None
+            video = _video_from_entry(full, info) if full else None
+            if video is None:
+                # Métadonnées réduites de l'entrée à plat (pas de cache : on retentera)
+                video = _video_from_entry(entry, info)
+            elif video.get("published"):
+                cache.put_video_meta(video_id, video)
+        if video:
+            videos.append(video)
+    return videos
+
+
+def get_latest_videos_from_channel_ytdlp(channel_url: str, limit: int = 10) -> List[Dict[str, str]]:
+    cache = get_youtube_cache()
+    channel_key = f"ytdlp:{channel_url}"
+    if cache is not None:
+        try:
+            cached = cache.get_channel_listing(channel_key, limit)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
 
     try:
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(_normalize_channel_videos_url(channel_url), download=False)
-
-        entries = info.get("entries") if isinstance(info, dict) else None
-        if not entries:
-            return []
-
-        videos = []
-        for entry in _filter_videos(entries):
-            video_id = entry.get("id")
-            title = entry.get("title")
-            published = _format_date(entry.get("upload_date"), entry.get("timestamp"))
-            channel_name = (
-                entry.get("uploader")
-                or entry.get("channel")
-                or entry.get("channel_name")
-                or info.get("uploader")
-                or info.get("channel")
-            )
-            url = entry.get("webpage_url") or entry.get("url")
-            if url and not url.startswith("http"):
-                url = f"https://www.youtube.com/watch?v={url}"
-            if not url and video_id:
-                url = f"https://www.youtube.com/watch?v={video_id}"
-            thumbnail = _pick_thumbnail(entry)
-            if not thumbnail and video_id:
-                thumbnail = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-
-            if not video_id or not title:
-                continue
-
-            duration_seconds = entry.get("duration") or entry.get("duration_seconds")
-
-            videos.append({
-                "channel_name": channel_name,
-                "video_id": video_id,
-                "title": title,
-                "published": published or "",
-                "url": url or "",
-                "thumbnail": thumbnail or "",
-                "duration_seconds": duration_seconds,
-                "source": "yt-dlp",
-            })
-
-        return videos
+        if cache is not None:
+            try:
+                videos = _incremental_channel_videos(channel_url, limit, cache)
+            except Exception:
+                videos = []
+            if not videos:
+                videos = _full_channel_videos(channel_url, limit)
+        else:
+            videos = _full_channel_videos(channel_url, limit)
     except Exception:
         return []
 
+    if cache is not None and videos:
+        try:
+            cache.put_channel_listing(channel_key, limit, videos)
+        except Exception:
+            pass
+    return videos
+
 
 def get_latest_video_from_channel_ytdlp(channel_url: str) -> Optional[Dict[str, str]]:
     videos = get_latest_videos_from_channel_ytdlp(channel_url, limit=1)